@@ -0,0 +1,96 @@
+"""
+지도 이미지 디코딩 벤치마크 (프레임당 시간 / 최대 메모리)
+
+ - pil : 기존 경로. PIL 디코딩 -> convert("RGBA") -> tobytes() -> QImage -> QPixmap
+ - qt  : QImage.fromData(응답 바이트) -> QPixmap
+
+최대 메모리는 경로마다 별도 프로세스에서 ru_maxrss 증가량으로 잰다.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_map_decode.py --count 50
+"""
+import argparse
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from map_api_standin import render_map
+
+
+def decode_pil(data):
+    from io import BytesIO
+    from PIL import Image
+    from PyQt5.QtGui import QImage, QPixmap
+
+    im = Image.open(BytesIO(data)).convert("RGBA")
+    raw = im.tobytes("raw", "RGBA")
+    qimage = QImage(raw, im.width, im.height, QImage.Format_RGBA8888)
+    return QPixmap.fromImage(qimage)
+
+
+def decode_qt(data):
+    from PyQt5.QtGui import QPixmap
+    from staticMap import StaticMap
+
+    return QPixmap.fromImage(StaticMap.decodeImage(data))
+
+
+def run_child(path, count, width, height):
+    from PyQt5.QtGui import QGuiApplication
+
+    app = QGuiApplication(sys.argv[:1])
+    data = render_map((126.714823, 37.337156), 17, width, height)
+    decode = decode_pil if path == "pil" else decode_qt
+
+    decode(data)  # 플러그인 로딩 등 초기 비용 제외
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        pixmap = decode(data)
+        samples.append((time.perf_counter() - start) * 1000)
+        del pixmap
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(f"{statistics.mean(samples):.3f} {statistics.median(samples):.3f} {peak}")
+    del app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--width", type=int, default=1620)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--child", choices=["pil", "qt"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.count, args.width, args.height)
+        return
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    print(f"{args.count} decodes of {args.width}x{args.height} PNG")
+    for path in ("pil", "qt"):
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", path, "--count", str(args.count),
+             "--width", str(args.width), "--height", str(args.height)],
+            capture_output=True, text=True, env=env
+        )
+        if result.returncode != 0:
+            print(f"{path:<4} failed: {result.stderr.strip().splitlines()[-1]}")
+            continue
+
+        mean, median, peak_kb = result.stdout.split()
+        print(f"{path:<4} mean {float(mean):7.2f} ms   p50 {float(median):7.2f} ms   "
+              f"peak +{int(peak_kb) / 1024:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
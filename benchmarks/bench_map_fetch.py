@@ -0,0 +1,111 @@
+"""
+지도 요청 경로 부하 테스트 (로컬 대역 서버 사용)
+
+무작위 이동/줌 시퀀스를 여러 스레드에서 StaticMap.fetchImage 로 요청해
+캐시 없음 / 캐시 사용 시의 지연 분포, 오류 수, 캐시 적중률을 비교한다.
+서버 지연, 오류율, 429 제한은 대역 서버 옵션으로 조절한다.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_map_fetch.py --latency 120 --error-rate 0.02
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QGuiApplication
+
+from map_api_standin import start_server
+from map_cache import MapImageCache
+from projection import offset_center
+from staticMap import StaticMap
+
+
+def viewport_sequence(count, seed, width, height):
+    """드래그 한 화면, ±1 줌, 직전 위치 복귀가 섞인 뷰포트 시퀀스"""
+    rng = random.Random(seed)
+    lng, lat, level = 126.714823, 37.337156, 17
+    history = []
+    result = []
+
+    for _ in range(count):
+        action = rng.random()
+        if action < 0.5:
+            dx, dy = rng.choice(((width, 0), (-width, 0), (0, height), (0, -height)))
+            lng, lat = offset_center(lng, lat, level, dx, dy)
+        elif action < 0.8:
+            level = min(20, max(10, level + rng.choice((-1, 1))))
+        elif history:
+            lng, lat, level = rng.choice(history)
+
+        history.append((lng, lat, level))
+        result.append({"center": f"{lng},{lat}", "level": level, "maptype": "basic", "w": width, "h": height})
+
+    return result
+
+
+def run(static_map, sequence, threads):
+    def fetch(params):
+        start = time.perf_counter()
+        static_map.fetchImage(params)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = sorted(pool.map(fetch, sequence))
+
+    return (statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--width", type=int, default=1620)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--latency", type=float, default=100.0)
+    parser.add_argument("--jitter", type=float, default=30.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv[:1])
+    server, url = start_server(
+        latency_ms=args.latency, jitter_ms=args.jitter,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, seed=args.seed
+    )
+    state = server.RequestHandlerClass.state
+
+    static_map = StaticMap()
+    static_map.setEndpoint(url)
+    static_map.setLogininfo("bench", "bench")
+
+    sequence = viewport_sequence(args.count, args.seed, args.width, args.height)
+    print(f"{args.count} viewports, {args.threads} threads, "
+          f"latency {args.latency}±{args.jitter} ms, error rate {args.error_rate}, rate limit {args.rate_limit}/s")
+
+    before = state.requests
+    mean, p50, p95 = run(static_map, sequence, args.threads)
+    print(f"{'no cache':<12} mean {mean:7.1f} ms   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   "
+          f"server requests {state.requests - before}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        static_map.setCache(MapImageCache(cache_dir))
+        before = state.requests
+        mean, p50, p95 = run(static_map, sequence, args.threads)
+        stats = static_map.cache.stats()
+        print(f"{'cache':<12} mean {mean:7.1f} ms   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   "
+              f"server requests {state.requests - before}   hit rate {stats['hit_rate']:.0%}")
+
+    static_map.close()
+    server.shutdown()
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+지도 API 반복 요청 지연 벤치마크
+
+로컬 대역 서버(map_api_standin.py)를 Naver Static Map API 대신 띄워 놓고
+ - 요청마다 requests.get (새 연결)
+ - StaticMap 세션 (keep-alive 연결 재사용)
+ - 세션 + ETag 조건부 요청 (304 재검증)
+의 반복 요청 지연을 비교한다.
+
+    python benchmarks/bench_map_session.py --count 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from map_api_standin import start_server
+from map_cache import MapImageCache
+from staticMap import StaticMap
+
+
+def measure(label, count, func):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    print(f"{label:<28} mean {statistics.mean(samples):7.2f} ms   "
+          f"p50 {samples[len(samples) // 2]:7.2f} ms   "
+          f"p95 {samples[int(len(samples) * 0.95) - 1]:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--width", type=int, default=1620)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in server latency (ms)")
+    args = parser.parse_args()
+
+    server, url = start_server(latency_ms=args.latency)
+
+    static_map = StaticMap()
+    static_map.setEndpoint(url)
+    static_map.setLogininfo("bench", "bench")
+    static_map.setSize(args.width, args.height)
+    params = static_map.snapshotParams()
+
+    session = static_map._get_session()
+    first = session.get(url, params=params, timeout=10)
+    etag = first.headers["ETag"]
+
+    print(f"{args.count} requests, {args.width}x{args.height} PNG ({len(first.content)} bytes)")
+
+    measure("requests.get (new conn)", args.count,
+            lambda: requests.get(url, headers=static_map.headers, params=params, timeout=10).content)
+
+    measure("pooled session", args.count,
+            lambda: session.get(url, params=params, timeout=10).content)
+
+    measure("pooled session + 304", args.count,
+            lambda: session.get(url, params=params, headers={"If-None-Match": etag}, timeout=10).content)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # TTL 0: 매 요청이 조건부 재검증 경로를 탄다
+        cache = MapImageCache(cache_dir, memory_budget=0, ttl=0)
+        static_map.setCache(cache)
+        static_map.fetchImage(params)
+        measure("fetchImage revalidate", args.count, lambda: static_map.fetchImage(params))
+        static_map.setCache(None)
+        measure("fetchImage full download", args.count, lambda: static_map.fetchImage(params))
+
+    static_map.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
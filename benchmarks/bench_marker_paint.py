@@ -0,0 +1,94 @@
+"""
+MarkerOverlay.paintEvent 벤치마크 (마커 수별 한 프레임 그리기 시간)
+
+ - direct : 스프라이트 캐시 이전 방식 (마커마다 QFont 생성, 텍스트 측정, 안티앨리어싱 원/사각형)
+ - sprite : MarkerSpriteCache 의 QPixmap 복사
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_marker_paint.py --counts 50,200,1000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from marker_overlay import MarkerOverlay
+
+
+WIDTH, HEIGHT = 1620, 1080
+
+
+def paint_direct(painter, markers):
+    painter.setRenderHint(QPainter.Antialiasing)
+    for x, y, color, label, _ in markers:
+        painter.setBrush(color)
+        painter.setPen(QPen(QColor(255, 255, 255), 3))
+        painter.drawEllipse(x - 15, y - 15, 30, 30)
+
+        painter.setBrush(QColor(255, 255, 255, 230))
+        painter.setPen(QPen(color, 2))
+        painter.setFont(QFont("Arial", 10, QFont.Bold))
+        metrics = painter.fontMetrics()
+        text_width = metrics.horizontalAdvance(label)
+        text_height = metrics.height()
+        rect_x = x - text_width // 2 - 6
+        rect_y = y - 30 - text_height - 6
+        painter.drawRoundedRect(rect_x, rect_y, text_width + 12, text_height + 12, 4, 4)
+        painter.setPen(QColor(0, 0, 0))
+        painter.drawText(rect_x + 6, rect_y + 6 + metrics.ascent(), label)
+
+
+def paint_sprites(painter, markers, sprites, dpr):
+    for x, y, color, label, _ in markers:
+        pixmap, offset_x, offset_y = sprites.get(color, label, dpr)
+        painter.drawPixmap(x + offset_x, y + offset_y, pixmap)
+
+
+def measure(func, repeat):
+    target = QPixmap(WIDTH, HEIGHT)
+    samples = []
+    for _ in range(repeat):
+        target.fill(Qt.transparent)
+        painter = QPainter(target)
+        start = time.perf_counter()
+        func(painter)
+        painter.end()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", default="50,200,1000")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    overlay = MarkerOverlay()
+    rng = random.Random(1)
+    colors = list(MarkerOverlay.POWER_COLORS.values())
+
+    for count in (int(v) for v in args.counts.split(",")):
+        markers = [
+            (rng.randrange(20, WIDTH - 20), rng.randrange(60, HEIGHT - 20), rng.choice(colors), f"ch{i + 1}", str(i))
+            for i in range(count)
+        ]
+        overlay.sprites.clear()
+
+        direct = measure(lambda p: paint_direct(p, markers), args.repeat)
+        sprite = measure(lambda p: paint_sprites(p, markers, overlay.sprites, 1.0), args.repeat)
+        print(f"{count:>5} markers   direct mean {direct[0]:7.2f} ms (min {direct[1]:6.2f})   "
+              f"sprite mean {sprite[0]:7.2f} ms (min {sprite[1]:6.2f})   sprites {len(overlay.sprites)}")
+
+    del app
+
+
+if __name__ == "__main__":
+    main()
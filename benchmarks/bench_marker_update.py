@@ -0,0 +1,77 @@
+"""
+MarkerOverlay.update_markers 벤치마크 (센서 수별 투영 + 화면 범위 검사 시간)
+
+full: 센서 전체를 다시 맞춤 (스냅샷 복원 등), tick: 매 프레임 --changed 개 센서만 위치가 바뀜
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_marker_update.py --sizes 100,1000,10000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from marker_overlay import MarkerOverlay
+
+
+CENTER = (126.714823, 37.337156)
+
+
+def make_fleet(count, seed=1):
+    rng = random.Random(seed)
+    sensors, gps_data, power_status = {}, {}, {}
+    for i in range(count):
+        ip = f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}"
+        sensors[ip] = f"ch{i + 1}"
+        gps_data[ip] = (CENTER[0] + rng.uniform(-0.01, 0.01), CENTER[1] + rng.uniform(-0.008, 0.008))
+        power_status[ip] = rng.choice((True, False, None))
+    return sensors, gps_data, power_status
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    overlay = MarkerOverlay()
+    overlay.hide()  # 그리기 비용 제외
+    overlay.set_map_params(CENTER[0], CENTER[1], 16, 1620, 1080)
+
+    for size in (int(v) for v in args.sizes.split(",")):
+        sensors, gps_data, power_status = make_fleet(size)
+        ips = list(sensors)
+        rng = random.Random(size)
+
+        full = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            overlay.update_markers(sensors, gps_data, power_status)
+            full.append((time.perf_counter() - start) * 1000)
+
+        tick = []
+        for _ in range(args.repeat):
+            changed = rng.sample(ips, min(args.changed, size))
+            for ip in changed:
+                lng, lat = gps_data[ip]
+                gps_data[ip] = (lng + rng.uniform(-1e-5, 1e-5), lat + rng.uniform(-1e-5, 1e-5))
+            start = time.perf_counter()
+            overlay.update_markers(sensors, gps_data, power_status, changed=changed)
+            tick.append((time.perf_counter() - start) * 1000)
+
+        print(f"{size:>6} sensors   full mean {statistics.mean(full):7.3f} ms   "
+              f"tick mean {statistics.mean(tick):7.3f} ms   min {min(tick):7.3f} ms   "
+              f"on screen {len(overlay.markers)}")
+
+    del app
+
+
+if __name__ == "__main__":
+    main()
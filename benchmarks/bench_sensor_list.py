@@ -0,0 +1,78 @@
+"""
+SensorListWidget 규모 벤치마크 (센서 추가, 상태 갱신, last seen 재배치, 스크롤 렌더링)
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_sensor_list.py --count 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from sensor_list_widget import SensorListWidget
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seen", type=int, default=4)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    widget = SensorListWidget()
+    widget.resize(300, 1000)
+    widget.show()
+    app.processEvents()
+
+    ips = [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(args.count)]
+
+    start = time.perf_counter()
+    for i, ip in enumerate(ips):
+        widget.add_sensor(ip, f"ch{i + 1}")
+    app.processEvents()
+    print(f"add {args.count} sensors: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(1)
+    power = {ip: None for ip in ips}
+    elapsed = []
+    for _ in range(args.ticks):
+        # 한 틱에 1% 정도 센서만 상태가 바뀜. 나머지는 같은 값으로 갱신 (dataChanged 없음)
+        for ip in rng.sample(ips, max(1, args.count // 100)):
+            power[ip] = rng.choice((True, False))
+
+        start = time.perf_counter()
+        for ip in ips:
+            widget.update_power_status(ip, power[ip])
+        app.processEvents()
+        elapsed.append((time.perf_counter() - start) * 1000)
+    print(f"update tick: mean {sum(elapsed) / len(elapsed):.1f} ms, max {max(elapsed):.1f} ms")
+
+    # "last_seen" 정렬: 재배치 주기마다 일부 센서만 새로 수신
+    widget.model.set_sort_mode("last_seen")
+    elapsed = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        for ip in rng.sample(ips, min(args.seen, args.count)):
+            widget.mark_seen(ip)
+        widget.model._apply_touched()
+        app.processEvents()
+        elapsed.append((time.perf_counter() - start) * 1000)
+    print(f"last seen tick ({args.seen} sensors): mean {sum(elapsed) / len(elapsed):.1f} ms, max {max(elapsed):.1f} ms")
+
+    bar = widget.list_view.verticalScrollBar()
+    start = time.perf_counter()
+    for step in range(50):
+        bar.setValue(bar.maximum() * step // 49)
+        widget.list_view.viewport().repaint()
+    print(f"scroll + repaint x50: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,71 @@
-from ntrip_manager import NtripManager
+from startup_profiler import STARTUP
 import sys
-from PyQt5.QtWidgets import QMainWindow, QApplication, QWidget, QHBoxLayout
-from PyQt5.QtCore import Qt, QTimer
+import threading
+import time
+from PyQt5.QtWidgets import QMainWindow, QApplication, QWidget, QHBoxLayout, QFileDialog, QShortcut
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal
+from PyQt5.QtGui import QPixmap, QKeySequence
 from pathlib import Path
-import yaml
+import copy
 
 from staticMap import StaticMap, MapViewController
+from map_fetch_worker import MapFetchWorker
+from map_cache import MapImageCache
+from map_prefetcher import MapPrefetcher
 from sensor_client import SensorClient
+from sensor_events import SensorEventBridge
 from sensor_list_widget import SensorListWidget
-from ntrip_client import NtripClient
 from config_manager import ConfigManager
+from config_loader import ConfigError, ConfigWatcher, load_config
 from map_overlay_widget import MapWithOverlay
-from marker_overlay import MarkerOverlay
+from projection import MapProjection, parse_center
+from state_snapshot import StateSnapshot
+from power_events import PowerEventLog
+from perf_hud import PERF, format_sample
+
+# 자주 쓰지 않는 기능 (오프라인 지도, 센서 탐색, CSV 가져오기, NTRIP) 은 쓸 때 import
+# 마커/히트맵 오버레이와 센서 가져오기 (NumPy 포함) 는 창을 띄운 뒤 _finish_startup 에서 import
+STARTUP.mark("imports")
+
+
+BASE_DIR = Path(__file__).resolve().parent
 
 
 class BiometricRadarApp(QMainWindow):
     
-    def __init__(self, config_data):
+    # 백그라운드 NTRIP 연결 결과 (연결 시도 번호, 연결된 NtripClient 또는 실패하면 None)
+    ntrip_connected = pyqtSignal(int, object)
+    
+    # PowerEventLog 에 기록된 이벤트 (센서 수신 스레드에서 emit, UI 스레드에서 처리)
+    power_event_recorded = pyqtSignal(object)
+    
+    NTRIP_CONNECT_TIMEOUT = 5.0
+    
+    def __init__(self, config_data, config_watcher=None):
         super().__init__()
+        self.config_watcher = config_watcher
         self._setup_values(config_data)
         self._setup_window()
         self._setup_ui()
+        STARTUP.mark("ui")
+        
+        # 창을 먼저 띄우고 나머지는 이벤트 루프가 돌기 시작한 뒤에 준비
+        QTimer.singleShot(0, self._finish_startup)
+    
+    def _finish_startup(self):
+        self._setup_overlays()
+        STARTUP.mark("overlays")
         self._setup_map()
+        STARTUP.mark("map")
         self._setup_sensor_client()
+        STARTUP.mark("sensors")
         self._setup_controllers()
+        STARTUP.mark("controllers")
+        self._setup_snapshot()
+        STARTUP.mark("snapshot")
         self._setup_ntrip()
+        STARTUP.mark("ntrip thread")
+        self._setup_config_watcher()
         self._start_application()
 
     def _setup_values(self, config_data):
@@ -32,10 +73,31 @@ class BiometricRadarApp(QMainWindow):
         self.defaults = config_data.get("default_layout", {})
         self.window = config_data.get("window_settings", {})
         self.sensors_ip = config_data.get("sensors_ip", {})
-        self.update_interval = config_data.get("map_update_interval", 1000)
         self.ntrip_settings = config_data.get("ntrip_settings", {})
+        self.map_cache_settings = config_data.get("map_cache", {})
+        self.prefetch_settings = config_data.get("map_prefetch", {})
+        self.offline_settings = config_data.get("offline_map", {})
+        self.map_api_url = config_data.get("map_api_url")
+        self.heatmap_settings = config_data.get("heatmap", {})
+        self.discovery_settings = config_data.get("discovery", {})
+        self.reconnect_interval_ms = config_data.get("sensor_reconnect_interval")
+        self.snapshot_settings = config_data.get("snapshot", {})
+        self.power_event_settings = config_data.get("power_events", {})
         
         self.initial_map_loaded = False
+        self.closing = False
+        self.last_map = None    # 마지막으로 표시한 지도 (QImage, params)
+        self.stale_state = {}   # 스냅샷에서 복원했고 아직 실시간 값이 없는 항목: {ip: {"gps", "power", "rtk": 값}}
+        self.startup_pending = {"first map", "ntrip"}  # 둘 다 끝나면 --profile-startup 결과 출력
+    
+    def _startup_step_done(self, name, step=None):
+        step = step or name
+        if step not in self.startup_pending:
+            return
+        self.startup_pending.discard(step)
+        STARTUP.mark(name)
+        if not self.startup_pending:
+            STARTUP.report()
     
     def _setup_window(self):
         self.setWindowTitle("Biometric Radar Map Viewer")
@@ -43,17 +105,77 @@ class BiometricRadarApp(QMainWindow):
     
     def _setup_map(self):
         self.map = StaticMap()
+        self.map.setEndpoint(self.map_api_url)
         self.map.setLogininfo(self.naver_client["id"], self.naver_client["key"])
         self.map.setSize(self.window["width"] - 300, self.window["height"])
         self.map.setZoom(self.defaults["zoom_level"])
         self.default_center = (self.defaults["center_lng"], self.defaults["center_lat"])
 
+        self.map_cache = MapImageCache(
+            BASE_DIR / self.map_cache_settings.get("dir", "cache/map"),
+            memory_budget=int(self.map_cache_settings.get("memory_mb", 256)) * 1024 * 1024,
+            disk_budget=int(self.map_cache_settings.get("disk_mb", 512)) * 1024 * 1024,
+            ttl=float(self.map_cache_settings.get("ttl_hours", 168)) * 3600
+        )
+        self.map.setCache(self.map_cache)
+
+        self.offline_store = None
+        if self.offline_settings.get("enabled", False):
+            offline_path = BASE_DIR / self.offline_settings.get("path", "maps/offline.mbtiles")
+            if offline_path.exists():
+                from offline_tiles import OfflineTileStore
+                self.offline_store = OfflineTileStore(offline_path)
+                self.map.setOfflineStore(self.offline_store)
+            else:
+                print(f"Offline map not found: {offline_path}")
+
+        self.map_fetcher = MapFetchWorker(self.map, parent=self)
+        self.map_fetcher.image_ready.connect(self._on_map_image_ready)
+
+        self.prefetcher = None
+        if self.prefetch_settings.get("enabled", True):
+            self.prefetcher = MapPrefetcher(
+                self.map,
+                self.map_cache,
+                max_concurrent=self.prefetch_settings.get("max_concurrent", 2),
+                quota_per_minute=self.prefetch_settings.get("quota_per_minute", 30),
+                idle_delay_ms=self.prefetch_settings.get("idle_ms", 800),
+                parent=self
+            )
+
     def _setup_sensor_client(self):
         self.sensor_client = SensorClient()
         
+        # 전원 값 변화 기록 (짧은 흔들림은 debounce 로 묶음). 히트맵은 기록된 감지 이벤트만 누적
+        self.power_events = PowerEventLog(
+            debounce=float(self.power_event_settings.get("debounce_ms", 500)) / 1000,
+            capacity=int(self.power_event_settings.get("capacity", 1024))
+        )
+        self.power_event_recorded.connect(self._on_power_event, Qt.QueuedConnection)
+        self.power_events.on_event = self.power_event_recorded.emit
+        self.sensor_client.power_events = self.power_events
+        
+        if self.reconnect_interval_ms:
+            self.sensor_client.reconnect_interval = self.reconnect_interval_ms / 1000
+        
+        # 수신 스레드의 변경 알림을 프레임 단위로 모아서 UI 스레드에서 처리
+        self.sensor_events = SensorEventBridge(self)
+        self.sensor_events.changes_ready.connect(self._on_sensor_changes)
+        self.sensor_client.on_change = self.sensor_events.post
+        
         for ip, channel in self.sensors_ip.items():
             self.sensor_client.add_sensor(ip, channel)
             self.sensor_list.add_sensor(ip, channel)
+        
+        from sensor_import import ChannelAllocator, SensorImporter
+        
+        self.channel_allocator = ChannelAllocator(self.sensors_ip.values())
+        
+        self.sensor_importer = SensorImporter(parent=self)
+        self.sensor_importer.probed.connect(self._on_import_probed)
+        self.sensor_importer.finished.connect(
+            lambda total, reachable: print(f"Import finished: {reachable}/{total} hosts answered")
+        )
     
     def _setup_ui(self):
         central = QWidget()
@@ -63,9 +185,9 @@ class BiometricRadarApp(QMainWindow):
         self.map_label = self.map_container.map_label
         self.overlay = self.map_container.overlay
         
-        self.marker_overlay = MarkerOverlay(self.map_label)
-        
         self.overlay.sensor_add_requested.connect(self._on_sensor_add_requested)
+        self.overlay.sensor_import_requested.connect(self._on_sensor_import_requested)
+        self.overlay.sensor_discovery_requested.connect(self._on_sensor_discovery_requested)
         
         self.sensor_list = SensorListWidget()
         self.sensor_list.sensor_deleted.connect(self._on_sensor_deleted)
@@ -75,63 +197,343 @@ class BiometricRadarApp(QMainWindow):
         
         self.setCentralWidget(central)
     
+    def _setup_overlays(self):
+        """지도 위 히트맵/마커 오버레이 (창을 띄운 뒤 생성해서 NumPy import 를 첫 화면 뒤로 미룸)"""
+        from heatmap_layer import ActivityHeatmap, HeatmapOverlay
+        from marker_overlay import MarkerOverlay
+        
+        # 히트맵은 마커 아래에 그려지도록 먼저 생성
+        self.heatmap = None
+        self.heatmap_overlay = None
+        if self.heatmap_settings.get("enabled", True):
+            self.heatmap = ActivityHeatmap(
+                self.defaults["center_lng"],
+                self.defaults["center_lat"],
+                half_life=float(self.heatmap_settings.get("half_life_minutes", 30)) * 60
+            )
+            self.heatmap_overlay = HeatmapOverlay(
+                self.heatmap,
+                saturation=float(self.heatmap_settings.get("saturation", 5)),
+                parent=self.map_label
+            )
+            # 이미 보이는 지도 위에 나중에 만든 위젯이라 직접 표시
+            self.heatmap_overlay.show()
+            
+            # 감지 이벤트가 한꺼번에 기록돼도 한 프레임에 한 번만 다시 색칠
+            self.heatmap_refresh_timer = QTimer(self)
+            self.heatmap_refresh_timer.setSingleShot(True)
+            self.heatmap_refresh_timer.setInterval(SensorEventBridge.FRAME_INTERVAL_MS)
+            self.heatmap_refresh_timer.timeout.connect(self.heatmap_overlay.refresh)
+        
+        self.marker_overlay = MarkerOverlay(self.map_label)
+    
     def _setup_controllers(self):
         self.map_controller = MapViewController(
             self.map_label, 
             self.map, 
-            update_callback=self.update_map
+            update_callback=self.update_map,
+            preview_callback=self._on_map_preview
+        )
+        self.map_controller.gestures.pending_changed.connect(self.overlay.set_zoom_target)
+        self.map_controller.gestures.settled.connect(
+            lambda target: self.overlay.set_zoom_level(target["level"])
         )
+        
+        # 성능 HUD: F3 으로 켜고 끄며, 켜져 있을 때만 갱신
+        self.perf_timer = QTimer(self)
+        self.perf_timer.setInterval(500)
+        self.perf_timer.timeout.connect(self._update_perf_hud)
+        QShortcut(QKeySequence("F3"), self, activated=self.toggle_perf_hud)
+        
+        # FPS 는 지도 화면이 실제로 다시 그려진 횟수 (마커만 바뀌어도 투명 오버레이 아래의 지도가 같이 그려짐)
+        self.map_label.installEventFilter(self)
+    
+    def eventFilter(self, obj, event):
+        if PERF.enabled and obj is self.map_label and event.type() == QEvent.Paint:
+            PERF.frames += 1
+        return super().eventFilter(obj, event)
+    
+    def toggle_perf_hud(self):
+        visible = not PERF.enabled
+        PERF.set_enabled(visible)
+        self.overlay.set_perf_hud_visible(visible)
+        if visible:
+            self._update_perf_hud()
+            self.perf_timer.start()
+        else:
+            self.perf_timer.stop()
+    
+    def _update_perf_hud(self):
+        self.overlay.set_perf_text(format_sample(PERF.sample(self.map_cache)))
 
     def _setup_ntrip(self):
+        """캐스터 연결은 응답이 늦을 수 있으므로 백그라운드에서. 결과는 _on_ntrip_connected 에서 처리"""
+        self.ntrip_manager = None
+        self.ntrip_generation = 0
+        self.overlay.set_rtk_status(False)
+        self.ntrip_connected.connect(self._on_ntrip_connected)
+        
+        self._start_ntrip()
+    
+    def _start_ntrip(self):
+        self.ntrip_generation += 1
+        threading.Thread(
+            target=self._connect_ntrip,
+            args=(self.ntrip_generation, dict(self.ntrip_settings)),
+            daemon=True
+        ).start()
+    
+    def _stop_ntrip(self):
+        """실행 중인 NTRIP 중계 중지 (수신 대기로 멈춰 있을 수 있으므로 정리는 백그라운드에서)"""
+        manager, self.ntrip_manager = self.ntrip_manager, None
+        if manager is None:
+            return
+        
+        def stop():
+            manager.stop()
+            manager.ntrip_client.close()
+        
+        threading.Thread(target=stop, daemon=True).start()
+    
+    def _connect_ntrip(self, generation, settings):
+        ntrip_client = None
         try:
-            ntrip_client = NtripClient(
-                self.ntrip_settings["host_address"],
-                self.ntrip_settings["host_port"],
-                self.ntrip_settings["user_id"],
-                self.ntrip_settings["user_pw"],
-                self.ntrip_settings["mount_point"]
+            from ntrip_client import NtripClient
+            
+            client = NtripClient(
+                settings["host_address"],
+                settings["host_port"],
+                settings["user_id"],
+                settings["user_pw"],
+                settings["mount_point"]
             )
 
-            if ntrip_client.connect():
-                self.ntrip_manager = NtripManager(ntrip_client, self.sensor_client)
-                self.ntrip_manager.start()
-                self.overlay.set_rtk_status(True)
+            if client.connect(timeout=self.NTRIP_CONNECT_TIMEOUT):
+                ntrip_client = client
             else:
                 print("NTRIP connection failed, continuing without RTK")
-                self.ntrip_manager = None
-                self.overlay.set_rtk_status(False)
                 
         except Exception as e:
             print(f"NTRIP setup error: {e}, continuing without RTK")
-            self.ntrip_manager = None
-            self.overlay.set_rtk_status(False)
+        
+        self.ntrip_connected.emit(generation, ntrip_client)
+    
+    def _on_ntrip_connected(self, generation, ntrip_client):
+        self._startup_step_done("ntrip connected" if ntrip_client else "ntrip failed", "ntrip")
+        if ntrip_client is None:
+            return
+        # 창이 닫혔거나 그사이 설정이 바뀌어 다시 연결 중이면 이 연결은 버림
+        if self.closing or generation != self.ntrip_generation:
+            ntrip_client.close()
+            return
+        
+        from ntrip_manager import NtripManager
+        
+        self.ntrip_manager = NtripManager(ntrip_client, self.sensor_client)
+        self.ntrip_manager.start()
+        self.overlay.set_rtk_status(True)
 
+    def _setup_config_watcher(self):
+        if self.config_watcher is None:
+            return
+        self.config_watcher.setParent(self)
+        self.config_watcher.changed.connect(self._on_config_changed)
+    
+    def _on_config_changed(self, diff, config):
+        """config.yaml 이 바뀌면 달라진 부분만 적용. 그대로인 센서/NTRIP 연결은 유지"""
+        client = self.sensor_client
+        
+        for ip in diff.sensors_removed:
+            if ip in client.sensors:
+                print(f"Config: removing sensor {ip}")
+                self.sensor_list.model.remove(ip)
+                self._on_sensor_deleted(ip)
+        
+        for ip, channel in diff.sensors_added.items():
+            if ip not in client.sensors:
+                print(f"Config: adding sensor {ip} ({channel})")
+                self._add_sensor(ip, channel)
+        
+        for ip, channel in diff.channels_changed.items():
+            if ip in client.sensors:
+                # 연결은 IP 기준이라 이름만 바꾸면 됨 (목록 행과 복원/stale 상태는 그대로)
+                client.sensors[ip] = channel
+                self.channel_allocator.reserve(channel)
+                self.sensor_list.update_channel(ip, channel)
+                self.update_markers([ip])
+        
+        if diff.interval_changed and diff.reconnect_interval:
+            self.reconnect_interval_ms = diff.reconnect_interval
+            client.reconnect_interval = diff.reconnect_interval / 1000
+        
+        if diff.discovery_changed:
+            self.discovery_settings = diff.discovery
+        
+        if diff.ntrip_changed:
+            print("Config: NTRIP settings changed, reconnecting")
+            self.ntrip_settings = diff.ntrip_settings
+            self._stop_ntrip()
+            self.update_rtk_status()
+            self._start_ntrip()
+        
+        if diff.restart_required:
+            print(f"Config: restart to apply {', '.join(diff.restart_required)}")
+    
+    def _setup_snapshot(self):
+        """마지막 상태를 저장해 두고, 시작할 때 바로 복원 (실시간 값이 들어오면 교체)"""
+        self.snapshot = None
+        if not self.snapshot_settings.get("enabled", True):
+            return
+        
+        self.snapshot = StateSnapshot(
+            BASE_DIR / self.snapshot_settings.get("dir", "cache/state"),
+            max_age=float(self.snapshot_settings.get("max_age_hours", 24)) * 3600
+        )
+        self._restore_snapshot()
+        
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(self._save_snapshot)
+        self.snapshot_timer.start(int(float(self.snapshot_settings.get("interval_s", 10)) * 1000))
+    
+    def _restore_snapshot(self):
+        restored = self.snapshot.load()
+        if restored is None:
+            return
+        state, image = restored
+        
+        # 지금 설정에 있는 센서만 복원
+        for ip, values in state.get("sensors", {}).items():
+            if ip not in self.sensor_client.sensors:
+                continue
+            stale = {}
+            if values.get("gps"):
+                stale["gps"] = tuple(values["gps"])
+            if values.get("power") is not None:
+                stale["power"] = values["power"]
+            if values.get("rtk"):
+                stale["rtk"] = values["rtk"]
+            if not stale:
+                continue
+            
+            self.stale_state[ip] = stale
+            if "power" in stale:
+                self.sensor_list.update_power_status(ip, stale["power"])
+            if "gps" in stale:
+                self.sensor_list.update_gps(ip, *stale["gps"])
+            if "rtk" in stale:
+                self.sensor_list.update_rtk(ip, stale["rtk"])
+            self.sensor_list.model.set_stale(ip, True)
+        
+        # 창 크기가 같을 때만 뷰포트와 지도 이미지 복원 (GPS 대기 없이 바로 표시)
+        viewport = state.get("viewport") or {}
+        if viewport.get("w") == self.map.params["w"] and viewport.get("h") == self.map.params["h"]:
+            lng, lat = parse_center(viewport["center"])
+            self.map.setCenter(lng, lat)
+            self.map.setZoom(viewport["level"])
+            self._set_overlay_projection(self.map.getProjection())
+            self.initial_map_loaded = True
+            
+            if image is not None:
+                self._on_map_image_ready(image, dict(viewport))
+            # 같은 뷰포트의 최신 이미지는 백그라운드로 요청
+            QTimer.singleShot(0, self.update_map)
+        
+        saved_at = time.strftime("%H:%M:%S", time.localtime(state["saved_at"]))
+        print(f"Restored snapshot saved at {saved_at} ({len(self.stale_state)} sensors)")
+        
+        if self.stale_state:
+            self.overlay.set_stale_notice(f"Last known state ({saved_at})")
+            # 끝내 응답하지 않는 센서는 일정 시간 뒤 복원 값을 지움
+            QTimer.singleShot(int(float(self.snapshot_settings.get("stale_timeout_s", 60)) * 1000), self._expire_stale)
+        
+        self.update_markers()
+    
+    def _save_snapshot(self, background=True):
+        if self.snapshot is None or self.last_map is None:
+            return
+        
+        image, params = self.last_map
+        gps_data, power_status, rtk_status, _ = self._display_state()
+        state = self.snapshot.capture(self.sensor_client.sensors, gps_data, power_status, rtk_status, params)
+        self.snapshot.save(state, image, background=background)
+    
+    def _display_state(self):
+        """화면에 표시할 값: 실시간 값에 아직 갱신되지 않은 복원 값을 더함. (gps, power, rtk, stale IP 집합)"""
+        client = self.sensor_client
+        if not self.stale_state:
+            return client.gps_data, client.power_status, client.rtk_status, ()
+        
+        gps_data = dict(client.gps_data)
+        power_status = dict(client.power_status)
+        rtk_status = dict(client.rtk_status)
+        for ip, values in self.stale_state.items():
+            if "gps" in values:
+                gps_data[ip] = values["gps"]
+            if "power" in values:
+                power_status[ip] = values["power"]
+            if "rtk" in values:
+                rtk_status[ip] = values["rtk"]
+        return gps_data, power_status, rtk_status, set(self.stale_state)
+    
+    def _clear_stale(self, ip, kinds):
+        values = self.stale_state.get(ip)
+        if values is None:
+            return
+        for kind in kinds:
+            values.pop(kind, None)
+        if values:
+            return
+        
+        del self.stale_state[ip]
+        self.sensor_list.model.set_stale(ip, False)
+        if not self.stale_state:
+            self.overlay.set_stale_notice(None)
+    
+    def _expire_stale(self):
+        """실시간 값이 끝내 오지 않은 센서는 복원 값 대신 현재 상태 (연결 끊김 등) 로 표시"""
+        if not self.stale_state:
+            return
+        
+        client = self.sensor_client
+        for ip in list(self.stale_state):
+            if ip in client.sensors:
+                self.sensor_list.update_power_status(ip, client.power_status.get(ip))
+                self.sensor_list.model.set_gps(ip, client.gps_data.get(ip))
+                self.sensor_list.update_rtk(ip, client.rtk_status.get(ip))
+            self._clear_stale(ip, ("gps", "power", "rtk"))
+        self.update_markers()
+    
     def _start_application(self):
         if not self.sensors_ip:
-            print("No sensors configured. Loading map with default center...")
-            self._load_default_map()
+            if not self.initial_map_loaded:
+                print("No sensors configured. Loading map with default center...")
+                self._load_default_map()
         else:
-            print("Waiting for first GPS data...")
+            if not self.initial_map_loaded:
+                print("Waiting for first GPS data...")
+                
+                self.gps_timeout_timer = QTimer(self)
+                self.gps_timeout_timer.timeout.connect(self._on_gps_timeout)
+                self.gps_timeout_timer.setSingleShot(True)
+                self.gps_timeout_timer.start(5000)
             
             self.sensor_client.start()
-            
-            self.gps_check_timer = QTimer(self)
-            self.gps_check_timer.timeout.connect(self._check_for_initial_gps)
-            self.gps_check_timer.start(100)
-            
-            self.gps_timeout_timer = QTimer(self)
-            self.gps_timeout_timer.timeout.connect(self._on_gps_timeout)
-            self.gps_timeout_timer.setSingleShot(True)
-            self.gps_timeout_timer.start(5000)
         
-        self.marker_timer = QTimer(self)
-        self.marker_timer.timeout.connect(self.update_ui)
-        self.marker_timer.start(self.update_interval)
+        # 새 값이 더 오지 않는 센서의 보류 중인 전원 변화도 debounce 시간이 지나면 기록
+        self.power_event_timer = QTimer(self)
+        self.power_event_timer.timeout.connect(self.power_events.settle)
+        self.power_event_timer.start(max(100, int(self.power_events.debounce * 1000)))
+        
+        # 감쇠만으로 바뀌는 히트맵은 느린 주기로 다시 색칠
+        if self.heatmap_overlay:
+            self.heatmap_timer = QTimer(self)
+            self.heatmap_timer.timeout.connect(self.heatmap_overlay.refresh)
+            self.heatmap_timer.start(int(self.heatmap_overlay.decay_refresh * 1000))
     
     def _check_for_initial_gps(self):
         if self.sensor_client.gps_data and not self.initial_map_loaded:
             # 첫 번째 GPS 좌표 가져오기
-            first_ip = list(self.sensor_client.gps_data.keys())[0]
+            first_ip = next(iter(self.sensor_client.gps_data))
             first_gps = self.sensor_client.gps_data[first_ip]
             lng, lat = first_gps
             
@@ -143,11 +545,10 @@ class BiometricRadarApp(QMainWindow):
             
             print(f"Map center set to: {self.map.getCenter()}")
             
-            self.marker_overlay.map_center = (lng, lat)
+            self._set_overlay_projection(self.map.getProjection())
             
             QTimer.singleShot(100, self._initial_map_load)
             
-            self.gps_check_timer.stop()
             if hasattr(self, 'gps_timeout_timer'):
                 self.gps_timeout_timer.stop()
             self.initial_map_loaded = True
@@ -155,7 +556,6 @@ class BiometricRadarApp(QMainWindow):
     def _on_gps_timeout(self):
         if not self.initial_map_loaded:
             print("GPS timeout. Loading map with default center...")
-            self.gps_check_timer.stop()
             self._load_default_map()
     
     def _load_default_map(self):
@@ -163,7 +563,7 @@ class BiometricRadarApp(QMainWindow):
         print(f"Loading map at default center: ({lng:.6f}, {lat:.6f})")
         
         self.map.setCenter(lng, lat)
-        self.marker_overlay.map_center = (lng, lat)
+        self._set_overlay_projection(self.map.getProjection())
         
         QTimer.singleShot(100, self._initial_map_load)
         self.initial_map_loaded = True
@@ -173,10 +573,29 @@ class BiometricRadarApp(QMainWindow):
         self.update_map()
     
     def update_map(self):
-        pixmap = self.map.getMapImage()
+        """현재 뷰포트 이미지를 백그라운드로 요청. 결과는 _on_map_image_ready에서 처리"""
+        self._cancel_prefetch()
+        self.map_fetcher.request()
+
+    def _cancel_prefetch(self):
+        if self.prefetcher:
+            self.prefetcher.cancel()
+
+    def _on_map_image_ready(self, image, params):
+        pixmap = QPixmap.fromImage(image)
+        self.map_controller.set_base_image(pixmap, params)
+        
+        # 드래그/줌 중에 도착한 이미지는 미리보기의 기준 이미지로만 사용
+        if self.map_controller.is_interacting():
+            self.map_controller.refresh_preview()
+            return
+        
         self.map_label.setPixmap(pixmap)
+        self.last_map = (image, params)
+        self._startup_step_done("first map")
         
         if hasattr(self, 'overlay'):
+            self.overlay.set_zoom_level(params["level"])
             self.overlay.raise_()
         
         if not pixmap.isNull():
@@ -196,103 +615,215 @@ class BiometricRadarApp(QMainWindow):
                 img_width,
                 img_height
             )
+            if self.heatmap_overlay:
+                self.heatmap_overlay.setGeometry(self.marker_overlay.geometry())
 
-        center = self.map.getCenter().split(',')
-        self.marker_overlay.set_map_params(
-            float(center[0]),
-            float(center[1]),
-            self.map.getZoom(),
-            self.map.params["w"],
-            self.map.params["h"]
-        )
+        # 마커는 요청 당시의 뷰포트 기준으로 표시해야 이미지와 일치함
+        self._set_overlay_projection(MapProjection.from_params(params))
         
-        self.update_markers()
+        self.marker_overlay.refresh()
+
+        if self.prefetcher:
+            self.prefetcher.schedule(params)
+    
+    def _on_map_preview(self, projection):
+        """드래그/휠 줌 미리보기 프레임마다 마커를 같은 뷰포트로 이동"""
+        self._set_overlay_projection(projection)
+        self.marker_overlay.refresh()
+    
+    def _set_overlay_projection(self, projection):
+        self.marker_overlay.set_projection(projection)
+        if self.heatmap_overlay:
+            self.heatmap_overlay.set_projection(projection)
     
-    def update_markers(self):
-        """마커만 업데이트"""
+    def _on_power_event(self, event):
+        """전원 이벤트가 기록된 뒤 UI 스레드에서. 감지 이벤트를 히트맵에 누적하고 바로 다시 색칠 예약"""
+        if not event.power or not self.heatmap:
+            return
+        gps = self.sensor_client.gps_data.get(event.ip)
+        if gps:
+            lng, lat = gps
+            self.heatmap.add_event(lng, lat)
+            if not self.heatmap_refresh_timer.isActive():
+                self.heatmap_refresh_timer.start()
+    
+    def update_markers(self, ips=None):
+        """마커만 업데이트. ips: 값이 바뀐 센서 (None 이면 전체)"""
+        gps_data, power_status, _, stale = self._display_state()
         self.marker_overlay.update_markers(
             sensors=self.sensor_client.sensors,
-            gps_data=self.sensor_client.gps_data,
-            power_status=self.sensor_client.power_status
+            gps_data=gps_data,
+            power_status=power_status,
+            stale=stale,
+            changed=ips
         )
     
-    def update_ui(self):
-        """센서 리스트, 마커 업데이트"""
-        for ip in self.sensor_client.sensors.keys():
-            power_status = self.sensor_client.power_status.get(ip)
-            self.sensor_list.update_power_status(ip, power_status)
+    def _on_sensor_changes(self, changes):
+        """수신 스레드에서 바뀐 센서만 갱신 (한 프레임에 한 번). changes: {ip: {"power", "gps", "rtk"}}"""
+        timed = PERF.enabled
+        if timed:
+            start = time.perf_counter()
+        
+        client = self.sensor_client
+        
+        if not self.initial_map_loaded and any("gps" in kinds for kinds in changes.values()):
+            self._check_for_initial_gps()
+        
+        rtk_changed = False
+        marker_ips = []
+        
+        for ip, kinds in changes.items():
+            if ip not in client.sensors:
+                continue
+            
+            if ip in self.stale_state:
+                self._clear_stale(ip, kinds)
+                if ip not in self.stale_state:
+                    # 복원 값 표시가 끝나면 마커 색도 바뀜
+                    marker_ips.append(ip)
+            
+            if "power" in kinds:
+                self.sensor_list.update_power_status(ip, client.power_status.get(ip))
+                marker_ips.append(ip)
             
-            gps = self.sensor_client.gps_data.get(ip)
-            if gps:
-                lng, lat = gps
-                self.sensor_list.update_gps(ip, lng, lat)
-        
-        # RTK 상태 확인
-        rtk_active = False
-        for ip in self.sensor_client.sensors.keys():
-            rtk_status = self.sensor_client.rtk_status.get(ip)
-            if rtk_status in ['fixed', 'float']:
-                rtk_active = True
-                break
+            if "gps" in kinds:
+                gps = client.gps_data.get(ip)
+                if gps:
+                    lng, lat = gps
+                    self.sensor_list.update_gps(ip, lng, lat)
+                marker_ips.append(ip)
+            
+            if "rtk" in kinds:
+                self.sensor_list.update_rtk(ip, client.rtk_status.get(ip))
+                rtk_changed = True
+            
+            if "seen" in kinds:
+                self.sensor_list.mark_seen(ip)
         
-        self.overlay.set_rtk_status(rtk_active)
+        if rtk_changed:
+            self.update_rtk_status()
         
-        self.update_markers()
+        if marker_ips:
+            if self.heatmap_overlay:
+                self.heatmap_overlay.refresh()
+            self.update_markers(marker_ips)
+        
+        if timed:
+            PERF.ui_update_ms.add((time.perf_counter() - start) * 1000)
+    
+    def update_rtk_status(self):
+        rtk_active = any(
+            self.sensor_client.rtk_status.get(ip) in ('fixed', 'float')
+            for ip in self.sensor_client.sensors
+        )
+        self.overlay.set_rtk_status(rtk_active)
     
     def _on_sensor_add_requested(self, ip, name):
-        """오버레이에서 센서 추가 요청 시"""
+        """오버레이에서 센서 추가 요청 시 (CIDR 범위면 응답하는 호스트만 일괄 등록)"""
+        if "/" in ip:
+            from sensor_import import expand_target
+            try:
+                self._start_import(expand_target(ip))
+            except ValueError as e:
+                print(f"Invalid range {ip}: {e}")
+            return
+        
         print(f"Adding sensor: {ip} ({name})")
         
         if ip in self.sensor_client.sensors:
             print(f"Sensor {ip} already exists!")
             return
         
+        self._add_sensor(ip, name)
+    
+    def _add_sensor(self, ip, name=None):
         if not name:
-            max_channel = 0
-            for ch in self.sensor_client.sensors.values():
-                if ch.startswith('ch'):
-                    try:
-                        num = int(ch[2:])
-                        max_channel = max(max_channel, num)
-                    except ValueError:
-                        pass
-            
-            name = f"ch{max_channel + 1}"
+            name = self.channel_allocator.allocate()
             print(f"Auto-assigned channel: {name}")
+        else:
+            self.channel_allocator.reserve(name)
         
-
         # 센서 클라이언트에 추가
         self.sensor_client.add_sensor(ip, name)
-
+        
         # UI에 추가
         self.sensor_list.add_sensor(ip, name)
         
-        # 센서 연결
-        import threading
-        power_thread = threading.Thread(
-            target=self.sensor_client._connect_power_socket,
-            args=(ip, name),
-            daemon=True
-        )
-        gps_thread = threading.Thread(
-            target=self.sensor_client._connect_gps_socket,
-            args=(ip, name),
-            daemon=True
+        # 센서 연결 (처음 추가된 센서면 재연결 루프도 함께 시작)
+        if self.sensor_client.running:
+            self.sensor_client.connect_sensor(ip, name)
+        else:
+            self.sensor_client.start()
+    
+    def _on_sensor_import_requested(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import sensors", str(BASE_DIR), "CSV files (*.csv);;All files (*)"
         )
+        if not path:
+            return
+        
+        from sensor_import import load_csv
+        
+        try:
+            entries = load_csv(path)
+        except OSError as e:
+            print(f"Import error: {e}")
+            return
+        
+        self._start_import(entries)
+    
+    def _on_sensor_discovery_requested(self):
+        if getattr(self, 'discovery_dialog', None) and self.discovery_dialog.isVisible():
+            self.discovery_dialog.raise_()
+            return
         
-        power_thread.start()
-        gps_thread.start()
+        from discovery_dialog import DiscoveryDialog
         
-        self.sensor_client.threads.append(power_thread)
-        self.sensor_client.threads.append(gps_thread)
+        settings = self.discovery_settings
+        self.discovery_dialog = DiscoveryDialog(
+            settings.get("subnets", []),
+            known_ips=self.sensor_client.sensors.keys(),
+            timeout=float(settings.get("timeout_ms", 500)) / 1000,
+            concurrency=int(settings.get("concurrency", 2048)),
+            greeting_prefix=str(settings.get("greeting_prefix", "")).encode(),
+            parent=self
+        )
+        self.discovery_dialog.add_requested.connect(self._on_discovered_sensors_add)
+        self.discovery_dialog.show()
+    
+    def _on_discovered_sensors_add(self, ips):
+        for ip in ips:
+            if ip not in self.sensor_client.sensors:
+                print(f"Adding discovered sensor: {ip}")
+                self._add_sensor(ip)
+    
+    def _start_import(self, entries):
+        """entries: ImportEntry 이터러블. 이미 등록된 센서 제외와 CIDR 범위 전개는 확인 스레드에서 함"""
+        if self.sensor_importer.start(entries, skip=self.sensor_client.sensors.keys()):
+            print("Import: probing hosts on ports 23/24...")
+    
+    def _on_import_probed(self, entry, power_ok, gps_ok):
+        """확인이 끝난 후보부터 바로 등록 (CIDR 범위는 응답한 호스트만)"""
+        if not (power_ok or gps_ok) and not entry.explicit:
+            return
+        if entry.ip in self.sensor_client.sensors:
+            return
+        
+        print(f"Import: {entry.ip} (power {'ok' if power_ok else '-'}, gps {'ok' if gps_ok else '-'})")
+        self._add_sensor(entry.ip, entry.channel)
     
     def _on_sensor_deleted(self, ip):
         print(f"Deleting sensor: {ip}")
         
         self.sensor_client.remove_sensor(ip)
-        self.update_markers()
+        self._clear_stale(ip, ("gps", "power", "rtk"))
+        self.update_rtk_status()
+        self.update_markers([ip])
     
     def wheelEvent(self, event):
+        if not hasattr(self, 'map_controller'):
+            return
+        
         if hasattr(self, 'overlay'):
             overlay_local_pos = self.overlay.mapFromGlobal(event.globalPos())
             child_widget = self.overlay.childAt(overlay_local_pos)
@@ -304,9 +835,13 @@ class BiometricRadarApp(QMainWindow):
                 event.ignore()
                 return
         
+        self._cancel_prefetch()
         self.map_controller.handle_wheel_event(event)
     
     def mousePressEvent(self, event):
+        if not hasattr(self, 'map_controller'):
+            return
+        
         if hasattr(self, 'overlay'):
             overlay_local_pos = self.overlay.mapFromGlobal(event.globalPos())
             child_widget = self.overlay.childAt(overlay_local_pos)
@@ -318,9 +853,13 @@ class BiometricRadarApp(QMainWindow):
                 event.ignore()
                 return
         
+        self._cancel_prefetch()
         self.map_controller.handle_mouse_press(event)
     
     def mouseMoveEvent(self, event):
+        if not hasattr(self, 'map_controller'):
+            return
+        
         if not self.map_controller.is_dragging:
             if hasattr(self, 'overlay'):
                 overlay_local_pos = self.overlay.mapFromGlobal(event.globalPos())
@@ -336,18 +875,42 @@ class BiometricRadarApp(QMainWindow):
         self.map_controller.handle_mouse_move(event)
     
     def mouseReleaseEvent(self, event):
+        if not hasattr(self, 'map_controller'):
+            return
+        
         self.map_controller.handle_mouse_release(event)
     
     def closeEvent(self, event):
         print("Closing application...")
+        self.closing = True
         
-        if hasattr(self, 'gps_check_timer'):
-            self.gps_check_timer.stop()
+        if hasattr(self, 'gps_timeout_timer'):
+            self.gps_timeout_timer.stop()
+        
+        # 다음 실행 때 바로 보여줄 상태 저장
+        if getattr(self, 'snapshot', None):
+            self.snapshot_timer.stop()
+            self._save_snapshot(background=False)
+        
+        # 시작 준비가 끝나기 전에 닫힐 수도 있으므로 만들어진 것만 정리
+        if hasattr(self, 'sensor_importer'):
+            self.sensor_importer.cancel()
+        if getattr(self, 'discovery_dialog', None):
+            self.discovery_dialog.close()
+        if hasattr(self, 'map_fetcher'):
+            self.map_fetcher.shutdown()
+        if getattr(self, 'prefetcher', None):
+            self.prefetcher.shutdown()
+        if hasattr(self, 'map'):
+            self.map.close()
+        if getattr(self, 'offline_store', None):
+            self.offline_store.close()
         
         if hasattr(self, 'ntrip_manager') and self.ntrip_manager:
             self.ntrip_manager.stop()
         
-        self.sensor_client.stop()
+        if hasattr(self, 'sensor_client'):
+            self.sensor_client.stop()
         
         event.accept()
 
@@ -355,31 +918,51 @@ class BiometricRadarApp(QMainWindow):
 def main():
     app = QApplication(sys.argv)
     
-    config_manager = ConfigManager()
+    config_path = BASE_DIR / "config" / "config.yaml"
+    
+    # 파일은 여기서 한 번만 읽고 설정 창과 앱이 같이 사용
+    try:
+        file_config = load_config(config_path)
+    except FileNotFoundError:
+        print("config file is not found")
+        sys.exit(1)
+    except ConfigError as e:
+        print(f"config file error: {e}")
+        sys.exit(1)
+    
+    STARTUP.mark("load config")
+    
+    config_manager = ConfigManager(str(config_path), config_data=copy.deepcopy(file_config))
+    STARTUP.mark("config dialog")
     result = config_manager.exec_()
     
+    # 설정 창에서 사용자가 입력하는 시간만 제외 (직전 mark 이후 구간)
+    STARTUP.skip()
+    
     config_data = config_manager.get_result()
     
     if not config_data:
         print("Configuration cancelled")
         sys.exit(0)
     
-    BASE_DIR = Path(__file__).resolve().parent
-    config_path = BASE_DIR / "config" / "config.yaml"
-    
-    try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            file_config = yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        print("config file is not found")
-        sys.exit(1)
-    
     config_data['default_layout'] = file_config.get('default_layout', {})
     config_data['window_settings'] = file_config.get('window_settings', {})
-    config_data['map_update_interval'] = file_config.get('map_update_interval', 1000)
+    config_data['map_cache'] = file_config.get('map_cache', {})
+    config_data['map_prefetch'] = file_config.get('map_prefetch', {})
+    config_data['offline_map'] = file_config.get('offline_map', {})
+    config_data['map_api_url'] = file_config.get('map_api_url')
+    config_data['heatmap'] = file_config.get('heatmap', {})
+    config_data['discovery'] = file_config.get('discovery', {})
+    config_data['sensor_reconnect_interval'] = file_config.get('sensor_reconnect_interval')
+    config_data['snapshot'] = file_config.get('snapshot', {})
+    config_data['power_events'] = file_config.get('power_events', {})
+    
+    STARTUP.mark("config")
     
-    window = BiometricRadarApp(config_data)
+    # 설정 창에서 저장했으면 그 내용이 지금의 파일 내용 (변경 감시 기준)
+    window = BiometricRadarApp(config_data, ConfigWatcher(config_path, config_manager.config_data))
     window.show()
+    STARTUP.mark("show")
     sys.exit(app.exec_())
 
 
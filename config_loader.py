@@ -0,0 +1,171 @@
+"""
+config.yaml 읽기/검사와 변경 감시
+
+파일이 바뀌면 다시 읽어서 직전 내용과 비교한 차이 (ConfigDiff) 만 알린다.
+실행 중인 연결에 적용할 수 있는 항목은 센서 목록, NTRIP 설정, 센서 재연결 주기이고,
+나머지 항목이 바뀌면 restart_required 에 이름만 담는다.
+"""
+import ipaddress
+import os
+
+import yaml
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+
+NTRIP_KEYS = ("host_address", "host_port", "user_id", "user_pw", "mount_point")
+
+# 재시작 없이 적용하는 항목 (그 외 항목은 바뀌어도 다음 실행부터 반영)
+LIVE_KEYS = ("sensors_ip", "ntrip_settings", "sensor_reconnect_interval", "discovery")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def load_config(path):
+    """파일을 한 번 읽어 검사한 설정 dict. 없으면 FileNotFoundError, 형식이 잘못되면 ConfigError"""
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ConfigError(f"YAML parse error: {e}")
+
+    validate_config(data)
+    return data
+
+
+def validate_config(data):
+    if not isinstance(data, dict):
+        raise ConfigError("top level must be a mapping")
+
+    sensors = data.get("sensors_ip") or {}
+    if not isinstance(sensors, dict):
+        raise ConfigError("sensors_ip must be a mapping of ip: channel")
+    for ip, channel in sensors.items():
+        try:
+            ipaddress.ip_address(str(ip))
+        except ValueError:
+            raise ConfigError(f"sensors_ip: invalid address {ip}")
+        if not isinstance(channel, str) or not channel:
+            raise ConfigError(f"sensors_ip: invalid channel for {ip}")
+
+    ntrip = data.get("ntrip_settings") or {}
+    if not isinstance(ntrip, dict):
+        raise ConfigError("ntrip_settings must be a mapping")
+    if ntrip:
+        missing = [key for key in NTRIP_KEYS if key not in ntrip]
+        if missing:
+            raise ConfigError(f"ntrip_settings: missing {', '.join(missing)}")
+        port = ntrip["host_port"]
+        if not isinstance(port, int) or not 0 < port < 65536:
+            raise ConfigError(f"ntrip_settings: invalid host_port {port}")
+
+    interval = data.get("sensor_reconnect_interval")
+    if interval is not None and (not isinstance(interval, (int, float)) or interval <= 0):
+        raise ConfigError("sensor_reconnect_interval must be a positive number (ms)")
+
+    for key in ("default_layout", "window_settings", "map_cache", "map_prefetch",
+                "offline_map", "heatmap", "discovery", "naver_client", "snapshot", "power_events"):
+        if not isinstance(data.get(key) or {}, dict):
+            raise ConfigError(f"{key} must be a mapping")
+
+
+class ConfigDiff:
+
+    def __init__(self, old, new):
+        old_sensors = old.get("sensors_ip") or {}
+        new_sensors = new.get("sensors_ip") or {}
+
+        self.sensors_added = {ip: ch for ip, ch in new_sensors.items() if ip not in old_sensors}
+        self.sensors_removed = {ip: ch for ip, ch in old_sensors.items() if ip not in new_sensors}
+        self.channels_changed = {
+            ip: ch for ip, ch in new_sensors.items()
+            if ip in old_sensors and old_sensors[ip] != ch
+        }
+
+        self.ntrip_changed = (old.get("ntrip_settings") or {}) != (new.get("ntrip_settings") or {})
+        self.ntrip_settings = new.get("ntrip_settings") or {}
+
+        self.interval_changed = old.get("sensor_reconnect_interval") != new.get("sensor_reconnect_interval")
+        self.reconnect_interval = new.get("sensor_reconnect_interval")
+
+        self.discovery_changed = old.get("discovery") != new.get("discovery")
+        self.discovery = new.get("discovery") or {}
+
+        self.restart_required = sorted(
+            key for key in set(old) | set(new)
+            if key not in LIVE_KEYS and old.get(key) != new.get(key)
+        )
+
+    def is_empty(self):
+        return not (
+            self.sensors_added or self.sensors_removed or self.channels_changed
+            or self.ntrip_changed or self.interval_changed or self.discovery_changed
+            or self.restart_required
+        )
+
+    def __repr__(self):
+        parts = []
+        if self.sensors_added:
+            parts.append(f"+{len(self.sensors_added)} sensors")
+        if self.sensors_removed:
+            parts.append(f"-{len(self.sensors_removed)} sensors")
+        if self.channels_changed:
+            parts.append(f"{len(self.channels_changed)} channels renamed")
+        if self.ntrip_changed:
+            parts.append("ntrip")
+        if self.interval_changed:
+            parts.append("reconnect interval")
+        if self.discovery_changed:
+            parts.append("discovery")
+        if self.restart_required:
+            parts.append(f"restart required: {', '.join(self.restart_required)}")
+        return f"ConfigDiff({'; '.join(parts) or 'no change'})"
+
+
+class ConfigWatcher(QObject):
+    """config.yaml 이 바뀌면 다시 읽고 직전 내용과의 차이를 알림"""
+
+    changed = pyqtSignal(object, object)  # ConfigDiff, 새 설정 dict
+
+    RELOAD_DELAY_MS = 300  # 편집기가 여러 번에 나눠 저장하는 경우를 한 번으로 모음
+
+    def __init__(self, path, config, parent=None):
+        super().__init__(parent)
+        self.path = os.path.abspath(path)
+        self.config = config
+
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self.reload)
+
+        # 새 파일로 바꿔치기하며 저장하는 편집기도 있어서 폴더도 함께 감시
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(os.path.dirname(self.path))
+        if os.path.exists(self.path):
+            self._watcher.addPath(self.path)
+        self._watcher.fileChanged.connect(self._on_file_event)
+        self._watcher.directoryChanged.connect(self._on_file_event)
+
+    def _on_file_event(self, _path):
+        self._reload_timer.start()
+
+    def reload(self):
+        # 바꿔치기된 파일은 감시 목록에서 빠지므로 다시 등록
+        if os.path.exists(self.path) and self.path not in self._watcher.files():
+            self._watcher.addPath(self.path)
+
+        try:
+            config = load_config(self.path)
+        except FileNotFoundError:
+            return
+        except (OSError, ConfigError) as e:
+            print(f"Config reload skipped: {e}")
+            return
+
+        diff = ConfigDiff(self.config, config)
+        self.config = config
+        if not diff.is_empty():
+            print(f"Config reloaded: {diff}")
+            self.changed.emit(diff, config)
@@ -11,13 +11,15 @@ from delete_list_widget import DeleteListWidget
 
 
 class ConfigManager(QDialog):
-    def __init__(self, config_path="./config/config.yaml", parent=None):
+    def __init__(self, config_path="./config/config.yaml", parent=None, config_data=None):
         super().__init__(parent)
         self.config_path = config_path
-        self.config_data = None
+        self.config_data = config_data
         self.result_data = None
         
-        self.load_config()
+        # 이미 읽은 설정을 받았으면 파일을 다시 읽지 않음
+        if self.config_data is None:
+            self.load_config()
         self.setup_ui()
         self.populate_fields()
         self.connect_signals()
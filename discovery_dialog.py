@@ -0,0 +1,112 @@
+from PyQt5.QtWidgets import (
+    QDialog, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem,
+    QProgressBar, QVBoxLayout, QHBoxLayout
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from sensor_discovery import SensorDiscovery
+
+
+class DiscoveryDialog(QDialog):
+    """서브넷 탐색 결과를 찾는 대로 보여주고, 선택한 센서를 추가 요청"""
+
+    add_requested = pyqtSignal(list)  # [ip, ...]
+
+    def __init__(self, subnets, known_ips=(), timeout=0.5, concurrency=2048, greeting_prefix=b"", parent=None):
+        super().__init__(parent)
+        self.known_ips = set(known_ips)
+        self.discovery = SensorDiscovery(timeout, concurrency, greeting_prefix, parent=self)
+        self.discovery.found.connect(self._on_found)
+        self.discovery.progress.connect(self._on_progress)
+        self.discovery.finished.connect(self._on_finished)
+
+        self._setup_ui(subnets)
+
+    def _setup_ui(self, subnets):
+        self.setWindowTitle("Sensor Discovery")
+        self.setFixedSize(420, 460)
+
+        layout = QVBoxLayout(self)
+
+        subnet_layout = QHBoxLayout()
+        self.subnet_edit = QLineEdit(", ".join(subnets))
+        self.subnet_edit.setPlaceholderText("192.168.119.0/24, 10.0.0.0/24")
+        self.btn_scan = QPushButton("Scan")
+        subnet_layout.addWidget(self.subnet_edit)
+        subnet_layout.addWidget(self.btn_scan)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        self.status_label = QLabel("Enter subnets and press Scan")
+
+        self.result_list = QListWidget()
+
+        button_layout = QHBoxLayout()
+        self.btn_add = QPushButton("Add Selected")
+        self.btn_close = QPushButton("Close")
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_add)
+        button_layout.addWidget(self.btn_close)
+
+        layout.addLayout(subnet_layout)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.result_list)
+        layout.addLayout(button_layout)
+
+        self.btn_scan.clicked.connect(self._on_scan_clicked)
+        self.subnet_edit.returnPressed.connect(self._on_scan_clicked)
+        self.btn_add.clicked.connect(self._on_add_clicked)
+        self.btn_close.clicked.connect(self.close)
+
+    def _on_scan_clicked(self):
+        if self.discovery.is_running():
+            self.discovery.cancel()
+            return
+
+        subnets = [s.strip() for s in self.subnet_edit.text().split(",") if s.strip()]
+        try:
+            started = self.discovery.start(subnets, skip=self.known_ips)
+        except ValueError as e:
+            self.status_label.setText(f"Invalid subnet: {e}")
+            return
+
+        if started:
+            self.result_list.clear()
+            self.progress_bar.setValue(0)
+            self.status_label.setText("Scanning...")
+            self.btn_scan.setText("Stop")
+
+    def _on_found(self, ip, power_greeting, gps_greeting):
+        greeting = power_greeting.decode("ascii", errors="replace").strip()
+        item = QListWidgetItem(f"{ip}    {greeting}")
+        item.setData(Qt.UserRole, ip)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Checked)
+        self.result_list.addItem(item)
+
+    def _on_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"Scanning... {done}/{total} hosts, {self.result_list.count()} sensors")
+
+    def _on_finished(self, found, total, elapsed):
+        self.btn_scan.setText("Scan")
+        self.status_label.setText(f"{found} sensors found in {total} hosts ({elapsed:.1f} s)")
+
+    def _on_add_clicked(self):
+        ips = []
+        for row in range(self.result_list.count()):
+            item = self.result_list.item(row)
+            if item.checkState() == Qt.Checked:
+                ips.append(item.data(Qt.UserRole))
+                item.setCheckState(Qt.Unchecked)
+                item.setFlags(item.flags() & ~Qt.ItemIsEnabled)
+
+        if ips:
+            self.known_ips.update(ips)
+            self.add_requested.emit(ips)
+
+    def closeEvent(self, event):
+        self.discovery.cancel()
+        super().closeEvent(event)
@@ -0,0 +1,96 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class GestureCoalescer(QObject):
+    """휠/드래그 입력을 모아서 입력이 멈춘 뒤 최종 목표 뷰포트에 대해 한 번만 알림"""
+
+    pending_changed = pyqtSignal(object)  # {"center": (lng, lat), "level": int} 또는 None
+    settled = pyqtSignal(object)          # 최종 목표 뷰포트
+
+    WHEEL_STEP = 120  # 마우스 휠 한 칸의 angleDelta
+
+    def __init__(self, quiet_ms=200, min_level=1, max_level=20, parent=None):
+        super().__init__(parent)
+        self.min_level = min_level
+        self.max_level = max_level
+
+        self._target = None
+        self._wheel_remainder = 0
+        self._holding = False
+
+        self._quiet_timer = QTimer(self)
+        self._quiet_timer.setSingleShot(True)
+        self._quiet_timer.setInterval(quiet_ms)
+        self._quiet_timer.timeout.connect(self._on_quiet)
+
+    def pending_target(self):
+        return dict(self._target) if self._target else None
+
+    def is_pending(self):
+        return self._target is not None
+
+    def add_wheel(self, angle_delta, center, level):
+        """휠 입력 누적. 고해상도 휠/트랙패드의 부분 입력도 합산해서 한 칸이 되면 반영"""
+        if not angle_delta:
+            # 트랙패드 관성 이벤트 사이의 0 입력: 목표를 만들거나 대기 시간을 늘리지 않음
+            return self._target["level"] if self._target is not None else level
+
+        self._ensure_target(center, level)
+
+        self._wheel_remainder += angle_delta
+        steps = int(self._wheel_remainder / self.WHEEL_STEP)
+        self._wheel_remainder -= steps * self.WHEEL_STEP
+
+        if steps:
+            new_level = min(max(self._target["level"] + steps, self.min_level), self.max_level)
+            self._update_target(level=new_level)
+
+        self._quiet_timer.start()
+        return self._target["level"]
+
+    def hold(self, center, level):
+        """드래그 시작: 버튼을 놓을 때까지는 확정하지 않음"""
+        self._ensure_target(center, level)
+        self._holding = True
+        self._quiet_timer.stop()
+
+    def move(self, center):
+        if self._target is None:
+            return
+        self._update_target(center=center)
+
+    def release(self):
+        self._holding = False
+        if self._target is not None:
+            self._quiet_timer.start()
+
+    def cancel(self):
+        self._quiet_timer.stop()
+        self._holding = False
+        self._wheel_remainder = 0
+        if self._target is not None:
+            self._target = None
+            self.pending_changed.emit(None)
+
+    def _ensure_target(self, center, level):
+        if self._target is None:
+            self._target = {"center": center, "level": level}
+            self._wheel_remainder = 0
+
+    def _update_target(self, center=None, level=None):
+        if center is not None:
+            self._target["center"] = center
+        if level is not None:
+            self._target["level"] = level
+        self.pending_changed.emit(dict(self._target))
+
+    def _on_quiet(self):
+        if self._holding or self._target is None:
+            return
+
+        target = self._target
+        self._target = None
+        self._wheel_remainder = 0
+
+        self.pending_changed.emit(None)
+        self.settled.emit(target)
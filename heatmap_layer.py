@@ -0,0 +1,195 @@
+"""
+감지 이벤트 히트맵 레이어
+
+전원 ON(포트 23) 감지가 일어난 위치를 고정 해상도 NumPy 격자(GRID_LEVEL 의 월드 좌표 기준)에
+누적한다. 오래된 감지는 반감기(half_life)에 따라 지수적으로 옅어진다.
+
+격자 값은 기준 시각(ref_time) 기준으로 저장한다. 새 이벤트는 exp(경과 시간 * 감쇠율) 배로
+더해서 기존 값 전체를 매번 줄이지 않아도 되고, 실제 밀도는 읽을 때 한 번만 곱해서 구한다.
+이벤트 한 건 비용은 커널 크기만큼, 색칠 비용은 격자 크기만큼이라 누적 이벤트 수와 무관하다.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QWidget
+
+from projection import lnglat_to_world
+
+
+def _build_palette():
+    """밀도 0~255 -> premultiplied ARGB32 (투명 -> 파랑 -> 초록 -> 노랑 -> 빨강)"""
+    stops = [
+        (0.00, (0, 0, 255, 0)),
+        (0.15, (0, 90, 255, 90)),
+        (0.40, (0, 220, 120, 140)),
+        (0.70, (255, 230, 0, 170)),
+        (1.00, (230, 20, 0, 200)),
+    ]
+    palette = np.zeros(256, dtype=np.uint32)
+    for i in range(256):
+        t = i / 255
+        for (t0, c0), (t1, c1) in zip(stops, stops[1:]):
+            if t <= t1:
+                f = (t - t0) / (t1 - t0)
+                r, g, b, a = (c0[k] + (c1[k] - c0[k]) * f for k in range(4))
+                break
+        r, g, b = (int(v * a / 255) for v in (r, g, b))
+        palette[i] = (int(a) << 24) | (r << 16) | (g << 8) | b
+    return palette
+
+
+class ActivityHeatmap:
+    """감지 이벤트 밀도 격자 (스레드 안전)"""
+
+    GRID_LEVEL = 17
+    CELL_PX = 8          # GRID_LEVEL 월드 픽셀 기준 칸 크기 (위도 37도에서 약 4m)
+    SIZE = 1024          # SIZE x SIZE 칸 (약 4km 사방)
+    KERNEL_RADIUS = 3    # 이벤트 하나가 퍼지는 칸 수
+
+    def __init__(self, center_lng, center_lat, half_life=1800.0, size=SIZE):
+        self.size = size
+        self.half_life = half_life
+        self.decay_rate = math.log(2) / half_life
+
+        center_x, center_y = lnglat_to_world(center_lng, center_lat, self.GRID_LEVEL)
+        self.origin_x = center_x - size * self.CELL_PX / 2
+        self.origin_y = center_y - size * self.CELL_PX / 2
+
+        self.grid = np.zeros((size, size), dtype=np.float32)
+        self.events = 0
+        self.version = 0
+        self._ref_time = time.monotonic()
+        self._lock = threading.Lock()
+
+        radius = self.KERNEL_RADIUS
+        offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+        sigma = radius / 2
+        self._kernel = np.exp(-(offsets[:, None] ** 2 + offsets[None, :] ** 2) / (2 * sigma ** 2))
+
+    def add_event(self, lng, lat, weight=1.0, now=None):
+        """감지 위치 하나 누적. 격자 밖이면 False"""
+        x, y = lnglat_to_world(lng, lat, self.GRID_LEVEL)
+        col = int((x - self.origin_x) // self.CELL_PX)
+        row = int((y - self.origin_y) // self.CELL_PX)
+
+        radius = self.KERNEL_RADIUS
+        r0, r1 = max(0, row - radius), min(self.size, row + radius + 1)
+        c0, c1 = max(0, col - radius), min(self.size, col + radius + 1)
+        if r0 >= r1 or c0 >= c1:
+            return False
+
+        kernel = self._kernel[r0 - row + radius:r1 - row + radius, c0 - col + radius:c1 - col + radius]
+
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            growth = (now - self._ref_time) * self.decay_rate
+            if growth > 30:
+                # float32 범위를 넘지 않도록 기준 시각을 현재로 옮김
+                self._rebase(now)
+                growth = 0.0
+
+            self.grid[r0:r1, c0:c1] += kernel * np.float32(weight * math.exp(growth))
+            self.events += 1
+            self.version += 1
+        return True
+
+    def density(self, now=None):
+        """현재 시각 기준 감쇠가 반영된 밀도 격자 (복사본)"""
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            factor = math.exp(-(now - self._ref_time) * self.decay_rate)
+            return self.grid * np.float32(factor)
+
+    def clear(self):
+        with self._lock:
+            self.grid.fill(0)
+            self.events = 0
+            self.version += 1
+
+    def world_rect(self, level):
+        """격자가 덮는 영역 (level 의 월드 픽셀 좌표): (x, y, width, height)"""
+        scale = 2.0 ** (level - self.GRID_LEVEL)
+        extent = self.size * self.CELL_PX * scale
+        return self.origin_x * scale, self.origin_y * scale, extent, extent
+
+    def _rebase(self, now):
+        self.grid *= np.float32(math.exp(-(now - self._ref_time) * self.decay_rate))
+        self.grid[self.grid < 1e-4] = 0
+        self._ref_time = now
+
+
+class HeatmapOverlay(QWidget):
+    """ActivityHeatmap 을 색칠한 QImage 를 지도 뷰포트에 맞춰 늘려 그림"""
+
+    PALETTE = None
+
+    def __init__(self, heatmap, saturation=5.0, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background: transparent;")
+
+        if HeatmapOverlay.PALETTE is None:
+            HeatmapOverlay.PALETTE = _build_palette()
+
+        self.heatmap = heatmap
+        self.saturation = saturation  # 이 밀도 이상은 가장 진한 색
+        self.projection = None
+
+        # 감쇠만으로 바뀌는 경우는 반감기의 1/16 마다 다시 색칠
+        self.decay_refresh = heatmap.half_life / 16
+
+        self._image = None
+        self._rendered_version = -1
+        self._rendered_at = 0.0
+        self._has_density = False
+
+        self.show()
+
+    def set_projection(self, projection):
+        self.projection = projection
+        if self._image is not None:
+            self.update()
+
+    def refresh(self, now=None):
+        """격자가 바뀌었을 때만 다시 색칠 (주기적으로 호출)"""
+        now = time.monotonic() if now is None else now
+        changed = self.heatmap.version != self._rendered_version
+        decayed = self._has_density and now - self._rendered_at >= self.decay_refresh
+        if not changed and not decayed:
+            return
+
+        self._rendered_version = self.heatmap.version
+        self._rendered_at = now
+        self._image = self._colorize(now)
+        self.update()
+
+    def _colorize(self, now):
+        density = self.heatmap.density(now)
+        index = np.clip(density * (255.0 / self.saturation), 0, 255).astype(np.uint8)
+        self._has_density = bool(index.any())
+        if not self._has_density:
+            return None
+
+        pixels = np.ascontiguousarray(self.PALETTE[index])
+        height, width = pixels.shape
+        image = QImage(pixels.data, width, height, width * 4, QImage.Format_ARGB32_Premultiplied)
+        return image.copy()  # numpy 버퍼와 분리
+
+    def paintEvent(self, event):
+        if self._image is None or self.projection is None:
+            return
+
+        x, y, width, height = self.heatmap.world_rect(self.projection.level)
+        target = QRectF(x - self.projection.origin_x, y - self.projection.origin_y, width, height)
+
+        painter = QPainter(self)
+        try:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(target, self._image)
+        finally:
+            painter.end()
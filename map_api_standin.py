@@ -0,0 +1,278 @@
+"""
+Naver Static Map API (map-static/v2/raster) 로컬 대역 서버
+
+실제 인증 정보나 네트워크 없이 지도 코드(비동기 요청, 캐시, 프리페치)를
+테스트/벤치마크하기 위한 서버. center, level, w, h, maptype, markers 파라미터를
+해석해 항상 같은 결과가 나오는 합성 PNG 를 돌려준다. 격자선은 월드 좌표에
+맞춰 그리므로 이동/줌 시 인접 이미지와 이어진다.
+
+    python map_api_standin.py --port 8089 --latency 150 --error-rate 0.05 --rate-limit 10
+
+config.yaml 에 map_api_url: http://127.0.0.1:8089/map-static/v2/raster 를 넣으면 앱이 이 서버를 사용한다.
+"""
+import argparse
+import hashlib
+import math
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+PATH = "/map-static/v2/raster"
+MAX_SIZE = 2048
+
+BACKGROUNDS = {
+    "basic": (236, 232, 222),
+    "traffic": (230, 236, 230),
+    "satellite": (70, 86, 64),
+    "satellite_base": (80, 96, 72),
+    "terrain": (222, 230, 204),
+}
+MARKER_COLORS = {
+    "red": (220, 40, 40),
+    "green": (40, 170, 60),
+    "blue": (40, 90, 220),
+    "yellow": (230, 200, 30),
+}
+
+
+def encode_png(width, height, rows):
+    """rows: 각 행의 RGB 바이트 (len == width * 3) 를 내는 iterable"""
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    raw = b"".join(b"\x00" + bytes(row) for row in rows)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _lnglat_to_world(lng, lat, level):
+    world = 256 * 2 ** (level + 1)
+    x = (lng + 180.0) / 360.0 * world
+    siny = min(max(math.sin(math.radians(lat)), -0.9999), 0.9999)
+    y = (0.5 - math.log((1 + siny) / (1 - siny)) / (4 * math.pi)) * world
+    return x, y
+
+
+def render_map(center, level, width, height, maptype="basic", markers=()):
+    """뷰포트에 맞춘 합성 지도 이미지 (PNG 바이트)"""
+    lng, lat = center
+    bg = BACKGROUNDS.get(maptype, BACKGROUNDS["basic"])
+    line = tuple(max(0, c - 60) for c in bg)
+
+    cx, cy = _lnglat_to_world(lng, lat, level)
+    left = cx - width / 2
+    top = cy - height / 2
+
+    # 월드 좌표 256px 마다 격자선
+    base_row = bytearray(bytes(bg) * width)
+    for x in range(width):
+        if int(left + x) % 256 == 0:
+            base_row[x * 3:x * 3 + 3] = bytes(line)
+    line_row = bytes(line) * width
+
+    overrides = {}
+    for marker in markers:
+        fields = dict(part.split(":", 1) for part in marker.split("|") if ":" in part)
+        try:
+            m_lng, m_lat = (float(v) for v in fields.get("pos", "").split())
+        except ValueError:
+            continue
+
+        mx, my = _lnglat_to_world(m_lng, m_lat, level)
+        px, py = int(mx - left), int(my - top)
+        color = bytes(MARKER_COLORS.get(fields.get("color", "red"), MARKER_COLORS["red"]))
+
+        for y in range(max(0, py - 8), min(height, py + 9)):
+            row = overrides.get(y)
+            if row is None:
+                row = overrides[y] = bytearray(line_row if int(top + y) % 256 == 0 else base_row)
+            x0, x1 = max(0, px - 8), min(width, px + 9)
+            if x0 < x1:
+                row[x0 * 3:x1 * 3] = color * (x1 - x0)
+
+    def rows():
+        for y in range(height):
+            if y in overrides:
+                yield overrides[y]
+            elif int(top + y) % 256 == 0:
+                yield line_row
+            else:
+                yield base_row
+
+    return encode_png(width, height, rows())
+
+
+@lru_cache(maxsize=64)
+def _render_cached(center, level, width, height, maptype, markers):
+    # 같은 요청은 같은 이미지이므로 재사용 (서버 렌더링 시간이 측정에 섞이지 않도록)
+    return render_map(center, level, width, height, maptype, markers)
+
+
+class StandinState:
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, rate_limit=0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.requests = 0
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def should_fail(self):
+        with self.lock:
+            return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def throttled(self):
+        """초당 요청 수 제한. 초과 시 Retry-After 초를 반환"""
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            if not self.rate_limit:
+                return None
+            while self.recent and now - self.recent[0] >= 1.0:
+                self.recent.popleft()
+            if len(self.recent) >= self.rate_limit:
+                return 1
+            self.recent.append(now)
+            return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = StandinState()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != PATH:
+            self._send_error(404, "Not Found")
+            return
+
+        if not self.headers.get("X-NCP-APIGW-API-KEY-ID") or not self.headers.get("X-NCP-APIGW-API-KEY"):
+            self._send_error(401, "Authentication Failed")
+            return
+
+        retry_after = self.state.throttled()
+        if retry_after is not None:
+            self._send_error(429, "Quota Exceeded", {"Retry-After": str(retry_after)})
+            return
+
+        query = parse_qs(url.query)
+        try:
+            center = tuple(float(v) for v in query["center"][0].split(","))
+            level = int(query.get("level", ["16"])[0])
+            width = int(query["w"][0])
+            height = int(query["h"][0])
+        except (KeyError, ValueError):
+            self._send_error(400, "Invalid Parameter")
+            return
+
+        if len(center) != 2 or not (1 <= width <= MAX_SIZE and 1 <= height <= MAX_SIZE):
+            self._send_error(400, "Invalid Parameter")
+            return
+
+        maptype = query.get("maptype", ["basic"])[0]
+        markers = query.get("markers", [])
+
+        time.sleep(self.state.delay())
+
+        if self.state.should_fail():
+            self._send_error(500, "Internal Server Error")
+            return
+
+        etag = '"%s"' % hashlib.sha1(
+            repr((center, level, width, height, maptype, sorted(markers))).encode()
+        ).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = _render_cached(center, level, width, height, maptype, tuple(markers))
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.state.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, headers=None):
+        body = ('{"error":{"errorCode":"%d","message":"%s"}}' % (status, message)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host="127.0.0.1", port=0, **options):
+    """백그라운드 스레드로 서버 시작. (server, url) 반환. port=0 이면 빈 포트 사용"""
+    handler = type("Handler", (StandinHandler,), {"state": StandinState(**options)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    url = f"http://{host}:{server.server_address[1]}{PATH}"
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Naver Static Map API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter (+/- ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per second before 429 (0: unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, url = start_server(
+        args.host, args.port,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed
+    )
+    print(f"Static map stand-in listening on {url}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"Stopping ({server.RequestHandlerClass.state.requests} requests served)")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class MapImageCache:
+    """지도 이미지 2단 캐시 (메모리: 디코딩된 QImage LRU, 디스크: 인코딩된 원본 PNG/JPEG)"""
+
+    EXTENSIONS = {
+        "image/png": ".png",
+        "image/jpeg": ".jpg",
+    }
+
+    def __init__(self, cache_dir, memory_budget=256 * 1024 * 1024,
+                 disk_budget=512 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.cache_dir = str(cache_dir)
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # {key: QImage}
+        self._memory_bytes = 0
+        self._disk = OrderedDict()    # {digest: [path, size, stored_at, validators]}
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_disk_index()
+
+    @staticmethod
+    def make_key(params):
+        if params.get("markers"):
+            # 서버 측 마커가 그려진 이미지는 캐시하지 않음
+            return None
+        return (
+            params["center"],
+            params["level"],
+            params.get("maptype", "basic"),
+            params["w"],
+            params["h"],
+        )
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            digest, ext = os.path.splitext(name)
+            path = os.path.join(self.cache_dir, name)
+            if ext == ".tmp":
+                # 쓰는 도중 프로그램이 종료되어 남은 임시 파일 (용량 계산에 들어가지 않으므로 지움)
+                self._unlink(path)
+                continue
+            if ext not in self.EXTENSIONS.values():
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, digest, path, stat.st_size))
+
+        # 오래된 항목이 LRU 앞쪽에 오도록 정렬
+        for mtime, digest, path, size in sorted(entries):
+            self._disk[digest] = [path, size, mtime, self._read_validators(digest)]
+            self._disk_bytes += size
+
+        with self._lock:
+            self._evict_disk()
+
+    # ---------------- memory ----------------
+
+    def get_image(self, key):
+        if key is None:
+            return None
+
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return image
+
+    def peek_image(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            return self._memory.get(key)
+
+    def put_image(self, key, image):
+        if key is None or image is None or image.isNull():
+            return
+
+        size = image.sizeInBytes()
+        if size > self.memory_budget:
+            return
+
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old.sizeInBytes()
+
+            self._memory[key] = image
+            self._memory_bytes += size
+
+            while self._memory_bytes > self.memory_budget:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.sizeInBytes()
+
+    # ---------------- disk ----------------
+
+    def get_encoded(self, key):
+        if key is None:
+            return None
+
+        digest = self._digest(key)
+        with self._lock:
+            entry = self._disk.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            path, size, stored_at, validators = entry
+            if time.time() - stored_at > self.ttl:
+                # ETag/Last-Modified가 있으면 조건부 재검증을 위해 남겨둠
+                if not validators:
+                    self._remove_disk_entry(digest)
+                self.misses += 1
+                return None
+
+            self._disk.move_to_end(digest)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._remove_disk_entry(digest)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        return data
+
+    def get_stale(self, key):
+        """재검증 가능한 만료 항목 반환: (data, validators) 또는 None"""
+        if key is None:
+            return None
+
+        digest = self._digest(key)
+        with self._lock:
+            entry = self._disk.get(digest)
+            if entry is None or not entry[3]:
+                return None
+            path, validators = entry[0], dict(entry[3])
+
+        try:
+            with open(path, "rb") as f:
+                return f.read(), validators
+        except OSError:
+            return None
+
+    def refresh(self, key, validators=None):
+        """304 Not Modified 응답 시 TTL 갱신"""
+        digest = self._digest(key)
+        with self._lock:
+            entry = self._disk.get(digest)
+            if entry is None:
+                return
+
+            entry[2] = time.time()
+            if validators:
+                entry[3].update({k: v for k, v in validators.items() if v})
+            self._disk.move_to_end(digest)
+            path, merged = entry[0], dict(entry[3])
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._write_validators(digest, merged)
+
+    def put_encoded(self, key, data, content_type="image/png", validators=None):
+        if key is None or not data or len(data) > self.disk_budget:
+            return
+
+        ext = self.EXTENSIONS.get(content_type.split(";")[0].strip(), ".png")
+        digest = self._digest(key)
+        path = os.path.join(self.cache_dir, digest + ext)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Map cache write error: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        validators = {k: v for k, v in (validators or {}).items() if v}
+        self._write_validators(digest, validators)
+
+        with self._lock:
+            old = self._disk.pop(digest, None)
+            if old is not None:
+                self._disk_bytes -= old[1]
+                if old[0] != path:
+                    self._unlink(old[0])
+
+            self._disk[digest] = [path, len(data), time.time(), validators]
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def discard(self, key):
+        """읽을 수 없는 항목을 메모리/디스크에서 제거"""
+        if key is None:
+            return
+
+        with self._lock:
+            image = self._memory.pop(key, None)
+            if image is not None:
+                self._memory_bytes -= image.sizeInBytes()
+            self._remove_disk_entry(self._digest(key))
+
+    def put(self, key, image, data=None, content_type="image/png", validators=None):
+        self.put_image(key, image)
+        if data is not None:
+            self.put_encoded(key, data, content_type, validators)
+
+    def _validators_path(self, digest):
+        return os.path.join(self.cache_dir, digest + ".json")
+
+    def _read_validators(self, digest):
+        try:
+            with open(self._validators_path(digest), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_validators(self, digest, validators):
+        path = self._validators_path(digest)
+        if not validators:
+            self._unlink(path)
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(validators, f)
+        except OSError as e:
+            print(f"Map cache write error: {e}")
+
+    def _evict_disk(self):
+        now = time.time()
+        expired = [d for d, (_, _, stored_at, validators) in self._disk.items()
+                   if now - stored_at > self.ttl and not validators]
+        for digest in expired:
+            self._remove_disk_entry(digest)
+
+        while self._disk_bytes > self.disk_budget and self._disk:
+            digest = next(iter(self._disk))
+            self._remove_disk_entry(digest)
+
+    def _remove_disk_entry(self, digest):
+        entry = self._disk.pop(digest, None)
+        if entry is None:
+            return
+        self._disk_bytes -= entry[1]
+        self._unlink(entry[0])
+        self._unlink(self._validators_path(digest))
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # ---------------- stats ----------------
+
+    def contains(self, key):
+        if key is None:
+            return False
+        with self._lock:
+            if key in self._memory:
+                return True
+            entry = self._disk.get(self._digest(key))
+            return entry is not None and time.time() - entry[2] <= self.ttl
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
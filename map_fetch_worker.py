@@ -0,0 +1,86 @@
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from perf_hud import PERF
+
+
+class _FetchSignals(QObject):
+    # request_id, params, QImage
+    finished = pyqtSignal(int, object, object)
+
+
+class MapFetchTask(QRunnable):
+
+    def __init__(self, static_map, params, request_id, worker):
+        super().__init__()
+        self.static_map = static_map
+        self.params = params
+        self.request_id = request_id
+        self.worker = worker
+        self.setAutoDelete(True)
+
+    def run(self):
+        # 대기 중에 더 새로운 요청이 들어왔으면 네트워크 요청 없이 종료
+        if self.worker.is_superseded(self.request_id):
+            return
+
+        start = time.perf_counter()
+        image = self.static_map.fetchImage(self.params)
+        if PERF.enabled:
+            PERF.fetch_ms.add((time.perf_counter() - start) * 1000)
+        
+        self.worker.signals.finished.emit(self.request_id, self.params, image)
+
+
+class MapFetchWorker(QObject):
+    """StaticMap 이미지를 백그라운드 스레드에서 받아 QImage로 전달"""
+
+    image_ready = pyqtSignal(object, object)  # QImage, params
+
+    def __init__(self, static_map, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.static_map = static_map
+        self._request_id = 0
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+
+        self.signals = _FetchSignals()
+        self.signals.finished.connect(self._on_finished)
+
+    def request(self, params=None):
+        """현재 뷰포트 요청. 이전 요청은 모두 무효화됨"""
+        if params is None:
+            params = self.static_map.snapshotParams()
+
+        self._request_id += 1
+
+        # 아직 시작하지 않은 요청은 큐에서 제거
+        self.pool.clear()
+
+        # 메모리 캐시 적중 시 스레드를 거치지 않고 바로 전달
+        cached = self.static_map.getCachedImage(params)
+        if cached is not None:
+            self.image_ready.emit(cached, params)
+            return self._request_id
+
+        self.pool.start(MapFetchTask(self.static_map, params, self._request_id, self))
+        return self._request_id
+
+    def is_superseded(self, request_id):
+        return request_id != self._request_id
+
+    def cancel(self):
+        self._request_id += 1
+        self.pool.clear()
+
+    def shutdown(self, timeout_ms=1000):
+        self.cancel()
+        self.pool.waitForDone(timeout_ms)
+
+    def _on_finished(self, request_id, params, image):
+        if self.is_superseded(request_id):
+            return
+
+        self.image_ready.emit(image, params)
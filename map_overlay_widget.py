@@ -4,11 +4,14 @@ from PyQt5.QtGui import QPainter, QColor
 
 
 class MapOverlayWidget(QWidget):
-    sensor_add_requested = pyqtSignal(str, str)  # ip, name
+    sensor_add_requested = pyqtSignal(str, str)  # ip (또는 CIDR 범위), name
+    sensor_import_requested = pyqtSignal()
+    sensor_discovery_requested = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.rtk_status = False
+        self.zoom_level = None
         self.setAttribute(Qt.WA_NoMousePropagation, False)
         self._setup_ui()
     
@@ -42,7 +45,62 @@ class MapOverlayWidget(QWidget):
         rtk_layout.addWidget(self.rtk_label)
         rtk_layout.addStretch()
         
-        main_layout.addWidget(self.rtk_indicator)
+        self.zoom_indicator = QLabel()
+        self.zoom_indicator.setFixedHeight(40)
+        self.zoom_indicator.setMinimumWidth(90)
+        self.zoom_indicator.setAlignment(Qt.AlignCenter)
+        self.zoom_indicator.setStyleSheet("""
+            QLabel {
+                background-color: rgba(255, 255, 255, 230);
+                border-radius: 8px;
+                border: 1px solid rgba(200, 200, 200, 150);
+                color: #333333;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 0px 10px;
+            }
+        """)
+        self.zoom_indicator.hide()
+        
+        # 스냅샷으로 복원한 화면임을 표시 (실시간 데이터가 들어오면 숨김)
+        self.stale_notice = QLabel()
+        self.stale_notice.setFixedHeight(40)
+        self.stale_notice.setAlignment(Qt.AlignCenter)
+        self.stale_notice.setStyleSheet("""
+            QLabel {
+                background-color: rgba(255, 170, 0, 230);
+                border-radius: 8px;
+                color: #333333;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 0px 10px;
+            }
+        """)
+        self.stale_notice.hide()
+        
+        # 성능 HUD (F3 으로 켜고 끔)
+        self.perf_hud = QLabel()
+        self.perf_hud.setStyleSheet("""
+            QLabel {
+                background-color: rgba(20, 20, 20, 200);
+                border-radius: 8px;
+                color: #e0e0e0;
+                font-family: "Courier New";
+                font-size: 12px;
+                padding: 6px 10px;
+            }
+        """)
+        self.perf_hud.hide()
+        
+        status_layout = QHBoxLayout()
+        status_layout.setSpacing(10)
+        status_layout.addWidget(self.rtk_indicator)
+        status_layout.addWidget(self.zoom_indicator)
+        status_layout.addWidget(self.stale_notice)
+        status_layout.addWidget(self.perf_hud, 0, Qt.AlignTop)
+        status_layout.addStretch()
+        
+        main_layout.addLayout(status_layout)
         main_layout.addSpacing(10)
         
         self.sensor_panel = QWidget()
@@ -63,7 +121,7 @@ class MapOverlayWidget(QWidget):
         input_layout.setSpacing(8)
         
         self.input_ip = QLineEdit()
-        self.input_ip.setPlaceholderText("IP Address")
+        self.input_ip.setPlaceholderText("IP or CIDR range")
         self.input_ip.setStyleSheet("""
             QLineEdit {
                 background-color: white;
@@ -107,13 +165,31 @@ class MapOverlayWidget(QWidget):
             }
         """)
         
+        self.btn_import = QPushButton("Import")
+        self.btn_import.setFixedHeight(32)
+        self.btn_import.setCursor(Qt.PointingHandCursor)
+        self.btn_import.setStyleSheet(self.btn_add.styleSheet())
+        
+        self.btn_discover = QPushButton("Discover")
+        self.btn_discover.setFixedHeight(32)
+        self.btn_discover.setCursor(Qt.PointingHandCursor)
+        self.btn_discover.setStyleSheet(self.btn_add.styleSheet())
+        
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(8)
+        button_layout.addWidget(self.btn_add)
+        button_layout.addWidget(self.btn_import)
+        button_layout.addWidget(self.btn_discover)
+        
         panel_layout.addLayout(input_layout)
-        panel_layout.addWidget(self.btn_add)
+        panel_layout.addLayout(button_layout)
         
         main_layout.addWidget(self.sensor_panel)
         main_layout.addStretch()
         
         self.btn_add.clicked.connect(self._on_add_clicked)
+        self.btn_import.clicked.connect(self.sensor_import_requested.emit)
+        self.btn_discover.clicked.connect(self.sensor_discovery_requested.emit)
         self.input_name.returnPressed.connect(self._on_add_clicked)
     
     def _on_add_clicked(self):
@@ -133,6 +209,34 @@ class MapOverlayWidget(QWidget):
         else:
             self.rtk_dot.setStyleSheet("color: #ff4444; font-size: 20px;")
             self.rtk_label.setText("RTK: OFF")
+    
+    def set_stale_notice(self, text):
+        """text 가 None 이면 숨김"""
+        if text:
+            self.stale_notice.setText(text)
+        self.stale_notice.setVisible(bool(text))
+    
+    def set_perf_hud_visible(self, visible):
+        self.perf_hud.setVisible(visible)
+    
+    def set_perf_text(self, text):
+        self.perf_hud.setText(text)
+    
+    def set_zoom_level(self, level):
+        """현재 표시 중인 지도 레벨"""
+        self.zoom_level = level
+        self.set_zoom_target(None)
+    
+    def set_zoom_target(self, target):
+        """휠 입력이 확정되기 전의 목표 뷰포트 (None이면 현재 레벨만 표시)"""
+        if self.zoom_level is None:
+            return
+        
+        if target and target["level"] != self.zoom_level:
+            self.zoom_indicator.setText(f"Zoom {self.zoom_level} → {target['level']}")
+        else:
+            self.zoom_indicator.setText(f"Zoom {self.zoom_level}")
+        self.zoom_indicator.show()
 
 
 class MapWithOverlay(QWidget):
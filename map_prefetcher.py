@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, QTimer
+
+from staticMap import neighbour_viewports
+
+
+class _QuotaBudget:
+    """분당 API 호출 한도 (슬라이딩 윈도우)"""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def take(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._calls and now - self._calls[0] >= 60.0:
+                self._calls.popleft()
+            if len(self._calls) >= self.per_minute:
+                return False
+            self._calls.append(now)
+            return True
+
+
+class PrefetchTask(QRunnable):
+
+    def __init__(self, prefetcher, params, generation):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.params = params
+        self.generation = generation
+        self.setAutoDelete(True)
+
+    def run(self):
+        QThread.currentThread().setPriority(QThread.LowestPriority)
+
+        if self.prefetcher.is_cancelled(self.generation):
+            return
+        if not self.prefetcher.quota.take():
+            return
+
+        # 결과는 StaticMap.fetchImage 안에서 캐시에 저장됨
+        self.prefetcher.static_map.fetchImage(self.params)
+
+
+class MapPrefetcher(QObject):
+    """지도가 표시된 뒤 유휴 시간에 인접 뷰포트와 ±1 줌 레벨을 캐시에 미리 받아둠"""
+
+    MIN_LEVEL = 1
+    MAX_LEVEL = 20
+
+    def __init__(self, static_map, cache, max_concurrent=2, quota_per_minute=30,
+                 idle_delay_ms=800, parent=None):
+        super().__init__(parent)
+        self.static_map = static_map
+        self.cache = cache
+        self.quota = _QuotaBudget(quota_per_minute)
+        self._generation = 0
+        self._pending_params = None
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_concurrent)
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(idle_delay_ms)
+        self.idle_timer.timeout.connect(self._on_idle)
+
+    def schedule(self, params):
+        """params 뷰포트가 화면에 표시된 직후 호출"""
+        self.cancel()
+        self._pending_params = dict(params)
+        self.idle_timer.start()
+
+    def cancel(self):
+        self._generation += 1
+        self._pending_params = None
+        self.idle_timer.stop()
+        self.pool.clear()
+
+    def is_cancelled(self, generation):
+        return generation != self._generation
+
+    def shutdown(self, timeout_ms=1000):
+        self.cancel()
+        self.pool.waitForDone(timeout_ms)
+
+    def candidates(self, params):
+        """가능성이 높은 순서: 상하좌우 이동, 줌 인/아웃, 대각선 이동"""
+        neighbours = neighbour_viewports(params)
+        level = params["level"]
+
+        zoomed = []
+        for new_level in (level + 1, level - 1):
+            if self.MIN_LEVEL <= new_level <= self.MAX_LEVEL:
+                candidate = dict(params)
+                candidate["level"] = new_level
+                zoomed.append(candidate)
+
+        return neighbours[:4] + zoomed + neighbours[4:]
+
+    def _on_idle(self):
+        params = self._pending_params
+        if params is None:
+            return
+
+        for candidate in self.candidates(params):
+            if self.cache.contains(self.cache.make_key(candidate)):
+                continue
+            self.pool.start(PrefetchTask(self, candidate, self._generation))
@@ -0,0 +1,165 @@
+"""
+줌 레벨별 격자 기반 마커 클러스터링
+
+월드 픽셀 좌표를 CELL_SIZE 격자로 나눠 같은 칸의 센서를 하나의 클러스터로 묶는다.
+격자는 월드 좌표 기준이라 지도를 이동해도 묶음이 바뀌지 않고, 레벨이 바뀔 때만 다시 만든다.
+같은 레벨에서는 위치/전원 상태가 바뀐 센서만 칸을 옮기거나 집계를 고친다.
+"""
+import numpy as np
+
+from projection import lnglat_to_world
+
+
+class _Cell:
+    __slots__ = ("members", "sum_x", "sum_y", "power_counts")
+
+    def __init__(self):
+        self.members = set()
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.power_counts = {True: 0, False: 0, None: 0}
+
+    def add(self, ip, x, y, power):
+        self.members.add(ip)
+        self.sum_x += x
+        self.sum_y += y
+        self.power_counts[power] += 1
+
+    def remove(self, ip, x, y, power):
+        self.members.discard(ip)
+        self.sum_x -= x
+        self.sum_y -= y
+        self.power_counts[power] -= 1
+
+
+class MarkerCluster:
+    __slots__ = ("cell", "world_x", "world_y", "count", "power_on", "power_off", "power_unknown", "members")
+
+    def __init__(self, cell, data):
+        count = len(data.members)
+        self.cell = cell
+        self.world_x = data.sum_x / count
+        self.world_y = data.sum_y / count
+        self.count = count
+        self.power_on = data.power_counts[True]
+        self.power_off = data.power_counts[False]
+        self.power_unknown = data.power_counts[None]
+        self.members = frozenset(data.members)
+
+    @property
+    def breakdown(self):
+        return self.power_on, self.power_off, self.power_unknown
+
+
+class GridClusterer:
+    """센서 위치를 레벨별 격자로 묶음. update() 는 바뀐 센서만 다시 배치"""
+
+    CELL_SIZE = 64  # 월드 픽셀 (마커 원 + 라벨이 겹치는 정도의 거리)
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.level = None
+        self._entries = {}  # {ip: (lng, lat, power, world_x, world_y, cell)}
+        self._cells = {}    # {cell: _Cell}
+        self._dirty = set()
+        self._clusters = {}  # {cell: MarkerCluster} (멤버 2개 이상)
+        self.clustered = {}  # {ip: cell} 클러스터에 속한 센서
+        self.version = 0     # clustered 가 바뀔 때마다 증가
+
+    def clear(self):
+        self.level = None
+        self._entries.clear()
+        self._cells.clear()
+        self._dirty.clear()
+        self._clusters.clear()
+        self.clustered.clear()
+        self.version += 1
+
+    def update(self, level, sensors):
+        """sensors: {ip: (lng, lat, power)}. 레벨이 바뀌면 전체 재구성, 아니면 변경분만 반영"""
+        if level != self.level:
+            self.clear()
+            self.level = level
+
+        self.apply(sensors, [ip for ip in self._entries if ip not in sensors])
+
+    def apply(self, changed, removed=()):
+        """같은 레벨에서 바뀐 센서만 반영. changed: {ip: (lng, lat, power)}, removed: 빠진 IP"""
+        entries = self._entries
+
+        for ip in removed:
+            if ip in entries:
+                self._remove(ip)
+
+        changed = [
+            (ip, lng, lat, power) for ip, (lng, lat, power) in changed.items()
+            if entries.get(ip, ())[:3] != (lng, lat, power)
+        ]
+        if changed:
+            self._place(changed)
+
+        self._refresh_clusters()
+
+    def clusters(self):
+        return list(self._clusters.values())
+
+    def singles(self):
+        """클러스터에 속하지 않은 센서 IP"""
+        return [
+            next(iter(cell.members)) for cell in self._cells.values() if len(cell.members) == 1
+        ]
+
+    def cluster_of(self, ip):
+        entry = self._entries.get(ip)
+        return self._clusters.get(entry[5]) if entry else None
+
+    def _place(self, changed):
+        # 위치가 바뀐 센서만 한 번에 월드 좌표로 변환
+        coords = np.array([(lng, lat) for _, lng, lat, _ in changed], dtype=np.float64)
+        world_x, world_y = lnglat_to_world(coords[:, 0], coords[:, 1], self.level)
+        cell_x = np.floor_divide(world_x, self.cell_size).astype(np.int64)
+        cell_y = np.floor_divide(world_y, self.cell_size).astype(np.int64)
+
+        for i, (ip, lng, lat, power) in enumerate(changed):
+            if ip in self._entries:
+                self._remove(ip)
+
+            x, y = float(world_x[i]), float(world_y[i])
+            cell = (int(cell_x[i]), int(cell_y[i]))
+            data = self._cells.get(cell)
+            if data is None:
+                data = self._cells[cell] = _Cell()
+            data.add(ip, x, y, power)
+
+            self._entries[ip] = (lng, lat, power, x, y, cell)
+            self._dirty.add(cell)
+
+    def _remove(self, ip):
+        _, _, power, x, y, cell = self._entries.pop(ip)
+        data = self._cells[cell]
+        data.remove(ip, x, y, power)
+        if not data.members:
+            del self._cells[cell]
+        self._dirty.add(cell)
+
+    def _refresh_clusters(self):
+        for cell in self._dirty:
+            data = self._cells.get(cell)
+            if data is None or len(data.members) < 2:
+                old = self._clusters.pop(cell, None)
+                members = frozenset()
+            else:
+                old = self._clusters.get(cell)
+                cluster = self._clusters[cell] = MarkerCluster(cell, data)
+                members = cluster.members
+
+            old_members = old.members if old else frozenset()
+            if members != old_members:
+                for ip in old_members - members:
+                    # 다른 클러스터로 옮겨 간 센서는 그대로 둠
+                    if self.clustered.get(ip) == cell:
+                        del self.clustered[ip]
+                for ip in members:
+                    self.clustered[ip] = cell
+                self.version += 1
+        self._dirty.clear()
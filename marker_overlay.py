@@ -1,156 +1,489 @@
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont
+from PyQt5.QtCore import Qt, QPoint, QRect
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QFontMetrics, QPixmap, QRegion
 import math
+import time
+import numpy as np
 
-# WGS84 타원체 상수
-WGS84_A = 6378137.0  # 장반경 (m)
-WGS84_E2 = 0.00669437999014  # 이심률^2
+from marker_clustering import GridClusterer
+from perf_hud import PERF
+from projection import MapProjection, lnglat_to_world
 
-def geodetic_to_ecef(lat, lng, alt=0.0):
-    lat_rad = math.radians(lat)
-    lng_rad = math.radians(lng)
-    
-    N = WGS84_A / math.sqrt(1 - WGS84_E2 * math.sin(lat_rad)**2)
-    
-    x = (N + alt) * math.cos(lat_rad) * math.cos(lng_rad)
-    y = (N + alt) * math.cos(lat_rad) * math.sin(lng_rad)
-    z = (N * (1 - WGS84_E2) + alt) * math.sin(lat_rad)
-    
-    return x, y, z
 
-def ecef_to_enu(x, y, z, ref_lat, ref_lng, ref_alt=0.0):
-    ref_x, ref_y, ref_z = geodetic_to_ecef(ref_lat, ref_lng, ref_alt)
-    
-    dx = x - ref_x
-    dy = y - ref_y
-    dz = z - ref_z
+class MarkerOverlay(QWidget):
     
-    lat_rad = math.radians(ref_lat)
-    lng_rad = math.radians(ref_lng)
+    POWER_COLORS = {
+        None: QColor(150, 150, 150),
+        True: QColor(0, 200, 0),
+        False: QColor(200, 0, 0)
+    }
     
-    sin_lat = math.sin(lat_rad)
-    cos_lat = math.cos(lat_rad)
-    sin_lng = math.sin(lng_rad)
-    cos_lng = math.cos(lng_rad)
+    # 스냅샷에서 복원한 (아직 실시간 값이 없는) 센서는 반투명하게
+    STALE_COLORS = {power: QColor(color.red(), color.green(), color.blue(), 110) for power, color in POWER_COLORS.items()}
     
-    e = -sin_lng * dx + cos_lng * dy
-    n = -sin_lat * cos_lng * dx - sin_lat * sin_lng * dy + cos_lat * dz
-    u = cos_lat * cos_lng * dx + cos_lat * sin_lng * dy + sin_lat * dz
+    CLUSTER_MAX_LEVEL = 16  # 이 레벨 이하에서는 가까운 센서를 클러스터로 묶음
     
-    return e, n, u
-
-def geodetic_to_enu(lat, lng, alt, ref_lat, ref_lng, ref_alt=0.0):
-    x, y, z = geodetic_to_ecef(lat, lng, alt)
-    return ecef_to_enu(x, y, z, ref_lat, ref_lng, ref_alt)
-
-def cal_meters_per_pixel(lat, zoom):
-    zoom += 1  # Naver Maps zoom level adjustment
-    return (
-        156543.03392
-        * math.cos(math.radians(lat))
-        / (2 ** zoom)
-    )
-
-class MarkerOverlay(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setStyleSheet("background: transparent;")
         
-        self.markers = []  # [(screen_x, screen_y, color, label), ...]
-        self.map_center = (127.1054328, 37.3595963)  # (lng, lat)
-        self.map_zoom = 10
-        self.map_size = (800, 600)
+        self.markers = []  # [(screen_x, screen_y, color, label, ip), ...]
+        self.clusters = []  # [(screen_x, screen_y, (on, off, unknown), cell), ...]
+        self.clusterer = GridClusterer()
+        self.sprites = MarkerSpriteCache()
+        self.projection = None
+        self._full_repaint = True
+        
+        # 센서 좌표는 행 번호로 고정된 배열에 두고, 위치가 바뀐 행만 고침
+        self._rows = {}          # {ip: 행}
+        self._row_ips = []
+        self._row_labels = []
+        self._row_pos = []       # [(lng, lat)] (변경 비교용)
+        self._row_power = []
+        self._row_stale = []
+        self._lnglat = np.empty((0, 2), dtype=np.float64)
+        self._world = np.empty((0, 2), dtype=np.float64)
+        self._world_level = None
+        self._world_dirty = set()     # 월드 좌표를 다시 계산할 행
+        self._cluster_changed = {}    # 클러스터에 아직 반영하지 않은 센서 {ip: (lng, lat, power) 또는 None (제거)}
+        self._clustered = np.zeros(0, dtype=bool)
+        self._clustered_version = None
+        self.set_map_params(127.1054328, 37.3595963, 10, 800, 600)
         
         self.show()
         self.raise_()
     
     def set_map_params(self, center_lng, center_lat, zoom, width, height):
-        self.map_center = (center_lng, center_lat)
-        self.map_zoom = zoom
-        self.map_size = (width, height)
+        self.set_projection(MapProjection(center_lng, center_lat, zoom, width, height))
+    
+    def set_projection(self, projection):
+        # 뷰포트가 바뀌면 모든 마커 위치가 바뀌므로 다음 갱신은 전체 다시 그리기
+        old = self.projection
+        if old is None or (old.center, old.level, old.width, old.height) != (
+                projection.center, projection.level, projection.width, projection.height):
+            self._full_repaint = True
+        self.projection = projection
+        self.map_center = projection.center
+        self.map_zoom = projection.level
+        self.map_size = (projection.width, projection.height)
     
-    def update_markers(self, sensors, gps_data, power_status):
-        self.markers = []
+    def update_markers(self, sensors, gps_data, power_status, stale=(), changed=None):
+        """stale: 복원한 값으로 표시 중인 센서 IP 집합
+        changed: 값이 바뀐 센서 IP (None 이면 sensors 전체와 다시 맞춤)
+        """
+        if changed is None:
+            for ip in [ip for ip in self._rows if ip not in sensors]:
+                self._remove_row(ip)
+            changed = sensors
         
-        for ip, channel in sensors.items():
+        for ip in changed:
+            channel = sensors.get(ip)
             pos = gps_data.get(ip)
-            power = power_status.get(ip)
-            
-            if pos is None:
-                continue
-            
-            lng, lat = pos
-            
-            screen_x, screen_y = self._gps_to_screen(lng, lat)
+            if channel is None or pos is None:
+                self._remove_row(ip)
+            else:
+                self._set_row(ip, channel, pos, power_status.get(ip), ip in stale)
+        
+        self.refresh()
+    
+    def refresh(self):
+        """저장된 센서 좌표로 마커를 다시 배치 (뷰포트만 바뀐 경우는 이것만 호출)"""
+        projection = self.projection
+        count = len(self._row_ips)
+        
+        clusters = []
+        in_cluster = None
+        if projection.level <= self.CLUSTER_MAX_LEVEL:
+            self._sync_clusterer(projection.level)
+            clusters = self._visible_clusters()
+            in_cluster = self._clustered_mask()
+        else:
+            self._cluster_changed.clear()
+            if self.clusterer.level is not None:
+                self.clusterer.clear()
+        
+        # 개별 마커는 저장된 월드 좌표에서 한 번에 화면 좌표로
+        markers = []
+        
+        if count:
+            world = self._world_coords(projection.level)
+            screen_x = (world[:, 0] - projection.origin_x).astype(np.int64)
+            screen_y = (world[:, 1] - projection.origin_y).astype(np.int64)
             
             # 화면 범위 내에 있는지 확인
-            if 0 <= screen_x <= self.map_size[0] and 0 <= screen_y <= self.map_size[1]:
-                if power is None:
-                    color = QColor(150, 150, 150)
-                elif power:
-                    color = QColor(0, 200, 0)
-                else:
-                    color = QColor(200, 0, 0)
-                
-                self.markers.append((screen_x, screen_y, color, channel))
+            visible = projection.contains(screen_x, screen_y)
+            if in_cluster is not None:
+                visible &= ~in_cluster
+            
+            for i in np.flatnonzero(visible).tolist():
+                colors = self.STALE_COLORS if self._row_stale[i] else self.POWER_COLORS
+                color = colors[self._row_power[i]]
+                markers.append((int(screen_x[i]), int(screen_y[i]), color, self._row_labels[i], self._row_ips[i]))
         
+        previous = self._sprite_items()
+        self.markers = markers
+        self.clusters = clusters
+        
+        dirty = None
         if self.isVisible():
-            self.update()
+            if self._full_repaint:
+                self._full_repaint = False
+                self.update()
+            else:
+                # 바뀐 마커/클러스터의 이전/현재 영역만 다시 그림 (변화가 없으면 아무것도 안 함)
+                dirty = self._dirty_region(previous, self._sprite_items())
+        
+        # 이전 영역 계산에 쓴 스프라이트까지 확인한 뒤, 지금 화면에 없는 것만 정리
+        in_use = {(color.rgba(), label) for _, _, color, label, _ in markers}
+        in_use.update(("cluster", breakdown) for _, _, breakdown, _ in clusters)
+        self.sprites.prune(in_use)
+        
+        if dirty is not None and not dirty.isEmpty():
+            self.update(dirty)
     
-    def _gps_to_screen(self, lng, lat):
-        center_lng, center_lat = self.map_center
-        width, height = self.map_size
-        zoom = self.map_zoom
+    def _set_row(self, ip, channel, pos, power, stale):
+        pos = (pos[0], pos[1])
+        row = self._rows.get(ip)
+        if row is None:
+            row = self._add_row(ip)
+        elif self._row_pos[row] == pos and self._row_power[row] == power:
+            self._row_labels[row] = channel
+            self._row_stale[row] = stale
+            return
         
-        meters_per_pixel = cal_meters_per_pixel(center_lat, zoom)
+        if self._row_pos[row] != pos:
+            self._row_pos[row] = pos
+            self._lnglat[row] = pos
+            self._world_dirty.add(row)
+        self._row_labels[row] = channel
+        self._row_power[row] = power
+        self._row_stale[row] = stale
+        self._cluster_changed[ip] = (pos[0], pos[1], power)
+    
+    def _add_row(self, ip):
+        row = len(self._row_ips)
+        if row == len(self._lnglat):
+            # 배열은 두 배씩 늘려서 센서가 하나씩 추가될 때마다 복사하지 않음
+            capacity = max(64, row * 2)
+            lnglat = np.empty((capacity, 2), dtype=np.float64)
+            lnglat[:row] = self._lnglat[:row]
+            world = np.empty((capacity, 2), dtype=np.float64)
+            world[:row] = self._world[:row]
+            self._lnglat, self._world = lnglat, world
+        
+        self._rows[ip] = row
+        self._row_ips.append(ip)
+        self._row_labels.append(None)
+        self._row_pos.append(None)
+        self._row_power.append(None)
+        self._row_stale.append(False)
+        self._clustered_version = None
+        return row
+    
+    def _remove_row(self, ip):
+        """마지막 행을 빈 자리로 옮겨서 배열을 빈틈 없이 유지"""
+        row = self._rows.pop(ip, None)
+        if row is None:
+            return
+        last = len(self._row_ips) - 1
+        if row != last:
+            moved = self._row_ips[last]
+            self._rows[moved] = row
+            for values in (self._row_ips, self._row_labels, self._row_pos, self._row_power, self._row_stale):
+                values[row] = values[last]
+            self._lnglat[row] = self._lnglat[last]
+            self._world[row] = self._world[last]
+            if last in self._world_dirty:
+                self._world_dirty.add(row)
+        self._world_dirty.discard(last)
         
-        # e = East (동쪽, 미터), n = North (북쪽, 미터), u = Up (고도, 미터)
-        e, n, u = geodetic_to_enu(lat, lng, 0.0, center_lat, center_lng, 0.0)
+        for values in (self._row_ips, self._row_labels, self._row_pos, self._row_power, self._row_stale):
+            values.pop()
+        self._cluster_changed[ip] = None
+        self._clustered_version = None
+    
+    def _world_coords(self, level):
+        """(센서 수, 2) 월드 좌표. 레벨이 바뀌었을 때만 전체를, 아니면 위치가 바뀐 행만 다시 계산"""
+        count = len(self._row_ips)
+        lnglat = self._lnglat
+        world = self._world
         
-        # ENU 좌표를 화면 픽셀로 변환
-        # e는 x축 (동쪽이 양수), n은 y축 (북쪽이 양수)
-        screen_x = (width / 2) + (e / meters_per_pixel)
-        screen_y = (height / 2) - (n / meters_per_pixel)  # 화면 y축은 아래가 양수
+        if self._world_level != level:
+            world[:count, 0], world[:count, 1] = lnglat_to_world(lnglat[:count, 0], lnglat[:count, 1], level)
+            self._world_level = level
+        elif self._world_dirty:
+            rows = np.fromiter(self._world_dirty, dtype=np.intp, count=len(self._world_dirty))
+            world[rows, 0], world[rows, 1] = lnglat_to_world(lnglat[rows, 0], lnglat[rows, 1], level)
+        self._world_dirty.clear()
         
+        return world[:count]
+    
+    def _sync_clusterer(self, level):
+        clusterer = self.clusterer
+        if clusterer.level != level:
+            # 레벨이 바뀌면 격자를 처음부터 다시 만듦
+            clusterer.update(level, {
+                ip: (pos[0], pos[1], power)
+                for ip, pos, power in zip(self._row_ips, self._row_pos, self._row_power)
+            })
+        elif self._cluster_changed:
+            clusterer.apply(
+                {ip: value for ip, value in self._cluster_changed.items() if value is not None},
+                [ip for ip, value in self._cluster_changed.items() if value is None]
+            )
+        self._cluster_changed.clear()
+    
+    def _clustered_mask(self):
+        """클러스터에 속한 행. 클러스터 구성이나 행 배치가 바뀔 때만 다시 만듦"""
+        clusterer = self.clusterer
+        if self._clustered_version != clusterer.version:
+            mask = np.zeros(len(self._row_ips), dtype=bool)
+            mask[[self._rows[ip] for ip in clusterer.clustered]] = True
+            self._clustered = mask
+            self._clustered_version = clusterer.version
+        return self._clustered
+    
+    def _visible_clusters(self):
+        projection = self.projection
+        clusters = []
+        for cluster in self.clusterer.clusters():
+            x = int(cluster.world_x - projection.origin_x)
+            y = int(cluster.world_y - projection.origin_y)
+            if projection.contains(x, y):
+                clusters.append((x, y, cluster.breakdown, cluster.cell))
+        return clusters
+    
+    def _sprite_items(self):
+        """{키: 마커 또는 클러스터}. 마커는 IP, 클러스터는 ("cluster", 격자 칸) 으로 구분"""
+        items = {marker[4]: marker for marker in self.markers}
+        items.update((("cluster", cluster[3]), cluster) for cluster in self.clusters)
+        return items
+    
+    def _dirty_region(self, previous, current):
+        dpr = self.devicePixelRatioF()
+        previous = dict(previous)
+        region = QRegion()
+        
+        for key, item in current.items():
+            old = previous.pop(key, None)
+            if old == item:
+                continue
+            if old is not None:
+                region += self._item_rect(old, dpr)
+            region += self._item_rect(item, dpr)
+        
+        # 사라진 마커/클러스터 (GPS 없음, 화면 밖, 삭제, 클러스터 해체)
+        for old in previous.values():
+            region += self._item_rect(old, dpr)
+        
+        return region
+    
+    def _item_rect(self, item, dpr):
+        if len(item) == 4:
+            x, y, breakdown, _ = item
+            return self.sprites.cluster_rect(breakdown, dpr).translated(x, y)
+        x, y, color, label, _ = item
+        return self.sprites.rect(color, label, dpr).translated(x, y)
+    
+    def _gps_to_screen(self, lng, lat):
+        screen_x, screen_y = self.projection.to_screen(lng, lat)
         return int(screen_x), int(screen_y)
     
+    def sensor_at(self, x, y, radius=15):
+        """화면 좌표 (x, y)에 그려진 마커의 센서 IP (없으면 None)"""
+        for marker_x, marker_y, _, _, ip in reversed(self.markers):
+            if (marker_x - x) ** 2 + (marker_y - y) ** 2 <= radius ** 2:
+                return ip
+        return None
+    
+    def screen_to_gps(self, x, y):
+        return self.projection.to_lnglat(x, y)
+    
     def paintEvent(self, event):
-        if not self.markers:
+        if not self.markers and not self.clusters:
             return
         
+        timed = PERF.enabled
+        if timed:
+            start = time.perf_counter()
+        
+        dpr = self.devicePixelRatioF()
+        
+        dirty = event.rect()
+        
         painter = QPainter(self)
+        try:
+            # 마커/라벨은 미리 그려둔 스프라이트를 복사만 함 (다시 그릴 영역에 걸친 것만)
+            for x, y, color, label, _ in self.markers:
+                if not dirty.intersects(self.sprites.rect(color, label, dpr).translated(x, y)):
+                    continue
+                pixmap, offset_x, offset_y = self.sprites.get(color, label, dpr)
+                painter.drawPixmap(x + offset_x, y + offset_y, pixmap)
+            
+            for x, y, breakdown, _ in self.clusters:
+                if not dirty.intersects(self.sprites.cluster_rect(breakdown, dpr).translated(x, y)):
+                    continue
+                pixmap, offset_x, offset_y = self.sprites.get_cluster(breakdown, dpr)
+                painter.drawPixmap(x + offset_x, y + offset_y, pixmap)
+        finally:
+            painter.end()
+        
+        if timed:
+            PERF.paint_ms.add((time.perf_counter() - start) * 1000)
+
+
+class MarkerSpriteCache:
+    """(색상, 라벨, DPI) 별로 마커 원 + 라벨을 한 번만 그려둔 QPixmap 캐시"""
+    
+    PADDING = 6
+    MAX_UNUSED = 256
+    
+    def __init__(self):
+        self._sprites = {}  # {(rgba, label, dpr): (pixmap, offset_x, offset_y)}
+        self._font = None
+        self._metrics = None
+    
+    def get(self, color, label, dpr):
+        key = (color.rgba(), label, dpr)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = self._render(color, label, dpr)
+        return sprite
+    
+    def get_cluster(self, breakdown, dpr):
+        """breakdown: (켜짐, 꺼짐, 알 수 없음) 센서 수"""
+        key = ("cluster", breakdown, dpr)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = self._render_cluster(breakdown, dpr)
+        return sprite
+    
+    def rect(self, color, label, dpr):
+        """마커 중심 (0, 0) 기준 스프라이트 영역 (논리 좌표)"""
+        return self._bounds(self.get(color, label, dpr))
+    
+    def cluster_rect(self, breakdown, dpr):
+        return self._bounds(self.get_cluster(breakdown, dpr))
+    
+    @staticmethod
+    def _bounds(sprite):
+        pixmap, offset_x, offset_y = sprite
+        size = pixmap.size() / pixmap.devicePixelRatio()
+        return QRect(offset_x, offset_y, size.width(), size.height())
+    
+    def prune(self, in_use):
+        """라벨/색이 바뀌어 더 이상 쓰지 않는 스프라이트 정리. in_use: {(rgba, label), ...}"""
+        if len(self._sprites) <= len(in_use) + self.MAX_UNUSED:
+            return
+        for key in [k for k in self._sprites if (k[0], k[1]) not in in_use]:
+            del self._sprites[key]
+    
+    def clear(self):
+        self._sprites.clear()
+    
+    def __len__(self):
+        return len(self._sprites)
+    
+    def _ensure_font(self):
+        if self._font is None:
+            self._font = QFont("Arial", 10, QFont.Bold)
+            self._metrics = QFontMetrics(self._font)
+    
+    def _render(self, color, label, dpr):
+        self._ensure_font()
+        
+        text_width = self._metrics.horizontalAdvance(label)
+        text_height = self._metrics.height()
+        padding = self.PADDING
+        
+        # 마커 중심 (0, 0) 기준 스프라이트 범위 (펜 두께 포함)
+        left = min(-17, -(text_width // 2) - padding - 1)
+        right = max(17, text_width - text_width // 2 + padding + 1)
+        top = -30 - text_height - padding - 1
+        bottom = 17
+        
+        width = right - left
+        height = bottom - top
+        
+        pixmap = QPixmap(int(math.ceil(width * dpr)), int(math.ceil(height * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        
+        painter = QPainter(pixmap)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.translate(-left, -top)
+            
+            painter.setBrush(color)
+            painter.setPen(QPen(QColor(255, 255, 255), 3))
+            painter.drawEllipse(-15, -15, 30, 30)
+            
+            self._draw_label(painter, label, color, text_width, text_height)
+        finally:
+            painter.end()
+        
+        return pixmap, left, top
+    
+    def _render_cluster(self, breakdown, dpr):
+        self._ensure_font()
+        
+        count = sum(breakdown)
+        # 센서 수에 따라 조금씩 커지는 원 (18 ~ 28px 반지름)
+        radius = 18 + min(10, int(3 * math.log2(max(count, 1))))
+        size = radius * 2 + 4
+        
+        pixmap = QPixmap(int(math.ceil(size * dpr)), int(math.ceil(size * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        
+        painter = QPainter(pixmap)
         try:
             painter.setRenderHint(QPainter.Antialiasing)
+            painter.translate(size / 2, size / 2)
+            
+            # 바깥 고리: 전원 상태별 비율 (켜짐, 꺼짐, 알 수 없음 순)
+            painter.setPen(Qt.NoPen)
+            start = 90 * 16
+            for state, value in zip((True, False, None), breakdown):
+                if not value:
+                    continue
+                span = int(round(360 * 16 * value / count))
+                painter.setBrush(MarkerOverlay.POWER_COLORS[state])
+                painter.drawPie(-radius, -radius, radius * 2, radius * 2, start, -span)
+                start -= span
+            
+            painter.setPen(QPen(QColor(255, 255, 255), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(-radius, -radius, radius * 2, radius * 2)
             
-            for x, y, color, label in self.markers:
-                painter.setBrush(color)
-                painter.setPen(QPen(QColor(255, 255, 255), 3))
-                painter.drawEllipse(x - 15, y - 15, 30, 30)
-                
-                self._draw_label(painter, x, y, label, color)
+            # 가운데: 센서 수
+            inner = radius - 6
+            painter.setBrush(QColor(255, 255, 255, 235))
+            painter.setPen(Qt.NoPen)
+            painter.drawEllipse(-inner, -inner, inner * 2, inner * 2)
+            
+            painter.setFont(self._font)
+            painter.setPen(QColor(0, 0, 0))
+            painter.drawText(QRect(-inner, -inner, inner * 2, inner * 2), Qt.AlignCenter, str(count))
         finally:
             painter.end()
+        
+        return pixmap, -(size // 2), -(size // 2)
     
-    def _draw_label(self, painter, x, y, text, color):
+    def _draw_label(self, painter, text, color, text_width, text_height):
+        padding = self.PADDING
+        
         painter.setBrush(QColor(255, 255, 255, 230))
         painter.setPen(QPen(color, 2))
+        painter.setFont(self._font)
         
-        font = QFont("Arial", 10, QFont.Bold)
-        painter.setFont(font)
-        metrics = painter.fontMetrics()
-
-        text_width = metrics.horizontalAdvance(text)
-        text_height = metrics.height()
-        
-        padding = 6
-        rect_x = x - text_width // 2 - padding
-        rect_y = y - 30 - text_height - padding 
+        rect_x = -(text_width // 2) - padding
+        rect_y = -30 - text_height - padding
         rect_width = text_width + padding * 2
         rect_height = text_height + padding * 2
         
         painter.drawRoundedRect(rect_x, rect_y, rect_width, rect_height, 4, 4)
         
         painter.setPen(QColor(0, 0, 0))
-        painter.drawText(rect_x + padding, rect_y + padding + metrics.ascent(), text)
\ No newline at end of file
+        painter.drawText(rect_x + padding, rect_y + padding + self._metrics.ascent(), text)
@@ -12,9 +12,9 @@ class NtripClient:
         self.mount_point = mount
         self.auth = base64.b64encode(f"{self.user_id}:{self.user_pw}".encode()).decode()
     
-    def connect(self):
-        self.socket = socket.socket()
-        self.socket.connect((self.host_address, self.host_port))
+    def connect(self, timeout=None):
+        # timeout: 연결/응답 대기 최대 시간 (초). 연결 후에는 기존처럼 블로킹 소켓으로 사용
+        self.socket = socket.create_connection((self.host_address, self.host_port), timeout=timeout)
         
         msg = f"GET /{self.mount_point} HTTP/1.1\r\n"
         msg += "User-Agent: NTRIP ntripclient\r\n"
@@ -26,6 +26,7 @@ class NtripClient:
         
         buffer = self.socket.recv(4096)
         result = buffer.decode("utf-8")
+        self.socket.settimeout(None)
         
         print("NTRIP Server Response:")
         print(result)
@@ -0,0 +1,338 @@
+"""
+오프라인 지도 타일 저장소 (MBTiles 형식의 단일 SQLite 파일)
+
+운영 지역의 지도를 미리 받아 두고, 인터넷이 없어도 요청된 뷰포트를
+저장된 256px 타일로 합성한다. zoom_level 에는 Naver 지도 level 을 그대로
+저장하며 (level 당 타일 수 2^(level+1)), tile_row 는 MBTiles 규격대로 TMS(아래→위) 순서다.
+
+제한: Static Map 응답에는 모서리에 제공사 로고와 축척 막대가 그려져 있고 이를 빼는 요청 옵션이 없다.
+그래서 1024px 이미지를 받아 가장자리 MARGIN (128px) 을 버리고 가운데 3x3 타일만 저장한다
+(요청당 타일 9장). 지도 라벨이 타일 경계에서 잘려 보이는 것은 그대로 남는다.
+
+    python offline_tiles.py seed --db maps/offline.mbtiles --bbox 126.70,37.33,126.73,37.35 --levels 14-18
+    python offline_tiles.py info --db maps/offline.mbtiles
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QColor, QImage, QPainter
+
+from projection import TILE_SIZE, MapProjection, lnglat_to_world, world_to_lnglat
+
+
+def tile_count(level):
+    return 2 ** (level + 1)
+
+
+def tile_range(bbox, level):
+    """bbox (min_lng, min_lat, max_lng, max_lat) 를 덮는 XYZ 타일 범위"""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    left, top = lnglat_to_world(min_lng, max_lat, level)
+    right, bottom = lnglat_to_world(max_lng, min_lat, level)
+
+    last = tile_count(level) - 1
+    x0 = max(0, int(left // TILE_SIZE))
+    x1 = min(last, int(right // TILE_SIZE))
+    y0 = max(0, int(top // TILE_SIZE))
+    y1 = min(last, int(bottom // TILE_SIZE))
+    return x0, x1, y0, y1
+
+
+class OfflineTileStore:
+
+    def __init__(self, path):
+        self.path = str(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER,
+                tile_column INTEGER,
+                tile_row INTEGER,
+                tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            )
+        """)
+        self._conn.commit()
+
+        self.maptype = self.get_metadata("maptype") or "basic"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------------- metadata ----------------
+
+    def get_metadata(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM metadata WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_metadata(self, **values):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+                [(name, str(value)) for name, value in values.items()]
+            )
+            self._conn.commit()
+
+    # ---------------- tiles ----------------
+
+    @staticmethod
+    def _tms_row(level, y):
+        return tile_count(level) - 1 - y
+
+    def count_tiles(self, level, x0, x1, y0, y1):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM tiles WHERE zoom_level = ? "
+                "AND tile_column BETWEEN ? AND ? AND tile_row BETWEEN ? AND ?",
+                (level, x0, x1, self._tms_row(level, y1), self._tms_row(level, y0))
+            ).fetchone()
+        return row[0]
+
+    def level_counts(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT zoom_level, COUNT(*) FROM tiles GROUP BY zoom_level ORDER BY zoom_level"
+            ).fetchall()
+
+    def put_tiles(self, level, tiles):
+        """tiles: [(x, y, encoded_png), ...] 를 한 트랜잭션으로 저장"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)",
+                [(level, x, self._tms_row(level, y), sqlite3.Binary(data)) for x, y, data in tiles]
+            )
+            self._conn.commit()
+
+    def _load_tiles(self, level, x0, x1, y0, y1):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tile_column, tile_row, tile_data FROM tiles WHERE zoom_level = ? "
+                "AND tile_column BETWEEN ? AND ? AND tile_row BETWEEN ? AND ?",
+                (level, x0, x1, self._tms_row(level, y1), self._tms_row(level, y0))
+            ).fetchall()
+        return [(x, self._tms_row(level, row), data) for x, row, data in rows]
+
+    def compose(self, params, allow_partial=False):
+        """저장된 타일로 뷰포트 이미지 합성. 타일이 부족하면 None (allow_partial 이면 빈 곳은 회색)"""
+        if params.get("maptype", "basic") != self.maptype or params.get("markers"):
+            return None
+
+        projection = MapProjection.from_params(params)
+        level, width, height = projection.level, projection.width, projection.height
+        left, top = projection.origin_x, projection.origin_y
+
+        last = tile_count(level) - 1
+        x0 = max(0, int(left // TILE_SIZE))
+        x1 = min(last, int((left + width - 1) // TILE_SIZE))
+        y0 = max(0, int(top // TILE_SIZE))
+        y1 = min(last, int((top + height - 1) // TILE_SIZE))
+
+        tiles = self._load_tiles(level, x0, x1, y0, y1)
+        expected = (x1 - x0 + 1) * (y1 - y0 + 1)
+        if not tiles or (len(tiles) < expected and not allow_partial):
+            return None
+
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(200, 200, 200))
+
+        painter = QPainter(image)
+        try:
+            for x, y, data in tiles:
+                tile = QImage.fromData(bytes(data))
+                if tile.isNull():
+                    continue
+                painter.drawImage(int(round(x * TILE_SIZE - left)), int(round(y * TILE_SIZE - top)), tile)
+        finally:
+            painter.end()
+
+        return image
+
+
+class OfflineTileSeeder:
+    """Static Map API 로 큰 이미지를 받아 256px 타일로 잘라 저장 (이어받기 지원)"""
+
+    BLOCK = 3     # 요청 한 번에 저장하는 3x3 타일
+    MARGIN = 128  # 로고/축척 막대가 있는 가장자리 (블록 + 양쪽 여백 = 1024px, Naver Static Map 최대 크기)
+
+    def __init__(self, store, static_map, rate_per_sec=2.0, maptype="basic"):
+        self.store = store
+        self.static_map = static_map
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self.maptype = maptype
+        self._last_request = 0.0
+
+    def blocks(self, bbox, level):
+        x0, x1, y0, y1 = tile_range(bbox, level)
+        for bx in range(x0 - x0 % self.BLOCK, x1 + 1, self.BLOCK):
+            for by in range(y0 - y0 % self.BLOCK, y1 + 1, self.BLOCK):
+                yield bx, by
+
+    def seed(self, bbox, levels, progress=print):
+        self.store.set_metadata(
+            name="biometric_radar offline map",
+            format="png",
+            maptype=self.maptype,
+            bounds=",".join(str(v) for v in bbox),
+            minzoom=min(levels),
+            maxzoom=max(levels)
+        )
+        self.store.maptype = self.maptype
+
+        for level in levels:
+            blocks = list(self.blocks(bbox, level))
+            last = tile_count(level) - 1
+            done = skipped = failed = 0
+
+            for bx, by in blocks:
+                x1 = min(bx + self.BLOCK - 1, last)
+                y1 = min(by + self.BLOCK - 1, last)
+
+                # 이미 저장된 블록은 건너뜀 (중단 후 재실행 시 이어받기)
+                if self.store.count_tiles(level, bx, x1, by, y1) == (x1 - bx + 1) * (y1 - by + 1):
+                    skipped += 1
+                    continue
+
+                if self._seed_block(level, bx, by, x1, y1):
+                    done += 1
+                else:
+                    failed += 1
+
+                progress(f"level {level}: {done + skipped + failed}/{len(blocks)} blocks "
+                         f"(new {done}, skipped {skipped}, failed {failed})")
+
+            progress(f"level {level} finished: new {done}, skipped {skipped}, failed {failed}")
+
+    def _throttle(self):
+        wait = self._last_request + self.interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request = time.monotonic()
+
+    def _seed_block(self, level, bx, by, x1, y1, retries=3):
+        block = self.BLOCK * TILE_SIZE
+        size = block + self.MARGIN * 2
+        lng, lat = world_to_lnglat(bx * TILE_SIZE + block / 2, by * TILE_SIZE + block / 2, level)
+        params = {
+            "center": f"{lng},{lat}",
+            "level": level,
+            "maptype": self.maptype,
+            "w": size,
+            "h": size
+        }
+
+        image = None
+        for attempt in range(retries):
+            self._throttle()
+            image, status = self.static_map.downloadImage(params)
+            if image is not None:
+                break
+            if status == 429:
+                # 호출 한도 초과 시 점점 길게 대기
+                time.sleep(2 ** (attempt + 1))
+        if image is None:
+            return False
+        if image.width() < size or image.height() < size:
+            # 작은 이미지를 잘라내면 빈 곳이 채워진 타일이 저장되고 완료된 블록으로 세어짐
+            print(f"Unexpected block size {image.width()}x{image.height()} at level {level} ({bx}, {by})")
+            return False
+
+        tiles = []
+        for x in range(bx, x1 + 1):
+            for y in range(by, y1 + 1):
+                left = self.MARGIN + (x - bx) * TILE_SIZE
+                top = self.MARGIN + (y - by) * TILE_SIZE
+                tile = image.copy(left, top, TILE_SIZE, TILE_SIZE)
+                tiles.append((x, y, self._encode_png(tile)))
+
+        self.store.put_tiles(level, tiles)
+        return True
+
+    @staticmethod
+    def _encode_png(image):
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data)
+
+
+def _parse_levels(text):
+    if "-" in text:
+        start, end = text.split("-", 1)
+        return list(range(int(start), int(end) + 1))
+    return [int(v) for v in text.split(",")]
+
+
+def main():
+    import yaml
+    from PyQt5.QtCore import QCoreApplication
+    from staticMap import StaticMap
+
+    base_dir = Path(__file__).resolve().parent
+
+    parser = argparse.ArgumentParser(description="Offline map tile store")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = sub.add_parser("seed", help="download tiles for a bounding box")
+    seed_parser.add_argument("--db", default=str(base_dir / "maps" / "offline.mbtiles"))
+    seed_parser.add_argument("--bbox", required=True, help="min_lng,min_lat,max_lng,max_lat")
+    seed_parser.add_argument("--levels", required=True, help="e.g. 14-18 or 15,17")
+    seed_parser.add_argument("--rate", type=float, default=2.0, help="requests per second")
+    seed_parser.add_argument("--maptype", default="basic")
+    seed_parser.add_argument("--config", default=str(base_dir / "config" / "config.yaml"))
+
+    info_parser = sub.add_parser("info", help="show stored tile counts")
+    info_parser.add_argument("--db", default=str(base_dir / "maps" / "offline.mbtiles"))
+
+    args = parser.parse_args()
+    app = QCoreApplication(sys.argv[:1])
+
+    store = OfflineTileStore(args.db)
+
+    if args.command == "info":
+        print(f"{args.db} (maptype={store.maptype}, bounds={store.get_metadata('bounds')})")
+        for level, count in store.level_counts():
+            print(f"  level {level}: {count} tiles")
+        store.close()
+        return
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    naver = config.get("naver_client", {})
+    static_map = StaticMap()
+    static_map.setEndpoint(config.get("map_api_url"))
+    static_map.setLogininfo(naver.get("id"), naver.get("key"))
+
+    bbox = tuple(float(v) for v in args.bbox.split(","))
+    seeder = OfflineTileSeeder(store, static_map, rate_per_sec=args.rate, maptype=args.maptype)
+
+    try:
+        seeder.seed(bbox, _parse_levels(args.levels))
+    except KeyboardInterrupt:
+        print("Interrupted. Run the same command again to resume.")
+    finally:
+        static_map.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+성능 HUD 용 계측 값 (프레임, 수신 문장 수, UI 갱신/페인트 시간, 지도 요청 지연)
+
+기록은 미리 잡아 둔 고정 크기 버퍼에 덮어쓰기만 한다. HUD 가 꺼져 있으면
+(PERF.enabled == False) 호출하는 쪽에서 시간 측정부터 건너뛴다.
+"""
+import os
+import threading
+import time
+from array import array
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class RingBuffer:
+    """최근 size 개 값 (float) 을 고정 크기 배열에 순환 저장"""
+
+    __slots__ = ("_values", "_size", "_index", "count")
+
+    def __init__(self, size=120):
+        self._values = array("d", bytes(8 * size))
+        self._size = size
+        self._index = 0
+        self.count = 0
+
+    def add(self, value):
+        self._values[self._index] = value
+        self._index = (self._index + 1) % self._size
+        if self.count < self._size:
+            self.count += 1
+
+    def last(self):
+        return self._values[self._index - 1] if self.count else None
+
+    def mean(self):
+        return sum(self._values[:self.count]) / self.count if self.count else None
+
+    def max(self):
+        return max(self._values[:self.count]) if self.count else None
+
+    def clear(self):
+        self._index = 0
+        self.count = 0
+
+
+class PerfCounters:
+
+    def __init__(self):
+        self.enabled = False
+
+        # 여러 스레드에서 더하는 누적 카운터 (HUD 가 주기적으로 차이를 읽음)
+        self.frames = 0
+        self.sentences = 0
+
+        self.ui_update_ms = RingBuffer()
+        self.paint_ms = RingBuffer()
+        self.fetch_ms = RingBuffer(32)
+
+        self._last_sample = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._last_sample = None
+        if not enabled:
+            self.ui_update_ms.clear()
+            self.paint_ms.clear()
+
+    def sample(self, cache=None):
+        """HUD 갱신 주기마다 호출. 직전 호출 이후의 초당 값 등 표시용 dict"""
+        now = time.monotonic()
+        frames, sentences = self.frames, self.sentences
+
+        fps = sentence_rate = 0.0
+        if self._last_sample is not None:
+            last_time, last_frames, last_sentences = self._last_sample
+            elapsed = now - last_time
+            if elapsed > 0:
+                fps = (frames - last_frames) / elapsed
+                sentence_rate = (sentences - last_sentences) / elapsed
+        self._last_sample = (now, frames, sentences)
+
+        return {
+            "fps": fps,
+            "sentences": sentence_rate,
+            "ui_ms": self.ui_update_ms.mean(),
+            "paint_ms": self.paint_ms.mean(),
+            "fetch_ms": self.fetch_ms.last(),
+            "hit_rate": cache.stats()["hit_rate"] if cache is not None else None,
+            "threads": thread_count(),
+            "rss_mb": rss_mb(),
+        }
+
+
+def thread_count():
+    """프로세스의 OS 스레드 수 (QThreadPool, Qt 내부 스레드 포함). Linux 가 아니면 Python 스레드 수로 대신"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return threading.active_count()
+
+
+def rss_mb():
+    """현재 메모리 사용량 (MB). Linux 가 아니면 최대 사용량으로 대신"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # macOS 는 바이트, Linux 는 KB 단위
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if peak > 1 << 30 else peak / 1024
+    return None
+
+
+def format_sample(sample):
+    def ms(value):
+        return f"{value:5.1f} ms" if value is not None else "    - ms"
+
+    hit_rate = f"{sample['hit_rate'] * 100:3.0f}%" if sample["hit_rate"] is not None else "  -"
+    rss = f"{sample['rss_mb']:.0f} MB" if sample["rss_mb"] is not None else "-"
+
+    return (
+        f"FPS {sample['fps']:5.1f}   NMEA {sample['sentences']:6.0f}/s\n"
+        f"UI  {ms(sample['ui_ms'])}   Paint {ms(sample['paint_ms'])}\n"
+        f"Map {ms(sample['fetch_ms'])}   Cache {hit_rate}\n"
+        f"Threads {sample['threads']:3d}   RSS {rss}"
+    )
+
+
+PERF = PerfCounters()
@@ -0,0 +1,249 @@
+"""
+센서 전원 상태 (포트 23) 변화 기록
+
+수신한 값을 모두 넘겨받아 상태가 바뀐 순간만 이벤트로 남긴다. 한 번 바뀐 뒤 debounce 시간 안에
+들어온 짧은 변화 (예: 0.1초 감지 후 바로 해제) 도 버리지 않고 debounced 로 표시한 이벤트 쌍으로
+남긴다. 같은 구간 안의 그 뒤 흔들림은 이벤트로 만들지 않고 마지막 이벤트의 chatter 로만 세며,
+구간이 지난 뒤 마지막 값이 기록된 상태와 다르면 그때 이벤트로 남긴다.
+
+이벤트는 센서별 고정 크기 순환 버퍼에 시간 순으로 쌓이므로, 기간 조회는 센서마다 이진 탐색으로
+시작 위치만 찾고 그 뒤만 읽는다.
+"""
+import heapq
+import threading
+import time
+from array import array
+
+
+# 순환 버퍼에 저장하는 상태 값 (None = 연결 끊김)
+_STATE_CODES = {True: 1, False: 0, None: -1}
+_CODE_STATES = {code: state for state, code in _STATE_CODES.items()}
+
+_UNSET = object()
+
+
+class PowerEvent:
+    __slots__ = ("ip", "time", "power", "previous", "chatter", "debounced")
+
+    def __init__(self, ip, time, power, previous, chatter=0, debounced=False):
+        self.ip = ip
+        self.time = time            # 수신 시각 (time.time())
+        self.power = power          # True: 감지, False: 미감지, None: 연결 끊김
+        self.previous = previous
+        self.chatter = chatter      # 이 이벤트 뒤 같은 debounce 구간 안에서 무시한 상태 변화 수
+        self.debounced = debounced  # debounce 구간 안의 짧은 변화 (이벤트 쌍으로 기록)
+
+    def __repr__(self):
+        flag = ", debounced" if self.debounced else ""
+        return f"PowerEvent({self.ip}, {self.time:.3f}, {self.previous} -> {self.power}, chatter={self.chatter}{flag})"
+
+
+class _SensorTimeline:
+    """센서 하나의 이벤트 순환 버퍼와 debounce 상태"""
+
+    __slots__ = ("times", "states", "chatter", "debounced", "start", "count",
+                 "state", "last_edge", "raw", "raw_time", "pulsed")
+
+    def __init__(self, capacity):
+        self.times = array("d", bytes(8 * capacity))
+        self.states = array("b", bytes(capacity))
+        self.chatter = array("I", bytes(4 * capacity))
+        self.debounced = array("b", bytes(capacity))
+        self.start = 0
+        self.count = 0
+
+        self.state = _UNSET           # 마지막으로 기록한 상태
+        self.last_edge = float("-inf")
+        self.raw = _UNSET             # 마지막으로 수신한 값
+        self.raw_time = 0.0
+        self.pulsed = False           # 지금 debounce 구간에 짧은 변화를 이미 기록했는지
+
+    def slot(self, i):
+        """i 번째 (오래된 것부터) 이벤트의 버퍼 위치"""
+        return (self.start + i) % len(self.times)
+
+    def append(self, now, state, debounced=False):
+        capacity = len(self.times)
+        if self.count < capacity:
+            slot = (self.start + self.count) % capacity
+            self.count += 1
+        else:
+            # 가득 차면 가장 오래된 이벤트 위에 덮어씀
+            slot = self.start
+            self.start = (self.start + 1) % capacity
+        self.times[slot] = now
+        self.states[slot] = _STATE_CODES[state]
+        self.chatter[slot] = 0
+        self.debounced[slot] = debounced
+
+    def first_at_or_after(self, since):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[self.slot(mid)] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def last_time(self):
+        return self.times[self.slot(self.count - 1)] if self.count else None
+
+
+class PowerEventLog:
+    """센서별 전원 상태 이벤트. 아무 스레드에서나 record/조회 가능"""
+
+    def __init__(self, debounce=0.5, capacity=1024):
+        self.debounce = debounce
+        self.capacity = capacity
+        self.on_event = None  # 이벤트가 기록될 때: on_event(PowerEvent) (기록한 스레드에서 호출)
+
+        self._lock = threading.Lock()
+        self._timelines = {}  # {ip: _SensorTimeline}
+
+    def record(self, ip, power, now=None):
+        """수신한 전원 값 하나 (같은 값이 반복돼도 그대로 넘기면 됨)"""
+        events = []
+        with self._lock:
+            timeline = self._timelines.get(ip)
+            if timeline is None:
+                timeline = self._timelines[ip] = _SensorTimeline(self.capacity)
+
+            now = time.time() if now is None else now
+            # 이진 탐색을 위해 시각은 줄어들지 않게 (시스템 시계가 뒤로 가는 경우)
+            if timeline.count:
+                now = max(now, timeline.last_time())
+
+            self._settle(ip, timeline, now, events)
+
+            if power != timeline.raw:
+                if now - timeline.last_edge >= self.debounce:
+                    if power != timeline.state:
+                        self._commit(ip, timeline, power, now, events)
+                elif timeline.pulsed:
+                    # 이미 짧은 변화를 기록한 구간의 흔들림은 개수만 셈 (구간이 끝나면 _settle 에서 정리)
+                    timeline.chatter[timeline.slot(timeline.count - 1)] += 1
+                elif timeline.raw != timeline.state:
+                    # 구간 안에서 시작된 변화가 끝남: 시작과 끝을 debounced 이벤트 쌍으로 기록
+                    self._commit_pulse(ip, timeline, timeline.raw, timeline.raw_time, events)
+                    if power != timeline.state:
+                        self._commit_pulse(ip, timeline, power, now, events)
+                timeline.raw, timeline.raw_time = power, now
+
+        self._dispatch(events)
+
+    def remove(self, ip):
+        with self._lock:
+            self._timelines.pop(ip, None)
+
+    def state(self, ip):
+        """debounce 를 거친 현재 상태 (기록이 없으면 None)"""
+        self.settle()
+        with self._lock:
+            timeline = self._timelines.get(ip)
+            if timeline is None or timeline.state is _UNSET:
+                return None
+            return timeline.state
+
+    def events(self, ip, since=None, until=None):
+        """센서 하나의 이벤트 (오래된 것부터)"""
+        self.settle()
+        with self._lock:
+            timeline = self._timelines.get(ip)
+            if timeline is None:
+                return []
+            return self._range(ip, timeline, since, until)
+
+    def fleet_events(self, since, until=None, power=_UNSET):
+        """모든 센서의 since 이후 이벤트를 시간 순으로. power 를 주면 그 상태로 바뀐 이벤트만
+        예: 최근 1시간 동안의 감지 -> fleet_events(time.time() - 3600, power=True)
+        """
+        self.settle()
+        with self._lock:
+            per_sensor = []
+            for ip, timeline in self._timelines.items():
+                # 기간 안에 이벤트가 없는 센서는 버퍼를 읽지 않음
+                last = timeline.last_time()
+                if last is None or last < since:
+                    continue
+                events = self._range(ip, timeline, since, until)
+                if power is not _UNSET:
+                    events = [event for event in events if event.power == power]
+                if events:
+                    per_sensor.append(events)
+
+        return list(heapq.merge(*per_sensor, key=lambda event: event.time))
+
+    def flapping(self, since, min_changes=4):
+        """since 이후 상태 변화 (이벤트 + 무시한 흔들림) 가 min_changes 이상인 센서: {ip: 변화 수}"""
+        self.settle()
+        result = {}
+        with self._lock:
+            for ip, timeline in self._timelines.items():
+                last = timeline.last_time()
+                if last is None or last < since:
+                    continue
+                changes = 0
+                for i in range(timeline.first_at_or_after(since), timeline.count):
+                    changes += 1 + timeline.chatter[timeline.slot(i)]
+                if changes >= min_changes:
+                    result[ip] = changes
+        return result
+
+    def settle(self, now=None):
+        """debounce 시간이 지난 보류 값을 이벤트로 확정 (새 값이 오지 않는 센서용)"""
+        events = []
+        now = time.time() if now is None else now
+        with self._lock:
+            for ip, timeline in self._timelines.items():
+                self._settle(ip, timeline, now, events)
+        self._dispatch(events)
+
+    def _settle(self, ip, timeline, now, events):
+        if timeline.raw is _UNSET or timeline.raw == timeline.state:
+            return
+        if now - timeline.last_edge >= self.debounce:
+            self._commit(ip, timeline, timeline.raw, max(timeline.raw_time, timeline.last_time()), events)
+
+    def _commit(self, ip, timeline, power, now, events):
+        if timeline.state is _UNSET and power is None:
+            # 한 번도 연결되지 않은 센서의 연결 실패는 이벤트가 아님
+            timeline.state = None
+            return
+        previous = None if timeline.state is _UNSET else timeline.state
+        timeline.append(now, power)
+        timeline.state = power
+        timeline.last_edge = now
+        timeline.pulsed = False
+        events.append(PowerEvent(ip, now, power, previous))
+
+    def _commit_pulse(self, ip, timeline, power, now, events):
+        """debounce 구간 안의 짧은 변화. 구간 시작 시각 (last_edge) 은 그대로 둠"""
+        previous = timeline.state
+        timeline.append(now, power, debounced=True)
+        timeline.state = power
+        timeline.pulsed = True
+        events.append(PowerEvent(ip, now, power, previous, debounced=True))
+
+    def _range(self, ip, timeline, since, until):
+        start = 0 if since is None else timeline.first_at_or_after(since)
+        events = []
+        previous = None
+        if start > 0:
+            previous = _CODE_STATES[timeline.states[timeline.slot(start - 1)]]
+        for i in range(start, timeline.count):
+            slot = timeline.slot(i)
+            event_time = timeline.times[slot]
+            if until is not None and event_time > until:
+                break
+            power = _CODE_STATES[timeline.states[slot]]
+            events.append(PowerEvent(
+                ip, event_time, power, previous, timeline.chatter[slot], bool(timeline.debounced[slot])
+            ))
+            previous = power
+        return events
+
+    def _dispatch(self, events):
+        if self.on_event:
+            for event in events:
+                self.on_event(event)
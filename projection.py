@@ -0,0 +1,136 @@
+"""
+Naver 지도 레벨 기준 Web Mercator 투영
+
+지도 이동, 마커 표시, 히트 테스트, 프리페치/오프라인 타일이 모두 이 모듈을 사용한다.
+모든 변환 함수는 float 하나와 NumPy 배열을 모두 받는다 (배열이면 배열 반환).
+NumPy 는 배열을 처음 변환할 때 import 한다 (창을 띄우기 전에는 float 변환만 씀).
+"""
+import math
+
+np = None
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy as module
+        np = module
+    return np
+
+
+TILE_SIZE = 256
+MAX_LATITUDE = 85.05112878
+EARTH_CIRCUMFERENCE = 40075016.68557849  # 적도 둘레 (m)
+
+
+def world_size(level):
+    # Naver level 은 256px 타일 기준 줌보다 1 크게 보정 (level 당 타일 수 2^(level+1))
+    return TILE_SIZE * 2 ** (level + 1)
+
+
+def _is_scalar(*values):
+    return all(isinstance(v, (int, float)) for v in values)
+
+
+def lnglat_to_world(lng, lat, level):
+    """경위도 -> 해당 레벨의 월드 픽셀 좌표"""
+    world = world_size(level)
+
+    if _is_scalar(lng, lat):
+        lat = min(max(lat, -MAX_LATITUDE), MAX_LATITUDE)
+        siny = math.sin(math.radians(lat))
+        x = (lng + 180.0) / 360.0 * world
+        y = (0.5 - math.log((1 + siny) / (1 - siny)) / (4 * math.pi)) * world
+        return x, y
+
+    _load_numpy()
+    lng = np.asarray(lng, dtype=np.float64)
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE)
+    siny = np.sin(np.radians(lat))
+    x = (lng + 180.0) * (world / 360.0)
+    y = (0.5 - np.log((1 + siny) / (1 - siny)) / (4 * math.pi)) * world
+    return x, y
+
+
+def world_to_lnglat(x, y, level):
+    """월드 픽셀 좌표 -> 경위도"""
+    world = world_size(level)
+
+    if _is_scalar(x, y):
+        lng = x / world * 360.0 - 180.0
+        lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / world))))
+        return lng, lat
+
+    _load_numpy()
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    lng = x * (360.0 / world) - 180.0
+    lat = np.degrees(np.arctan(np.sinh(math.pi * (1 - 2 * y / world))))
+    return lng, lat
+
+
+def offset_center(lng, lat, level, dx, dy):
+    """화면 픽셀 오프셋(dx: 오른쪽, dy: 아래)만큼 이동한 지도 중심 좌표"""
+    x, y = lnglat_to_world(lng, lat, level)
+    return world_to_lnglat(x + dx, y + dy, level)
+
+
+def meters_per_pixel(lat, level):
+    return EARTH_CIRCUMFERENCE * math.cos(math.radians(lat)) / world_size(level)
+
+
+def parse_center(center):
+    """'lng,lat' 문자열 -> (lng, lat)"""
+    lng, lat = center.split(",")
+    return float(lng), float(lat)
+
+
+class MapProjection:
+    """한 뷰포트(중심, 레벨, 이미지 크기) 기준 경위도 <-> 화면 픽셀 변환"""
+
+    __slots__ = ("center_lng", "center_lat", "level", "width", "height", "origin_x", "origin_y")
+
+    def __init__(self, center_lng, center_lat, level, width, height):
+        self.center_lng = center_lng
+        self.center_lat = center_lat
+        self.level = level
+        self.width = width
+        self.height = height
+
+        # 화면 왼쪽 위 모서리의 월드 좌표 (뷰포트마다 한 번만 계산)
+        center_x, center_y = lnglat_to_world(center_lng, center_lat, level)
+        self.origin_x = center_x - width / 2
+        self.origin_y = center_y - height / 2
+
+    @classmethod
+    def from_params(cls, params):
+        lng, lat = parse_center(params["center"])
+        return cls(lng, lat, params["level"], params["w"], params["h"])
+
+    @property
+    def center(self):
+        return self.center_lng, self.center_lat
+
+    def to_screen(self, lng, lat):
+        x, y = lnglat_to_world(lng, lat, self.level)
+        return x - self.origin_x, y - self.origin_y
+
+    def to_lnglat(self, screen_x, screen_y):
+        return world_to_lnglat(screen_x + self.origin_x, screen_y + self.origin_y, self.level)
+
+    def contains(self, screen_x, screen_y, margin=0):
+        """화면 안에 있는지 (배열이면 불리언 마스크)"""
+        inside_x = (screen_x >= -margin) & (screen_x <= self.width + margin)
+        inside_y = (screen_y >= -margin) & (screen_y <= self.height + margin)
+        return inside_x & inside_y
+
+    def panned(self, dx, dy):
+        """화면을 (dx, dy) 픽셀 끌었을 때의 뷰포트. 끄는 방향과 반대로 중심이 이동"""
+        lng, lat = self.to_lnglat(self.width / 2 - dx, self.height / 2 - dy)
+        return MapProjection(lng, lat, self.level, self.width, self.height)
+
+    def zoomed(self, level):
+        return MapProjection(self.center_lng, self.center_lat, level, self.width, self.height)
+
+    def meters_per_pixel(self):
+        return meters_per_pixel(self.center_lat, self.level)
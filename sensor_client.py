@@ -2,23 +2,33 @@ import socket
 import threading
 import time
 
+from perf_hud import PERF
+
 
 class SensorClient:
     
     POWER_PORT = 23
     GPS_PORT = 24
     
+    SEEN_NOTIFY_INTERVAL = 0.5  # 값이 바뀌지 않은 수신은 센서마다 이 간격 (초) 에 한 번만 "seen" 으로 알림
+    
     def __init__(self):
         self.sensors = {}
         self.power_status = {}
         self.gps_data = {}
         self.rtk_status = {}
+        self.last_seen = {}  # 마지막 패킷 수신 시각 (값이 같아도 갱신): {ip: time.monotonic()}
+        self._seen_notified = {}  # 마지막으로 "seen" 을 알린 시각
         self.power_sockets = {}
         self.gps_sockets = {}
         self.nmea_message = None
         self.running = False
         self.threads = []
         
+        # 수신 스레드에서 호출되는 콜백
+        self.on_change = None        # 전원/GPS/RTK 값이 바뀔 때: on_change(ip, "power" | "gps" | "rtk"), 패킷 수신: "seen"
+        self.power_events = None     # 수신한 전원 값을 모두 기록할 PowerEventLog (없으면 기록 안 함)
+        
         self.reconnect_timers = {}  # {ip: {"power": time, "gps": time}}
         self.reconnect_interval = 5.0
         
@@ -66,6 +76,12 @@ class SensorClient:
         
         if ip in self.rtk_status:
             del self.rtk_status[ip]
+        
+        self.last_seen.pop(ip, None)
+        self._seen_notified.pop(ip, None)
+        
+        if self.power_events is not None:
+            self.power_events.remove(ip)
     
     def start(self):
         self.running = True
@@ -89,22 +105,7 @@ class SensorClient:
                     self.on_gps_update(ip, lng, lat)"""
                     
             # 실제 연결 시도
-            power_thread = threading.Thread(
-                target=self._connect_power_socket, 
-                args=(ip, channel),
-                daemon=True
-            )
-            gps_thread = threading.Thread(
-                target=self._connect_gps_socket, 
-                args=(ip, channel),
-                daemon=True
-            )
-            
-            power_thread.start()
-            gps_thread.start()
-            
-            self.threads.append(power_thread)
-            self.threads.append(gps_thread)
+            self.connect_sensor(ip, channel)
         
         reconnect_thread = threading.Thread(
             target=self._reconnect_loop,
@@ -113,6 +114,25 @@ class SensorClient:
         reconnect_thread.start()
         self.threads.append(reconnect_thread)
     
+    def connect_sensor(self, ip, channel):
+        """전원/GPS 소켓 연결 스레드 시작"""
+        power_thread = threading.Thread(
+            target=self._connect_power_socket, 
+            args=(ip, channel),
+            daemon=True
+        )
+        gps_thread = threading.Thread(
+            target=self._connect_gps_socket, 
+            args=(ip, channel),
+            daemon=True
+        )
+        
+        power_thread.start()
+        gps_thread.start()
+        
+        self.threads.append(power_thread)
+        self.threads.append(gps_thread)
+    
     def stop(self):
         self.running = False
         
@@ -186,11 +206,11 @@ class SensorClient:
         except socket.timeout:
             print(f"Power socket connection timeout: {ip}")
             if ip in self.sensors:
-                self.power_status[ip] = None
+                self._set_power(ip, None)
         except Exception as e:
             print(f"Power socket error ({ip}): {e}")
             if ip in self.sensors:
-                self.power_status[ip] = None
+                self._set_power(ip, None)
         finally:
             if ip in self.power_sockets:
                 del self.power_sockets[ip]
@@ -239,12 +259,16 @@ class SensorClient:
                 
                 if not byte:
                     print(f"Power socket closed: {ip}")
-                    self.power_status[ip] = None
+                    self._set_power(ip, None)
                     break
                 
                 if byte == P_STX:
                     data = sock.recv(2)
                     sock.recv(3)
+                    self._mark_seen(ip)
+                    
+                    if PERF.enabled:
+                        PERF.sentences += 1
                     
                     if data == b'01':
                         power = True
@@ -255,7 +279,7 @@ class SensorClient:
                     else:
                         continue
                     
-                    self.power_status[ip] = power
+                    self._set_power(ip, power)
 
                     # 임시 데이터
                     """self.power_status["192.168.123.1"] = True
@@ -268,7 +292,7 @@ class SensorClient:
                 continue
             except Exception as e:
                 print(f"Power receive error ({ip}): {e}")
-                self.power_status[ip] = None
+                self._set_power(ip, None)
                 break
     
     def _receive_gps_data(self, sock, ip):
@@ -291,6 +315,10 @@ class SensorClient:
                     
                     data = packet.decode('utf-8', errors='ignore')
                     fields = data.split(',')
+                    self._mark_seen(ip)
+                    
+                    if PERF.enabled:
+                        PERF.sentences += 1
                     
                     self.nmea_message = data.strip()
                     
@@ -299,19 +327,25 @@ class SensorClient:
                             try:
                                 lat = self._nmea_to_decimal(fields[2])
                                 lng = self._nmea_to_decimal(fields[4])
-                                self.gps_data[ip] = (lng, lat)
+                                if self.gps_data.get(ip) != (lng, lat):
+                                    self.gps_data[ip] = (lng, lat)
+                                    self._notify(ip, "gps")
                                 
                                 quality = int(fields[6]) if fields[6] else 0
                                 
                                 # quality: 0=No fix, 1=GPS, 2=DGPS, 4=RTK fixed, 5=RTK float
                                 if quality == 4:
-                                    self.rtk_status[ip] = 'fixed'
+                                    rtk = 'fixed'
                                     print(f"RTK Fixed: {ip}")
                                 elif quality == 5:
-                                    self.rtk_status[ip] = 'float'
+                                    rtk = 'float'
                                     print(f"RTK Float: {ip}")
                                 else:
-                                    self.rtk_status[ip] = 'none'
+                                    rtk = 'none'
+                                
+                                if self.rtk_status.get(ip) != rtk:
+                                    self.rtk_status[ip] = rtk
+                                    self._notify(ip, "rtk")
                                 
                             except (ValueError, IndexError) as e:
                                 print(f"GPS parse error ({ip}): {e}")
@@ -324,6 +358,28 @@ class SensorClient:
                 print(f"GPS receive error ({ip}): {e}")
                 break
 
+    def _set_power(self, ip, power):
+        if self.power_events is not None and ip in self.sensors:
+            self.power_events.record(ip, power)
+        
+        previous = self.power_status.get(ip)
+        self.power_status[ip] = power
+        if power == previous:
+            return
+        
+        self._notify(ip, "power")
+    
+    def _mark_seen(self, ip):
+        now = time.monotonic()
+        self.last_seen[ip] = now
+        if now - self._seen_notified.get(ip, float("-inf")) >= self.SEEN_NOTIFY_INTERVAL:
+            self._seen_notified[ip] = now
+            self._notify(ip, "seen")
+    
+    def _notify(self, ip, kind):
+        if self.on_change:
+            self.on_change(ip, kind)
+
     def send_rtcm(self, rtcm_data):
         for ip, sock in list(self.gps_sockets.items()):
             try:
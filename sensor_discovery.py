@@ -0,0 +1,191 @@
+"""
+서브넷에서 센서 자동 탐색 (asyncio)
+
+포트 23(전원)과 24(GPS)가 모두 연결을 받고 연결 직후 인사 메시지를 보내는 호스트를
+센서로 판단한다 (SensorClient._connect_power_socket 이 연결 후 20바이트를 읽는 것과 같은 확인).
+수천 개의 연결을 동시에 시도하므로 응답 없는 주소가 많아도 /24 하나는 타임아웃 한두 번이면 끝난다.
+한 번에 탐색하는 범위는 IPv4 로 합쳐서 MAX_SCAN_HOSTS (/16) 까지이고, 호스트 주소는 고정된 수의
+작업 코루틴이 하나씩 꺼내 쓰므로 범위가 커도 메모리와 작업 수는 늘지 않는다.
+"""
+import asyncio
+import ipaddress
+import threading
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+POWER_PORT = 23
+GPS_PORT = 24
+GREETING_SIZE = 20
+
+
+# 한 번에 탐색하는 주소 수 한도 (서브넷 합계)
+MAX_SCAN_HOSTS = 65536
+
+
+def check_subnets(subnets):
+    """서브넷 문자열 -> [IPv4Network]. 형식이 잘못됐거나 IPv6 이거나 합계가 MAX_SCAN_HOSTS 를 넘으면 ValueError"""
+    networks = []
+    for subnet in subnets:
+        network = ipaddress.ip_network(subnet.strip(), strict=False)
+        if network.version != 4:
+            raise ValueError(f"{subnet.strip()}: only IPv4 subnets are supported")
+        networks.append(network)
+
+    total = sum(network.num_addresses for network in networks)
+    if total > MAX_SCAN_HOSTS:
+        raise ValueError(f"{total} addresses to scan (max {MAX_SCAN_HOSTS})")
+    return networks
+
+
+def host_count(networks):
+    """탐색할 호스트 수 (겹치는 서브넷은 중복으로 셈)"""
+    return sum(network.num_addresses - 2 if network.num_addresses > 2 else network.num_addresses
+               for network in networks)
+
+
+def iter_hosts(networks, skip=()):
+    """서브넷의 호스트 주소를 하나씩 (중복과 skip 은 제외)"""
+    seen = set(skip)
+    for network in networks:
+        hosts = network.hosts() if network.num_addresses > 1 else [network.network_address]
+        for host in hosts:
+            ip = str(host)
+            if ip not in seen:
+                seen.add(ip)
+                yield ip
+
+
+def max_concurrency(requested):
+    """열 수 있는 파일 수 한도를 넘지 않도록 동시 연결 수 제한 (연결 하나 = 소켓 하나)"""
+    if resource is None:
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(16, min(requested, soft - 64))
+
+
+async def read_greeting(ip, port, timeout):
+    """연결 후 인사 메시지 (최대 GREETING_SIZE 바이트). 연결 실패/무응답이면 None"""
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        greeting = await asyncio.wait_for(reader.read(GREETING_SIZE), timeout)
+        return greeting or None
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def probe_sensor(ip, timeout, greeting_prefix=b""):
+    """두 포트를 동시에 확인. 센서로 보이면 (power 인사, gps 인사), 아니면 None"""
+    power, gps = await asyncio.gather(
+        read_greeting(ip, POWER_PORT, timeout),
+        read_greeting(ip, GPS_PORT, timeout)
+    )
+    if power is None or gps is None:
+        return None
+    if greeting_prefix and not power.startswith(greeting_prefix):
+        return None
+    return power, gps
+
+
+class SensorDiscovery(QObject):
+    """백그라운드 스레드의 asyncio 루프에서 서브넷을 탐색하고 찾은 센서를 바로바로 알림"""
+
+    found = pyqtSignal(str, bytes, bytes)  # ip, power 인사, gps 인사
+    progress = pyqtSignal(int, int)        # 확인한 호스트 수, 전체 호스트 수
+    finished = pyqtSignal(int, int, float)  # 찾은 센서 수, 전체 호스트 수, 걸린 시간(초)
+
+    PROGRESS_INTERVAL = 0.05
+
+    def __init__(self, timeout=0.5, concurrency=2048, greeting_prefix=b"", parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.greeting_prefix = greeting_prefix
+        self._thread = None
+        self._loop = None
+        self._task = None
+        self._cancelled = threading.Event()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, subnets, skip=()):
+        """서브넷 범위가 잘못됐거나 너무 크면 ValueError"""
+        if self.is_running():
+            return False
+
+        networks = check_subnets(subnets)
+        self._cancelled.clear()
+        self._thread = threading.Thread(target=self._run, args=(networks, set(skip)), daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self._cancelled.set()
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # 그 사이 탐색이 끝나 루프가 닫힘
+                pass
+
+    def _run(self, networks, skip):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._scan(networks, skip))
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._task = None
+
+    async def _scan(self, networks, skip):
+        started = time.monotonic()
+        hosts = iter_hosts(networks, skip)
+        total = host_count(networks)  # 중복/skip 을 빼기 전 수 (끝나면 실제 확인한 수로 알림)
+        done = found = 0
+        last_progress = 0.0
+
+        async def worker():
+            nonlocal done, found, last_progress
+            # 같은 스레드의 코루틴끼리라 이터레이터를 나눠 써도 안전
+            for ip in hosts:
+                if self._cancelled.is_set():
+                    return
+                greetings = await probe_sensor(ip, self.timeout, self.greeting_prefix)
+                done += 1
+                if greetings:
+                    found += 1
+                    self.found.emit(ip, greetings[0], greetings[1])
+
+                now = time.monotonic()
+                if now - last_progress >= self.PROGRESS_INTERVAL:
+                    last_progress = now
+                    self.progress.emit(done, total)
+
+        # 호스트 하나가 소켓 두 개를 씀
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, max_concurrency(self.concurrency) // 2))]
+        try:
+            await asyncio.gather(*workers)
+            self.progress.emit(done, done)
+        finally:
+            # 중간에 취소되면 남은 연결 시도도 정리
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.finished.emit(found, done, time.monotonic() - started)
@@ -0,0 +1,54 @@
+import threading
+
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+
+class SensorEventBridge(QObject):
+    """센서 수신 스레드의 변경 알림을 UI 스레드로 전달. 한 프레임 동안의 변경을 모아 한 번만 알림"""
+
+    changes_ready = pyqtSignal(object)  # {ip: {"power", "gps", "rtk", ...}}
+    _wake = pyqtSignal()
+
+    FRAME_INTERVAL_MS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._scheduled = False
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._frame_timer.timeout.connect(self._flush)
+
+        # 다른 스레드에서 emit 해도 UI 스레드에서 실행되도록 항상 큐 연결
+        self._wake.connect(self._on_wake, Qt.QueuedConnection)
+
+    def post(self, ip, kind):
+        """아무 스레드에서나 호출 가능"""
+        with self._lock:
+            kinds = self._pending.get(ip)
+            if kinds is None:
+                kinds = self._pending[ip] = set()
+            kinds.add(kind)
+
+            # 이미 다음 프레임 알림이 예약돼 있으면 모으기만 함
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        self._wake.emit()
+
+    def _on_wake(self):
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def _flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._scheduled = False
+
+        if pending:
+            self.changes_ready.emit(pending)
@@ -0,0 +1,194 @@
+"""
+센서 일괄 등록 (CSV 파일, CIDR 범위) 과 연결 확인
+
+CSV 한 줄: ip[,channel]  (첫 줄이 "ip,channel" 같은 헤더면 건너뜀, # 으로 시작하면 주석)
+ip 자리에 192.168.119.0/24 처럼 CIDR 범위를 쓰면 범위 안의 호스트 중 응답하는 것만 등록한다.
+범위는 IPv4 이고 MAX_RANGE_HOSTS (/20) 이하여야 하며, 호스트 목록은 확인 스레드에서 하나씩 만든다.
+"""
+import csv
+import ipaddress
+import itertools
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class ImportEntry:
+    __slots__ = ("ip", "channel", "explicit")
+
+    def __init__(self, ip, channel=None, explicit=True):
+        self.ip = ip
+        self.channel = channel
+        self.explicit = explicit  # 직접 적은 IP 는 응답이 없어도 등록 (재연결 루프가 이어서 시도)
+
+
+# 한 번에 확인하는 CIDR 범위의 최대 주소 수 (/20). 더 큰 범위는 나눠서 입력
+MAX_RANGE_HOSTS = 4096
+
+
+def check_range(text):
+    """CIDR 문자열 -> IPv4Network. IPv6 이거나 MAX_RANGE_HOSTS 보다 크면 ValueError"""
+    network = ipaddress.ip_network(text.strip(), strict=False)
+    if network.version != 4:
+        raise ValueError("only IPv4 ranges are supported")
+    if network.num_addresses > MAX_RANGE_HOSTS:
+        raise ValueError(f"range has {network.num_addresses} addresses (max {MAX_RANGE_HOSTS})")
+    return network
+
+
+def expand_target(text, channel=None):
+    """IP 하나 또는 CIDR 범위 -> ImportEntry 이터레이터. 형식은 바로 검사하고 (잘못되면 ValueError)
+    범위의 호스트는 꺼낼 때 만듦
+    """
+    text = text.strip()
+    if "/" in text:
+        return _range_entries(check_range(text))
+
+    ipaddress.ip_address(text)  # 형식 확인 (잘못되면 ValueError)
+    return iter([ImportEntry(text, channel or None)])
+
+
+def _range_entries(network):
+    empty = True
+    for host in network.hosts():
+        empty = False
+        yield ImportEntry(str(host), None, explicit=False)
+    if empty:
+        yield ImportEntry(str(network.network_address), None, explicit=False)
+
+
+def parse_rows(rows):
+    """CSV 줄 -> ImportEntry 이터레이터 (잘못된 줄은 건너뛰고 알림)"""
+    entries = []
+    for number, row in enumerate(rows, 1):
+        fields = [field.strip() for field in row]
+        if not fields or not fields[0] or fields[0].startswith("#"):
+            continue
+        if number == 1 and fields[0].lower() in ("ip", "address", "ip_address"):
+            continue
+
+        channel = fields[1] if len(fields) > 1 and fields[1] else None
+        try:
+            entries.append(expand_target(fields[0], channel))
+        except ValueError as e:
+            print(f"Import: invalid address on line {number}: {fields[0]} ({e})")
+    return itertools.chain.from_iterable(entries)
+
+
+def load_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return parse_rows(csv.reader(f))
+
+
+class ChannelAllocator:
+    """자동 채널 이름 (ch1, ch2, ...) 을 O(1) 로 발급. 지금까지의 최대 번호 다음을 사용"""
+
+    PREFIX = "ch"
+
+    def __init__(self, channels=()):
+        self._max = 0
+        for channel in channels:
+            self.reserve(channel)
+
+    def reserve(self, channel):
+        number = self._number(channel)
+        if number is not None and number > self._max:
+            self._max = number
+
+    def allocate(self):
+        self._max += 1
+        return f"{self.PREFIX}{self._max}"
+
+    def _number(self, channel):
+        if channel and channel.startswith(self.PREFIX):
+            try:
+                return int(channel[len(self.PREFIX):])
+            except ValueError:
+                return None
+        return None
+
+
+def probe_port(ip, port, timeout):
+    try:
+        with socket.create_connection((ip, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class SensorImporter(QObject):
+    """센서 후보의 포트 23/24 를 제한된 동시 연결 수로 확인하고 결과를 하나씩 알림"""
+
+    probed = pyqtSignal(object, bool, bool)  # ImportEntry, power port 응답, gps port 응답
+    finished = pyqtSignal(int, int)          # 확인한 후보 수, 응답한 후보 수
+
+    POWER_PORT = 23
+    GPS_PORT = 24
+
+    def __init__(self, max_parallel=64, timeout=1.0, parent=None):
+        super().__init__(parent)
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, entries, skip=()):
+        """entries: ImportEntry 이터러블 (CIDR 범위는 확인 스레드에서 꺼냄), skip: 이미 등록된 IP"""
+        if self.is_running():
+            print("Import already in progress")
+            return False
+
+        self._cancelled.clear()
+        self._thread = threading.Thread(target=self._run, args=(entries, set(skip)), daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self, entries, seen):
+        lock = threading.Lock()
+        pending = {}   # {ip: [power 응답, gps 응답, 남은 포트 수]}
+        reachable = [0]
+
+        def probe(entry, port):
+            if self._cancelled.is_set():
+                return
+            ok = probe_port(entry.ip, port, self.timeout)
+
+            with lock:
+                state = pending.setdefault(entry.ip, [False, False, 2])
+                state[0 if port == self.POWER_PORT else 1] = ok
+                state[2] -= 1
+                if state[2]:
+                    return
+                if state[0] or state[1]:
+                    reachable[0] += 1
+
+            self.probed.emit(entry, state[0], state[1])
+
+        # 대기 중인 작업 수를 제한해서 후보를 필요한 만큼만 꺼냄
+        slots = threading.BoundedSemaphore(self.max_parallel * 2)
+        total = 0
+
+        # 두 포트를 따로 작업으로 넣어 한 센서의 두 포트도 동시에 확인
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            for entry in entries:
+                if self._cancelled.is_set():
+                    break
+                # 같은 IP 는 처음 나온 것만, 이미 등록된 센서는 제외
+                if entry.ip in seen:
+                    continue
+                seen.add(entry.ip)
+                total += 1
+
+                for port in (self.POWER_PORT, self.GPS_PORT):
+                    slots.acquire()
+                    pool.submit(probe, entry, port).add_done_callback(lambda _: slots.release())
+
+        self.finished.emit(total, reachable[0])
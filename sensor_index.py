@@ -0,0 +1,159 @@
+"""
+센서 목록 검색/필터/정렬용 보조 인덱스
+
+센서 값이 바뀔 때마다 해당 센서의 항목만 고쳐서, 필터나 정렬을 바꿀 때
+전체 센서를 다시 정렬하지 않고 인덱스 순서대로 한 번 훑기만 하면 되도록 한다.
+"""
+import bisect
+import ipaddress
+import re
+from collections import OrderedDict
+
+
+SORT_MODES = ("added", "ip", "channel", "power", "fix", "last_seen")
+
+# 위치 정확도: 0 = GPS 없음, 1 = 일반 GPS, 2 = RTK float, 3 = RTK fixed
+FIX_NONE, FIX_GPS, FIX_FLOAT, FIX_FIXED = range(4)
+
+
+def fix_quality(gps, rtk):
+    if gps is None:
+        return FIX_NONE
+    if rtk == 'fixed':
+        return FIX_FIXED
+    if rtk == 'float':
+        return FIX_FLOAT
+    return FIX_GPS
+
+
+def ip_sort_key(ip):
+    try:
+        return (0, int(ipaddress.ip_address(ip)), ip)
+    except ValueError:
+        return (1, 0, ip)
+
+
+def channel_sort_key(channel):
+    """ch2 < ch10 이 되도록 숫자 부분은 숫자로 비교"""
+    parts = re.split(r"(\d+)", channel.lower())
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in parts if part)
+
+
+class SensorIndex:
+
+    def __init__(self):
+        self.added = {}  # 추가 순서 (dict 는 삽입 순서 유지): {ip: channel}
+        self.power = {}
+        self.fix = {}
+
+        self.by_power = {True: set(), False: set(), None: set()}
+        self.by_fix = {quality: set() for quality in range(4)}
+
+        self._ip_order = []       # [(ip_sort_key, ip)]
+        self._channel_order = []  # [(channel_sort_key, ip)]
+        self._ip_text = []        # [(소문자 ip, ip)] 접두어 검색용
+        self._channel_text = []   # [(소문자 channel, ip)]
+        self._seen = OrderedDict()  # 패킷을 받은 센서 (최근에 받은 것이 뒤쪽): {ip: None}
+
+    def __len__(self):
+        return len(self.added)
+
+    def __contains__(self, ip):
+        return ip in self.added
+
+    def add(self, ip, channel):
+        self.added[ip] = channel
+        self.power[ip] = None
+        self.fix[ip] = FIX_NONE
+        self.by_power[None].add(ip)
+        self.by_fix[FIX_NONE].add(ip)
+
+        bisect.insort(self._ip_order, (ip_sort_key(ip), ip))
+        bisect.insort(self._channel_order, (channel_sort_key(channel), ip))
+        bisect.insort(self._ip_text, (ip.lower(), ip))
+        bisect.insort(self._channel_text, (channel.lower(), ip))
+
+    def remove(self, ip):
+        channel = self.added.pop(ip)
+        self.by_power[self.power.pop(ip)].discard(ip)
+        self.by_fix[self.fix.pop(ip)].discard(ip)
+
+        self._discard(self._ip_order, (ip_sort_key(ip), ip))
+        self._discard(self._channel_order, (channel_sort_key(channel), ip))
+        self._discard(self._ip_text, (ip.lower(), ip))
+        self._discard(self._channel_text, (channel.lower(), ip))
+        self._seen.pop(ip, None)
+
+    def rename(self, ip, channel):
+        old = self.added[ip]
+        if old == channel:
+            return
+        self.added[ip] = channel
+        self._discard(self._channel_order, (channel_sort_key(old), ip))
+        self._discard(self._channel_text, (old.lower(), ip))
+        bisect.insort(self._channel_order, (channel_sort_key(channel), ip))
+        bisect.insort(self._channel_text, (channel.lower(), ip))
+
+    def touch(self, ip):
+        """패킷 수신. 수신 시각은 늘어나기만 하므로 맨 뒤 (가장 최근) 로 옮기기만 하면 됨"""
+        if ip in self.added:
+            self._seen[ip] = None
+            self._seen.move_to_end(ip)
+
+    def set_power(self, ip, power):
+        previous = self.power[ip]
+        if previous != power:
+            self.by_power[previous].discard(ip)
+            self.by_power[power].add(ip)
+            self.power[ip] = power
+
+    def set_fix(self, ip, quality):
+        previous = self.fix[ip]
+        if previous != quality:
+            self.by_fix[previous].discard(ip)
+            self.by_fix[quality].add(ip)
+            self.fix[ip] = quality
+
+    def prefix_matches(self, text):
+        """IP 또는 채널이 text 로 시작하는 센서 집합"""
+        text = text.lower()
+        result = set()
+        for entries in (self._ip_text, self._channel_text):
+            start = bisect.bisect_left(entries, (text,))
+            for i in range(start, len(entries)):
+                key, ip = entries[i]
+                if not key.startswith(text):
+                    break
+                result.add(ip)
+        return result
+
+    def order(self, mode):
+        """정렬 모드별 전체 IP 순서"""
+        if mode == "ip":
+            return [ip for _, ip in self._ip_order]
+        if mode == "channel":
+            return [ip for _, ip in self._channel_order]
+        if mode == "power":
+            # 감지됨, 미감지, 연결 끊김 순 (같은 상태 안에서는 IP 순)
+            rank = {True: 0, False: 1, None: 2}
+            return self._bucketed(lambda ip: rank[self.power[ip]], 3)
+        if mode == "fix":
+            # 정확도 높은 순
+            return self._bucketed(lambda ip: FIX_FIXED - self.fix[ip], 4)
+        if mode == "last_seen":
+            # 최근에 수신한 순 (한 번도 수신하지 못한 센서는 맨 뒤에 추가 순서로)
+            seen = self._seen
+            return list(reversed(seen)) + [ip for ip in self.added if ip not in seen]
+        return list(self.added)
+
+    def _bucketed(self, rank, count):
+        buckets = [[] for _ in range(count)]
+        for _, ip in self._ip_order:
+            buckets[rank(ip)].append(ip)
+        return [ip for bucket in buckets for ip in bucket]
+
+    @staticmethod
+    def _discard(entries, entry):
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
@@ -1,60 +1,433 @@
-from PyQt5.QtWidgets import QApplication, QTreeWidget, QTreeWidgetItem, QLabel, QVBoxLayout, QWidget, QPushButton, QHBoxLayout
-from PyQt5.QtGui import QFont, QColor, QIcon
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
+from PyQt5.QtWidgets import QApplication, QListView, QLabel, QVBoxLayout, QHBoxLayout, QWidget, QStyledItemDelegate, QStyle, QAbstractItemView, QLineEdit, QComboBox
+from PyQt5.QtGui import QFont, QColor, QIcon, QFontMetrics, QPainter
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QRect, QEvent, QAbstractListModel, QModelIndex, QTimer
 
-class SensorTreeItem(QWidget):
+from sensor_index import SORT_MODES, FIX_NONE, FIX_GPS, FIX_FLOAT, FIX_FIXED, SensorIndex, fix_quality
+
+
+class SensorRecord:
+    __slots__ = ("ip", "channel", "power", "gps", "rtk", "expanded", "stale")
+    
+    def __init__(self, ip, channel):
+        self.ip = ip
+        self.channel = channel
+        self.power = None
+        self.gps = None
+        self.rtk = None
+        self.expanded = True
+        self.stale = False  # 스냅샷에서 복원한 값 (실시간 값이 아직 없음)
+
+
+class SensorListModel(QAbstractListModel):
+    """센서 한 개 = 한 행. 값이 실제로 바뀐 행에만 dataChanged 발생
+    
+    필터/정렬은 SensorIndex 의 보조 인덱스로 계산하고, 정렬/필터 기준 값이 바뀐 경우만
+    다음 이벤트 루프에서 한 번 재배치한다. 재배치는 모델 리셋 없이 행 삭제/삽입/이동으로
+    알려서 선택과 스크롤 위치를 유지한다.
+    """
+    
+    RecordRole = Qt.UserRole + 1
+    
+    LAST_SEEN_REFRESH_MS = 1000
+    MAX_ROW_MOVES = 8  # 이보다 많은 행이 앞으로 오면 하나씩 옮기지 않고 layoutChanged 한 번으로 재배치 (뷰가 이동마다 다시 배치함)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records = {}  # {ip: SensorRecord}
+        self._view = []     # 화면에 표시되는 IP (필터/정렬 적용 순서)
+        self._rows = {}     # {ip: row}
+        
+        self.sensor_index = SensorIndex()
+        self.sort_mode = "added"
+        self.filter_text = ""
+        self.filter_state = None  # ("power", True/False/None) 또는 ("fix", 품질)
+        
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(0)
+        self._relayout_timer.timeout.connect(self._relayout)
+        
+        # 수신은 값 변화 없이도 계속 일어나므로 "last_seen" 정렬은 모아서 주기적으로 앞으로 옮김
+        self._touched = {}  # 마지막 반영 이후 수신한 센서 (수신 순서): {ip: None}
+        self._last_seen_timer = QTimer(self)
+        self._last_seen_timer.setInterval(self.LAST_SEEN_REFRESH_MS)
+        self._last_seen_timer.timeout.connect(self._apply_touched)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._view)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[self._view[index.row()]]
+        if role == Qt.DisplayRole:
+            return record.ip
+        if role == self.RecordRole:
+            return record
+        return None
+    
+    def contains(self, ip):
+        return ip in self._records
+    
+    def record(self, ip):
+        return self._records.get(ip)
+    
+    def index_of(self, ip):
+        row = self._rows.get(ip)
+        return self.index(row) if row is not None else QModelIndex()
+    
+    def add(self, ip, channel):
+        if ip in self._records:
+            return False
+        self._records[ip] = SensorRecord(ip, channel)
+        self.sensor_index.add(ip, channel)
+        
+        if self._is_unfiltered():
+            row = len(self._view)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._view.append(ip)
+            self._rows[ip] = row
+            self.endInsertRows()
+        else:
+            self._schedule_relayout()
+        return True
+    
+    def remove(self, ip):
+        if ip not in self._records:
+            return False
+        del self._records[ip]
+        self.sensor_index.remove(ip)
+        
+        row = self._rows.pop(ip, None)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._view[row]
+            for i in range(row, len(self._view)):
+                self._rows[self._view[i]] = i
+            self.endRemoveRows()
+        return True
+    
+    def set_power(self, ip, power):
+        if self._set(ip, "power", power):
+            self.sensor_index.set_power(ip, power)
+            self._after_change(ip, "power")
+    
+    def set_gps(self, ip, gps):
+        if self._set(ip, "gps", gps):
+            self._update_fix(ip)
+    
+    def set_rtk(self, ip, rtk):
+        if self._set(ip, "rtk", rtk):
+            self._update_fix(ip)
+    
+    def set_channel(self, ip, channel):
+        """채널 이름만 바꿈 (행과 복원/stale 상태는 그대로)"""
+        if self._set(ip, "channel", channel):
+            self.sensor_index.rename(ip, channel)
+            self._after_change(ip, "channel")
+    
+    def set_stale(self, ip, stale):
+        if self._set(ip, "stale", stale):
+            self._emit_row_changed(ip)
+    
+    def toggle_expanded(self, ip):
+        record = self.record(ip)
+        if record is not None:
+            self._set(ip, "expanded", not record.expanded)
+            self._emit_row_changed(ip)
+    
+    def touch(self, ip):
+        """패킷 수신 ("last_seen" 정렬 순서만 바뀜)"""
+        if ip not in self._records:
+            return
+        self.sensor_index.touch(ip)
+        if self.sort_mode == "last_seen":
+            self._touched.pop(ip, None)
+            self._touched[ip] = None
+    
+    def clear(self):
+        self.beginResetModel()
+        self._records.clear()
+        self._view.clear()
+        self._rows.clear()
+        self._touched.clear()
+        self.sensor_index = SensorIndex()
+        self.endResetModel()
+    
+    def set_filter(self, text=None, state=None):
+        """text: IP/채널 접두어, state: ("power", 값) / ("fix", 품질) / None"""
+        self.filter_text = (text or "").strip()
+        self.filter_state = state
+        self._relayout()
+    
+    def set_sort_mode(self, mode):
+        self.sort_mode = mode if mode in SORT_MODES else "added"
+        self._touched.clear()
+        if self.sort_mode == "last_seen":
+            self._last_seen_timer.start()
+        else:
+            self._last_seen_timer.stop()
+        self._relayout()
+    
+    def _set(self, ip, field, value):
+        record = self._records.get(ip)
+        if record is None or getattr(record, field) == value:
+            return False
+        setattr(record, field, value)
+        return True
+    
+    def _update_fix(self, ip):
+        record = self._records[ip]
+        self.sensor_index.set_fix(ip, fix_quality(record.gps, record.rtk))
+        self._after_change(ip, "fix")
+    
+    def _after_change(self, ip, field):
+        # 정렬/필터 기준 값이 바뀌었으면 재배치, 아니면 해당 행만 다시 그림
+        depends = self.sort_mode == field or (
+            self.filter_state is not None and self.filter_state[0] == field
+        ) or (field == "channel" and self.filter_text)
+        if depends:
+            self._schedule_relayout()
+        self._emit_row_changed(ip)
+    
+    def _emit_row_changed(self, ip):
+        row = self._rows.get(ip)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [self.RecordRole])
+    
+    def _is_unfiltered(self):
+        return self.sort_mode == "added" and not self.filter_text and self.filter_state is None
+    
+    def _schedule_relayout(self):
+        if not self._relayout_timer.isActive():
+            self._relayout_timer.start()
+    
+    def _compute_view(self):
+        index = self.sensor_index
+        order = index.order(self.sort_mode)
+        
+        match = None
+        if self.filter_text:
+            match = index.prefix_matches(self.filter_text)
+        if self.filter_state is not None:
+            kind, value = self.filter_state
+            members = index.by_power[value] if kind == "power" else index.by_fix[value]
+            match = members if match is None else match & members
+        
+        if match is None:
+            return order
+        return [ip for ip in order if ip in match]
+    
+    def _relayout(self):
+        self._relayout_timer.stop()
+        self._touched.clear()
+        view = self._compute_view()
+        if view == self._view:
+            return
+        
+        # 빠진 행은 삭제, 새로 보이는 행은 삽입으로 알리고 남은 행의 순서가 다르면 그때만 layoutChanged
+        visible = set(view)
+        self._remove_rows([row for row, ip in enumerate(self._view) if ip not in visible])
+        shown = set(self._view)
+        self._insert_rows(view, [i for i, ip in enumerate(view) if ip not in shown])
+        if self._view != view:
+            self._reorder(view)
+    
+    def _apply_touched(self):
+        """last_seen 정렬: 마지막 반영 이후 수신한 센서를 수신 순서대로 맨 앞으로 옮김"""
+        touched = list(self._touched)
+        self._touched.clear()
+        if not touched:
+            return
+        if self._relayout_timer.isActive() or len(touched) > self.MAX_ROW_MOVES:
+            self._relayout()
+            return
+        
+        # 오래전에 수신한 것부터 옮겨서 가장 최근에 수신한 센서가 맨 위
+        for ip in touched:
+            row = self._rows.get(ip)
+            if not row:  # 필터로 숨겨졌거나 이미 맨 위
+                continue
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), 0)
+            del self._view[row]
+            self._view.insert(0, ip)
+            for i in range(row + 1):
+                self._rows[self._view[i]] = i
+            self.endMoveRows()
+    
+    def _remove_rows(self, rows):
+        """rows: 오름차순 행 번호. 이어진 구간마다 한 번씩 (뒤쪽부터) 삭제"""
+        for first, last in reversed(self._runs(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._view[first:last + 1]
+            self.endRemoveRows()
+        if rows:
+            self._set_view(self._view)
+    
+    def _insert_rows(self, view, positions):
+        """positions: 새 순서 view 에서 새로 보이는 행 번호 (오름차순). 이어진 구간마다 한 번씩 삽입"""
+        for first, last in self._runs(positions):
+            first_row = min(first, len(self._view))
+            self.beginInsertRows(QModelIndex(), first_row, first_row + last - first)
+            self._view[first_row:first_row] = view[first:last + 1]
+            self.endInsertRows()
+        if positions:
+            self._set_view(self._view)
+    
+    def _reorder(self, view):
+        # 같은 행들의 순서만 바뀜: 선택/스크롤 위치 유지
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_ips = [self._view[index.row()] for index in old_indexes]
+        self._set_view(view)
+        self.changePersistentIndexList(old_indexes, [self.index(self._rows[ip]) for ip in old_ips])
+        self.layoutChanged.emit()
+    
+    @staticmethod
+    def _runs(rows):
+        """오름차순 번호 -> 이어진 구간 [(처음, 끝)]"""
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return runs
+    
+    def _set_view(self, view):
+        self._view = view
+        self._rows = {ip: row for row, ip in enumerate(view)}
+
+
+class SensorItemDelegate(QStyledItemDelegate):
+    """행마다 위젯을 만들지 않고 화면에 보이는 행만 직접 그림"""
+    
     delete_requested = pyqtSignal(str)
     
-    def __init__(self, ip, parent=None):
+    MARGIN = 5
+    PADDING = 8
+    ICON_SIZE = 18
+    
+    STATE_TEXT = {
+        None: ("State: Disconnected", QColor(150, 150, 150)),
+        True: ("State: Detected", QColor(0, 180, 0)),
+        False: ("State: Not detected", QColor(200, 0, 0))
+    }
+    STALE_COLOR = QColor(170, 170, 170)
+    
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.ip = ip
-        self.icon_path = "./icons/minus_circle_red.svg"
-        self._setup_ui()
+        self.icon = QIcon("./icons/minus_circle_red.svg")
         
+        self.title_font = QFont("Courier New", 14, QFont.Bold)
+        self.detail_font = QFont("Courier New", 12)
+        self.title_height = QFontMetrics(self.title_font).height() + 6
+        self.line_height = QFontMetrics(self.detail_font).height() + 4
     
-    def _setup_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(5, 2, 5, 2)
-    
-        self.label = QLabel(f"IP: {self.ip}")
-        self.label.setFont(QFont("Courier New", 14, QFont.Bold))
-        
-        self.delete_btn = QPushButton()
-        self.delete_btn.setIcon(QIcon(self.icon_path))
-        self.delete_btn.setIconSize(QSize(18, 18))
-        self.delete_btn.setFixedSize(22, 22)
-        self.delete_btn.setStyleSheet("""
-        QPushButton {
-            border: none;
-            background: transparent;
-        }
-        QPushButton:hover {
-            background-color: rgba(0, 0, 0, 0.08);
-            border-radius: 4px;
-        }
-        """)
+    def sizeHint(self, option, index):
+        record = index.data(SensorListModel.RecordRole)
+        height = self.title_height + self.PADDING * 2
+        if record.expanded:
+            height += self.line_height * 4  # 채널, 상태, GPS 2줄
+        return QSize(option.rect.width(), height + self.MARGIN)
+    
+    def paint(self, painter, option, index):
+        record = index.data(SensorListModel.RecordRole)
+        selected = bool(option.state & QStyle.State_Selected)
         
-        self.delete_btn.clicked.connect(lambda: self.delete_requested.emit(self.ip))
+        rect = option.rect.adjusted(0, 0, 0, -self.MARGIN)
         
-        layout.addWidget(self.label)
-        layout.addStretch()
-        layout.addWidget(self.delete_btn)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(74, 144, 226) if selected else QColor(247, 247, 247))
+        painter.drawRoundedRect(rect, 5, 5)
         
-        self.delete_btn.hide()
+        x = rect.left() + self.PADDING
+        y = rect.top() + self.PADDING
+        width = rect.width() - self.PADDING * 2
         
-        self.setStyleSheet("""
-            QWidget {
-                background-color: transparent;
-            }
-        """)
+        painter.setFont(self.title_font)
+        painter.setPen(QColor(255, 255, 255) if selected else QColor(51, 51, 51))
+        title = f"IP: {record.ip}" + (" (last known)" if record.stale else "")
+        painter.drawText(QRect(x, y, width, self.title_height), Qt.AlignVCenter | Qt.AlignLeft, title)
+        
+        if record.expanded:
+            self.icon.paint(painter, self._icon_rect(rect))
+            
+            painter.setFont(self.detail_font)
+            y += self.title_height
+            
+            lines = [(f"Channel: {record.channel}", QColor(51, 51, 51))]
+            lines.append(self.STATE_TEXT[record.power])
+            if record.gps is None:
+                lines.append(("GPS: Not available", QColor(150, 150, 150)))
+            else:
+                lng, lat = record.gps
+                fix = " (RTK)" if record.rtk in ('fixed', 'float') else ""
+                lines.append((f"GPS: {lat:.6f},\n     {lng:.6f}{fix}", QColor(0, 100, 200)))
+            
+            for text, color in lines:
+                if record.stale:
+                    color = self.STALE_COLOR
+                line_count = text.count("\n") + 1
+                painter.setPen(QColor(255, 255, 255) if selected else color)
+                painter.drawText(QRect(x + 20, y, width - 20, self.line_height * line_count), Qt.AlignLeft | Qt.AlignVCenter, text)
+                y += self.line_height * line_count
+        
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            record = index.data(SensorListModel.RecordRole)
+            rect = option.rect.adjusted(0, 0, 0, -self.MARGIN)
+            
+            if record.expanded and self._icon_rect(rect).contains(event.pos()):
+                self.delete_requested.emit(record.ip)
+                return True
+            
+            # 행을 누르면 펼치기/접기 (높이가 바뀌므로 레이아웃 갱신 요청)
+            model.toggle_expanded(record.ip)
+            self.sizeHintChanged.emit(index)
+            return True
+        
+        return super().editorEvent(event, model, option, index)
+    
+    def _icon_rect(self, rect):
+        size = self.ICON_SIZE
+        top = rect.top() + self.PADDING + (self.title_height - size) // 2
+        return QRect(rect.right() - self.PADDING - size, top, size, size)
+
 
 class SensorListWidget(QWidget):
-    
+
     sensor_deleted = pyqtSignal(str)
     
+    STATE_FILTERS = [
+        ("All states", None),
+        ("Detected", ("power", True)),
+        ("Not detected", ("power", False)),
+        ("Disconnected", ("power", None)),
+        ("No fix", ("fix", FIX_NONE)),
+        ("GPS only", ("fix", FIX_GPS)),
+        ("RTK float", ("fix", FIX_FLOAT)),
+        ("RTK fixed", ("fix", FIX_FIXED))
+    ]
+    
+    SORT_LABELS = {
+        "added": "Sort: Added",
+        "ip": "Sort: IP",
+        "channel": "Sort: Channel",
+        "power": "Sort: State",
+        "fix": "Sort: Fix quality",
+        "last_seen": "Sort: Last seen"
+    }
+    
     def __init__(self):
         super().__init__()
-        self.sensor_items = {}  # {ip: {"parent": item, "widget": widget, "state": item, "gps": item}}
         self._setup_ui()
     
     def _setup_ui(self):
@@ -69,123 +442,103 @@ class SensorListWidget(QWidget):
             padding: 10px;
         """)
         
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setFixedWidth(300)
-        self.tree_widget.setHeaderHidden(True)
-        self.tree_widget.setIndentation(20)
-        self.tree_widget.itemExpanded.connect(self.on_item_expanded)
-        self.tree_widget.itemCollapsed.connect(self.on_item_collapsed)
-
-        self.tree_widget.setStyleSheet("""
-            QTreeWidget {
-                background-color: #ffffff;
-                border: 2px solid #d0d0d0;
-                border-radius: 10px;
-                padding: 5px;
-                font-size: 16px;
-            }
-
-            QTreeWidget::item {
-                padding: 8px;
-                background-color: #f7f7f7;
-                border-radius: 5px;
-                margin-bottom: 2px;
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter: IP or channel prefix")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setFixedWidth(300)
+        self.filter_edit.setStyleSheet("""
+            QLineEdit {
+                background-color: white;
                 color: #333333;
+                border: 1px solid #cccccc;
+                border-radius: 4px;
+                padding: 6px;
+                font-size: 13px;
             }
-
-            QTreeWidget::item:selected {
-                background-color: #4a90e2;
-                color: white;
+            QLineEdit:focus {
+                border: 1px solid #4a90e2;
             }
         """)
         
-        layout.addWidget(self.title)
-        layout.addWidget(self.tree_widget)
-
-    def on_item_expanded(self, item):
-        widget = self.tree_widget.itemWidget(item, 0)
-        if isinstance(widget, SensorTreeItem):
-            widget.delete_btn.show()
-
-    def on_item_collapsed(self, item):
-        widget = self.tree_widget.itemWidget(item, 0)
-        if isinstance(widget, SensorTreeItem):
-            widget.delete_btn.hide()
-    
-    def add_sensor(self, ip, channel):
-        if ip in self.sensor_items:
-            return
+        self.state_filter = QComboBox()
+        for label, state in self.STATE_FILTERS:
+            self.state_filter.addItem(label, state)
         
-        parent = QTreeWidgetItem(self.tree_widget)
+        self.sort_combo = QComboBox()
+        for mode in SORT_MODES:
+            self.sort_combo.addItem(self.SORT_LABELS[mode], mode)
         
-        sensor_widget = SensorTreeItem(ip)
-        sensor_widget.delete_requested.connect(self._on_delete_clicked)
+        combo_layout = QHBoxLayout()
+        combo_layout.setSpacing(8)
+        combo_layout.addWidget(self.state_filter)
+        combo_layout.addWidget(self.sort_combo)
         
-        self.tree_widget.setItemWidget(parent, 0, sensor_widget)
+        self.model = SensorListModel(self)
+        self.delegate = SensorItemDelegate(self)
+        self.delegate.delete_requested.connect(self._on_delete_clicked)
         
-        child_channel = QTreeWidgetItem(parent)
-        child_channel.setText(0, f"Channel: {channel}")
-        child_channel.setFont(0, QFont("Courier New", 12))
+        self.list_view = QListView()
+        self.list_view.setFixedWidth(300)
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setMouseTracking(False)
         
-        child_state = QTreeWidgetItem(parent)
-        child_state.setText(0, "State: Disconnected")
-        child_state.setFont(0, QFont("Courier New", 12))
-        child_state.setForeground(0, QColor(150, 150, 150))
+        # 행 높이가 펼침 여부에 따라 달라서 레이아웃은 나눠서 계산 (센서가 많아도 UI가 멈추지 않도록)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(256)
         
-        child_gps = QTreeWidgetItem(parent)
-        child_gps.setText(0, "GPS: Not available")
-        child_gps.setFont(0, QFont("Courier New", 12))
-        child_gps.setForeground(0, QColor(150, 150, 150))
+        self.list_view.setStyleSheet("""
+            QListView {
+                background-color: #ffffff;
+                border: 2px solid #d0d0d0;
+                border-radius: 10px;
+                padding: 5px;
+            }
+        """)
         
-        parent.setExpanded(True)
+        layout.addWidget(self.title)
+        layout.addWidget(self.filter_edit)
+        layout.addLayout(combo_layout)
+        layout.addWidget(self.list_view)
         
-        self.sensor_items[ip] = {
-            "parent": parent,
-            "widget": sensor_widget,
-            "channel": child_channel,
-            "state": child_state,
-            "gps": child_gps
-        }
+        self.filter_edit.textChanged.connect(self._apply_filter)
+        self.state_filter.currentIndexChanged.connect(self._apply_filter)
+        self.sort_combo.currentIndexChanged.connect(
+            lambda: self.model.set_sort_mode(self.sort_combo.currentData())
+        )
+    
+    def _apply_filter(self):
+        self.model.set_filter(self.filter_edit.text(), self.state_filter.currentData())
+    
+    def add_sensor(self, ip, channel):
+        self.model.add(ip, channel)
     
     def _on_delete_clicked(self, ip):
-        if ip not in self.sensor_items:
+        if not self.model.remove(ip):
             return
         
-        parent = self.sensor_items[ip]["parent"]
-        index = self.tree_widget.indexOfTopLevelItem(parent)
-        self.tree_widget.takeTopLevelItem(index)
-        
-        del self.sensor_items[ip]
-        
         self.sensor_deleted.emit(ip)
     
     def update_power_status(self, ip, power_on):
-        if ip not in self.sensor_items:
-            return
-        
-        state_item = self.sensor_items[ip]["state"]
-        
-        if power_on is None:
-            state_item.setText(0, "State: Disconnected")
-            state_item.setForeground(0, QColor(150, 150, 150))
-        elif power_on:
-            state_item.setText(0, "State: Detected")
-            state_item.setForeground(0, QColor(0, 180, 0))
-        else:
-            state_item.setText(0, "State: Not detected")
-            state_item.setForeground(0, QColor(200, 0, 0))
+        self.model.set_power(ip, power_on)
     
     def update_gps(self, ip, lng, lat):
-        if ip not in self.sensor_items:
-            return
-        
-        gps_item = self.sensor_items[ip]["gps"]
-        gps_item.setText(0, f"GPS: {lat:.6f},\n     {lng:.6f}")
-        gps_item.setForeground(0, QColor(0, 100, 200))  # 파랑
+        self.model.set_gps(ip, (lng, lat))
+    
+    def update_rtk(self, ip, rtk_status):
+        self.model.set_rtk(ip, rtk_status)
+    
+    def update_channel(self, ip, channel):
+        self.model.set_channel(ip, channel)
+    
+    def mark_seen(self, ip):
+        self.model.touch(ip)
     
     def clear(self):
-        self.tree_widget.clear()
-        self.sensor_items.clear()
+        self.model.clear()
 
 if __name__ == "__main__":
     import sys
@@ -199,7 +552,7 @@ if __name__ == "__main__":
     window.update_power_status("192.168.0.10", True)
     window.update_gps("192.168.0.10", 126.714391, 37.337489)
     
-    window.update_power_status("192.168.0.22", False) 
+    window.update_power_status("192.168.0.22", False)
     window.update_gps("192.168.0.22", 126.713423, 37.337056)
     
     window.sensor_deleted.connect(lambda ip: print(f"Sensor deleted: {ip}"))
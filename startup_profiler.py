@@ -0,0 +1,41 @@
+"""
+시작 단계별 소요 시간 기록 (--profile-startup)
+
+다른 모듈보다 먼저 import 해야 import 시간까지 잴 수 있다.
+"""
+import sys
+import time
+
+
+class StartupProfiler:
+
+    def __init__(self):
+        self.enabled = "--profile-startup" in sys.argv
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.phases = []  # [(이름, 단계 소요 ms, 시작 후 누적 ms)]
+        self._reported = False
+
+    def mark(self, name):
+        """직전 mark 이후 걸린 시간을 name 단계로 기록"""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000, (now - self._start) * 1000))
+        self._last = now
+
+    def skip(self):
+        """사용자 입력 대기처럼 재지 않을 구간을 건너뜀 (누적 시간에서도 제외)"""
+        now = time.perf_counter()
+        self._start += now - self._last
+        self._last = now
+
+    def report(self):
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+
+        print("Startup profile:")
+        for name, elapsed, total in self.phases:
+            print(f"  {name:<16} {elapsed:8.1f} ms   (at {total:8.1f} ms)")
+
+
+STARTUP = StartupProfiler()
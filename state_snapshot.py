@@ -0,0 +1,146 @@
+"""
+재시작 시 바로 보여줄 마지막 화면 상태 저장/복원
+
+센서별 마지막 위치/전원/RTK 상태와 뷰포트는 state.json 에, 마지막으로 표시한 지도 이미지는
+뷰포트별 이름의 PNG 로 저장한다 (이미지는 뷰포트가 바뀐 경우에만 다시 씀).
+복원한 값은 실시간 데이터가 아니므로 화면에 stale 로 표시하고, 실제 값이 들어오면 바꿔야 한다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from PyQt5.QtGui import QImage
+
+
+VERSION = 1
+
+# 지도 요청 파라미터 중 이미지와 함께 저장하는 항목
+VIEWPORT_KEYS = ("center", "level", "w", "h", "maptype", "format", "scale")
+
+
+class StateSnapshot:
+
+    STATE_FILE = "state.json"
+    IMAGE_PREFIX = "map-"
+
+    def __init__(self, directory, max_age=24 * 3600):
+        self.directory = str(directory)
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._image_name = None  # 지금 디스크에 있는 지도 이미지 파일 이름
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def capture(sensors, gps_data, power_status, rtk_status, params):
+        """저장할 상태 dict. UI 스레드에서 호출 (값만 복사하므로 가벼움)"""
+        return {
+            "version": VERSION,
+            "saved_at": time.time(),
+            "viewport": {key: params[key] for key in VIEWPORT_KEYS if key in params},
+            "sensors": {
+                ip: {
+                    "channel": channel,
+                    "gps": list(gps_data[ip]) if gps_data.get(ip) else None,
+                    "power": power_status.get(ip),
+                    "rtk": rtk_status.get(ip),
+                }
+                for ip, channel in sensors.items()
+            },
+        }
+
+    def save(self, state, image=None, background=True):
+        """image: state 의 viewport 로 그린 지도 QImage (없으면 기존 이미지 유지)"""
+        if background:
+            threading.Thread(target=self._write, args=(state, image), daemon=True).start()
+        else:
+            self._write(state, image)
+
+    def load(self):
+        """(state, 지도 QImage 또는 None). 없거나 오래됐거나 읽을 수 없으면 None"""
+        try:
+            with open(self._path(self.STATE_FILE), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(state, dict) or state.get("version") != VERSION:
+            return None
+        if time.time() - state.get("saved_at", 0) > self.max_age:
+            print("Snapshot is too old, ignoring")
+            return None
+
+        image = None
+        name = state.get("image")
+        if name:
+            image = QImage(self._path(name))
+            if image.isNull():
+                image = None
+            else:
+                self._image_name = name
+        return state, image
+
+    def _write(self, state, image):
+        # 주기 저장과 종료 시 저장이 겹치지 않도록 한 번에 하나씩
+        with self._lock:
+            name = self._image_name
+            if image is not None and not image.isNull():
+                new_name = self._image_file(state["viewport"])
+                if new_name != name and self._write_image(image, new_name):
+                    name = new_name
+
+            state = dict(state, image=name)
+            if not self._write_state(state):
+                return
+
+            if name != self._image_name:
+                self._image_name = name
+                self._remove_old_images(name)
+
+    def _write_state(self, state):
+        path = self._path(self.STATE_FILE)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"Snapshot save error: {e}")
+            return False
+
+    def _write_image(self, image, name):
+        path = self._path(name)
+        tmp_path = path + ".tmp"
+        # 압축보다 속도 우선 (PNG 는 quality 가 높을수록 압축을 덜 함)
+        if not image.save(tmp_path, "PNG", 90):
+            print(f"Snapshot image save failed: {path}")
+            return False
+        try:
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Snapshot image save error: {e}")
+            return False
+        return True
+
+    def _remove_old_images(self, keep):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(self.IMAGE_PREFIX) and name != keep:
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+
+    def _image_file(self, viewport):
+        digest = hashlib.sha1(json.dumps(viewport, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{self.IMAGE_PREFIX}{digest[:16]}.png"
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
@@ -1,16 +1,44 @@
-import requests
-from PIL import Image
-from io import BytesIO
-from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtGui import QImage, QPixmap, QPainter, QColor
 from PyQt5.QtWidgets import QLabel
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QPoint, QRectF
 from urllib.parse import quote
+import threading
+
+from gesture_coalescer import GestureCoalescer
+from projection import MapProjection, offset_center, parse_center
 
 
 URL = "https://maps.apigw.ntruss.com/map-static/v2/raster"
 
+requests = None  # 첫 요청 때 import (프로그램 시작 시간 단축)
+
+
+def _load_requests():
+    global requests
+    if requests is None:
+        import requests as module
+        requests = module
+    return requests
+
+
+def neighbour_viewports(params):
+    """같은 레벨에서 한 화면씩 이동한 8개 뷰포트 (상하좌우, 대각선 순)"""
+    lng, lat = parse_center(params["center"])
+    level = params["level"]
+    w, h = params["w"], params["h"]
+
+    result = []
+    for dx, dy in ((w, 0), (-w, 0), (0, h), (0, -h), (w, h), (-w, h), (w, -h), (-w, -h)):
+        moved = dict(params)
+        new_lng, new_lat = offset_center(lng, lat, level, dx, dy)
+        moved["center"] = f"{new_lng},{new_lat}"
+        result.append(moved)
+    return result
+
 
 class StaticMap:
+    _error_images = {}  # {(w, h): QImage}
+
     def __init__(self):
         self.client_id = None
         self.client_key = None
@@ -22,19 +50,75 @@ class StaticMap:
             "w": 1620,
             "h": 1080
         }
+        self.center = parse_center(self.params["center"])
 
         self.markers = []
+        self.url = URL
+        self.cache = None
+        self.offline_store = None
+
+        self.headers = {
+            "Accept": "image/png, image/jpeg;q=0.9, */*;q=0.5",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
+        }
+        self.session = None
+        # 지도 요청/프리페치 스레드가 동시에 처음 요청해도 세션은 하나만 만듦
+        self._session_lock = threading.Lock()
+
+    def setEndpoint(self, url):
+        """API 주소 변경 (로컬 대역 서버 map_api_standin.py 등)"""
+        self.url = url or URL
+
+    def setCache(self, cache):
+        self.cache = cache
+
+    def setOfflineStore(self, store):
+        """사전 저장된 오프라인 타일 저장소. 설정 시 네트워크보다 먼저 사용"""
+        self.offline_store = store
 
     def setLogininfo(self, id, key):
         self.client_id = id
         self.client_key = key
+        self.headers["X-NCP-APIGW-API-KEY-ID"] = id
+        self.headers["X-NCP-APIGW-API-KEY"] = key
+
+        with self._session_lock:
+            if self.session is not None:
+                self.session.headers.update(self.headers)
+
+    def _get_session(self):
+        """keep-alive 연결을 재사용하는 세션 (TCP/TLS 핸드셰이크는 연결당 한 번)"""
+        session = self.session
+        if session is not None:
+            return session
+
+        with self._session_lock:
+            if self.session is None:
+                from requests.adapters import HTTPAdapter
+                
+                session = _load_requests().Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(self.headers)
+                self.session = session
+            return self.session
+
+    def close(self):
+        with self._session_lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
 
     def setSize(self, width, height):
         self.params["w"] = width
         self.params["h"] = height
 
     def setCenter(self, lng, lat):
-        self.params["center"] = f"{lng},{lat}"
+        # 중심은 float 로 보관하고 API 파라미터 문자열은 여기서만 만듦
+        self.center = (float(lng), float(lat))
+        self.params["center"] = f"{self.center[0]},{self.center[1]}"
 
     def setZoom(self, level):
         self.params["level"] = level
@@ -44,6 +128,14 @@ class StaticMap:
 
     def getCenter(self):
         return self.params["center"]
+
+    def getCenterLngLat(self):
+        return self.center
+
+    def getProjection(self):
+        """현재 뷰포트의 투영 (경위도 <-> 화면 픽셀)"""
+        return MapProjection(self.center[0], self.center[1], self.params["level"],
+                             self.params["w"], self.params["h"])
     
     def getZoom(self):
         return self.params["level"]
@@ -63,50 +155,186 @@ class StaticMap:
             del self.params["markers"]
 
 
+    def snapshotParams(self):
+        """현재 요청 파라미터의 복사본 (백그라운드 요청용)"""
+        params = dict(self.params)
+        if "markers" in params:
+            params["markers"] = list(params["markers"])
+        return params
+
     def getMapImage(self):
-        self.headers = {
-            "X-NCP-APIGW-API-KEY-ID": self.client_id,
-            "X-NCP-APIGW-API-KEY": self.client_key
-        }
+        return QPixmap.fromImage(self.fetchImage())
+
+    def getCachedImage(self, params=None):
+        """메모리 캐시에 있는 경우에만 즉시 반환 (네트워크/디스크 접근 없음)"""
+        if self.cache is None:
+            return None
+        if params is None:
+            params = self.params
+        return self.cache.get_image(self.cache.make_key(params))
+
+    def peekCachedImage(self, params):
+        """getCachedImage와 같지만 적중 통계/LRU 순서를 바꾸지 않음 (미리보기 합성용)"""
+        if self.cache is None:
+            return None
+        return self.cache.peek_image(self.cache.make_key(params))
+
+    def fetchImage(self, params=None):
+        """지도 이미지를 QImage로 가져옴. GUI 객체를 만들지 않으므로 워커 스레드에서 호출 가능"""
+        if params is None:
+            params = self.snapshotParams()
+
+        key = self.cache.make_key(params) if self.cache else None
+        if key is not None:
+            image = self.cache.get_image(key)
+            if image is not None:
+                return image
 
+        image = self._local_image(params, key)
+        if image is not None:
+            return image
+
+        # 만료된 디스크 캐시 항목이 있으면 조건부 요청으로 재검증
+        stale = self.cache.get_stale(key) if key is not None else None
+        headers = {}
+        if stale is not None:
+            validators = stale[1]
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        session = self._get_session()
         try:
-            res = requests.get(URL, headers=self.headers, params=self.params, timeout=10)
+            res = session.get(self.url, headers=headers, params=params, timeout=10)
+
+            if res.status_code == 304 and stale is not None:
+                self.cache.refresh(key, self._validators(res))
+                image = self.decodeImage(stale[0])
+                self.cache.put_image(key, image)
+                return image
             
             # 응답 상태 확인
             if res.status_code != 200:
                 print(f"Map API Error: {res.status_code}")
                 print(f"Response: {res.text}")
-                return self._create_error_pixmap(f"API Error: {res.status_code}")
+                return self._fallback_image(params, f"API Error: {res.status_code}")
             
             # 이미지 파싱
-            img = Image.open(BytesIO(res.content))
-            pix = self.pil2pixmap(img)
-            return pix
+            image = self.decodeImage(res.content)
+
+            if key is not None:
+                self.cache.put(key, image, res.content,
+                               res.headers.get("Content-Type", "image/png"),
+                               self._validators(res))
+
+            return image
             
         except requests.exceptions.Timeout:
             print("Map API request timeout")
-            return self._create_error_pixmap("Request Timeout")
+            return self._fallback_image(params, "Request Timeout")
         except requests.exceptions.RequestException as e:
             print(f"Map API request error: {e}")
-            return self._create_error_pixmap(f"Request Error: {str(e)}")
+            return self._fallback_image(params, f"Request Error: {str(e)}")
         except Exception as e:
             print(f"Map image error: {e}")
-            return self._create_error_pixmap(f"Error: {str(e)}")
+            return self._fallback_image(params, f"Error: {str(e)}")
     
+    def downloadImage(self, params):
+        """캐시를 거치지 않고 한 장을 받음. (QImage 또는 None, HTTP 상태 코드) 반환"""
+        session = self._get_session()
+        try:
+            res = session.get(self.url, params=params, timeout=10)
+        except requests.exceptions.RequestException as e:
+            print(f"Map API request error: {e}")
+            return None, None
+
+        if res.status_code != 200:
+            print(f"Map API Error: {res.status_code}")
+            return None, res.status_code
+
+        try:
+            return self.decodeImage(res.content), res.status_code
+        except ValueError as e:
+            print(f"Map image error: {e}")
+            return None, res.status_code
+
+    def _local_image(self, params, key):
+        """오프라인 타일 또는 디스크 캐시의 이미지. 없거나 읽을 수 없으면 None (네트워크로 받음)"""
+        image = self._compose_offline(params)
+        if image is not None:
+            if key is not None:
+                self.cache.put_image(key, image)
+            return image
+
+        if key is None:
+            return None
+        data = self.cache.get_encoded(key)
+        if data is None:
+            return None
+        try:
+            image = self.decodeImage(data)
+        except ValueError as e:
+            # 잘리거나 깨진 캐시 파일은 지우고 새로 받음
+            print(f"Map cache entry dropped: {e}")
+            self.cache.discard(key)
+            return None
+        self.cache.put_image(key, image)
+        return image
+
+    def _compose_offline(self, params, allow_partial=False):
+        """워커 스레드에서 예외가 빠져나가면 프로그램이 종료되므로 저장소 오류는 여기서 처리
+        (종료 중 닫힌 저장소 포함)
+        """
+        if self.offline_store is None:
+            return None
+        try:
+            return self.offline_store.compose(params, allow_partial=allow_partial)
+        except Exception as e:
+            print(f"Offline map error: {e}")
+            return None
+
+    def _fallback_image(self, params, message):
+        """네트워크 실패 시 오프라인 타일로 가능한 만큼 채우고, 없으면 회색 이미지"""
+        image = self._compose_offline(params, allow_partial=True)
+        if image is not None:
+            return image
+        return self._create_error_image(params, message)
+
+    @staticmethod
+    def _validators(res):
+        return {
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified")
+        }
+
     def _create_error_pixmap(self, message):
         """에러 발생 시 표시할 기본 이미지 생성"""
-        width = self.params.get("w", 800)
-        height = self.params.get("h", 600)
+        return QPixmap.fromImage(self._create_error_image(self.params, message))
+
+    def _create_error_image(self, params, message):
+        width = params.get("w", 800)
+        height = params.get("h", 600)
         
-        img = Image.new('RGB', (width, height), color=(200, 200, 200))
+        # 크기별로 한 번만 만들고 공유 (QImage는 암시적 공유라 복사 비용 없음)
+        image = self._error_images.get((width, height))
+        if image is None:
+            image = QImage(width, height, QImage.Format_RGB32)
+            image.fill(QColor(200, 200, 200))
+            self._error_images[(width, height)] = image
+        return image
+
+    @staticmethod
+    def decodeImage(data):
+        """응답 바이트를 바로 QImage로 디코딩 (PIL/RGBA 중간 버퍼 없음)"""
+        image = QImage.fromData(data)
+        if image.isNull():
+            raise ValueError("Unsupported map image data")
         
-        return self.pil2pixmap(img)
-    
-    def pil2pixmap(self,im):
-        im = im.convert("RGBA")
-        data = im.tobytes("raw", "RGBA")
-        qimage = QImage(data, im.width, im.height, QImage.Format_RGBA8888)
-        return QPixmap.fromImage(qimage)
+        # 팔레트 PNG 등은 그릴 때마다 변환되므로 한 번만 그리기 빠른 포맷으로 변환
+        if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32_Premultiplied):
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        return image
     
     def update_markers(self, sensors, gps_data, power_status):
         self.clearMarkers()
@@ -134,64 +362,164 @@ class StaticMap:
 
 class MapViewController:
     
-    def __init__(self, map_widget, static_map, update_callback=None):
+    FRAME_INTERVAL_MS = 16
+    SETTLE_MS = 200
+    BACKGROUND = QColor(200, 200, 200)
+    
+    def __init__(self, map_widget, static_map, update_callback=None, preview_callback=None):
         self.map_widget = map_widget
         self.static_map = static_map
         self.last_pos = None
         self.is_dragging = False
-        self.is_zooming = False
         self._update_callback = update_callback
-        self._zoom_timer = QTimer()
-        self._zoom_timer.setSingleShot(True)
-        self._zoom_timer.timeout.connect(self._on_zoom_finished)
+        self._preview_callback = preview_callback
+        
+        # 휠/드래그 입력은 모아서 멈춘 뒤 최종 뷰포트에 대해 한 번만 요청
+        self.gestures = GestureCoalescer(quiet_ms=self.SETTLE_MS)
+        self.gestures.settled.connect(self._on_gesture_settled)
+        
+        # 인터랙션 중 미리보기: 마지막으로 받은 선명한 이미지를 옮기거나 확대해서 보여줌
+        self.base_pixmap = None
+        self.base_params = None
+        self._drag_origin = None
+        self._drag_offset = QPoint(0, 0)
+        self._frame_timer = QTimer()
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._frame_timer.timeout.connect(self._render_preview)
+    
+    @property
+    def is_zooming(self):
+        return self.gestures.is_pending() and not self.is_dragging
     
     def set_update_callback(self, callback):
         self._update_callback = callback
     
+    def set_preview_callback(self, callback):
+        self._preview_callback = callback
+    
+    def set_base_image(self, pixmap, params):
+        """새로 받은 선명한 이미지를 미리보기 기준 이미지로 등록"""
+        self.base_pixmap = pixmap
+        self.base_params = params
+    
+    def is_interacting(self):
+        return self.is_dragging or self.gestures.is_pending()
+    
+    def pending_target(self):
+        return self.gestures.pending_target()
+    
+    def _current_center(self):
+        return self.static_map.getCenterLngLat()
+    
     def handle_wheel_event(self, event):
-        delta = event.angleDelta().y()
-        current_zoom = self.static_map.getZoom()
+        new_zoom = self.gestures.add_wheel(
+            event.angleDelta().y(),
+            self._current_center(),
+            self.static_map.getZoom()
+        )
+        
+        if new_zoom == self.static_map.getZoom():
+            return
         
-        if delta > 0:
-            new_zoom = min(current_zoom + 1, 20)
-        else:
-            new_zoom = max(current_zoom - 1, 1)
-
         self.static_map.setZoom(new_zoom)
         
-        self.is_zooming = True
-        self._zoom_timer.start(100)
+        # 드래그 중에 줌이 바뀌면 새 레벨 기준으로 드래그를 다시 시작
+        if self.is_dragging:
+            self._drag_origin = self.static_map.getProjection()
+            self._drag_offset = QPoint(0, 0)
         
-        self._trigger_update()
-    
-    def _on_zoom_finished(self):
-        self.is_zooming = False
+        self._schedule_preview()
     
     def handle_mouse_press(self, event):
         if event.button() == Qt.LeftButton:
             self.last_pos = event.pos()
             self.is_dragging = True
+            self._drag_origin = self.static_map.getProjection()
+            self._drag_offset = QPoint(0, 0)
+            self.gestures.hold(self._drag_origin.center, self.static_map.getZoom())
     
     def handle_mouse_move(self, event):
         if self.last_pos is not None:
-            dx = event.x() - self.last_pos.x()
-            dy = event.y() - self.last_pos.y()
+            self._drag_offset += event.pos() - self.last_pos
             
-            lon, lat = map(float, self.static_map.getCenter().split(","))
-            scale = 0.3 / (2 ** (self.static_map.getZoom() - 1))
-            
-            lon -= dx * scale
-            lat += dy * scale
+            # 지도를 오른쪽으로 끌면 중심은 왼쪽(서쪽)으로 이동
+            lon, lat = self._drag_origin.panned(self._drag_offset.x(), self._drag_offset.y()).center
             
             self.static_map.setCenter(lon, lat)
+            self.gestures.move((lon, lat))
             self.last_pos = event.pos()
+            
+            self._schedule_preview()
     
     def handle_mouse_release(self, event):
         if event.button() == Qt.LeftButton:
             self.is_dragging = False
             self.last_pos = None
-            self._trigger_update()
+            self._drag_origin = None
+            self.gestures.release()
+    
+    def _on_gesture_settled(self, target):
+        self._trigger_update()
     
     def _trigger_update(self):
         if self._update_callback:
-            self._update_callback()
\ No newline at end of file
+            self._update_callback()
+    
+    def _schedule_preview(self):
+        # 마우스 이벤트가 많아도 한 프레임에 한 번만 그림
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+    
+    def refresh_preview(self):
+        self._render_preview()
+    
+    def _render_preview(self):
+        if self.base_pixmap is None or self.base_params is None:
+            return
+        
+        params = self.static_map.snapshotParams()
+        view = self.static_map.getProjection()
+        
+        canvas = QPixmap(view.width, view.height)
+        canvas.fill(self.BACKGROUND)
+        
+        painter = QPainter(canvas)
+        try:
+            exact = self.static_map.peekCachedImage(params)
+            if exact is not None:
+                painter.drawImage(0, 0, exact)
+            else:
+                # 캐시에 있는 인접 이미지를 먼저 깔고 기준 이미지를 위에 그림
+                for neighbour in neighbour_viewports(self.base_params):
+                    image = self.static_map.peekCachedImage(neighbour)
+                    if image is not None:
+                        self._draw_viewport(painter, image, neighbour, view)
+                
+                self._draw_viewport(painter, self.base_pixmap, self.base_params, view)
+        finally:
+            painter.end()
+        
+        self.map_widget.setPixmap(canvas)
+        
+        if self._preview_callback:
+            self._preview_callback(view)
+    
+    @staticmethod
+    def _draw_viewport(painter, image, params, view):
+        src_lng, src_lat = parse_center(params["center"])
+        scale = 2 ** (view.level - params["level"])
+        
+        center_x, center_y = view.to_screen(src_lng, src_lat)
+        draw_w = image.width() * scale
+        draw_h = image.height() * scale
+        
+        target = QRectF(center_x - draw_w / 2, center_y - draw_h / 2, draw_w, draw_h)
+        if not target.intersects(QRectF(0, 0, view.width, view.height)):
+            return
+        
+        source = QRectF(0, 0, image.width(), image.height())
+        if isinstance(image, QPixmap):
+            painter.drawPixmap(target, image, source)
+        else:
+            painter.drawImage(target, image, source)
@@ -0,0 +1,99 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from config_loader import ConfigDiff, ConfigError, validate_config
+
+NTRIP = {
+    "host_address": "rtk2go.com",
+    "host_port": 2101,
+    "user_id": "user",
+    "user_pw": "pw",
+    "mount_point": "MOUNT",
+}
+
+BASE = {
+    "sensors_ip": {"192.168.0.10": "ch1", "192.168.0.11": "ch2"},
+    "ntrip_settings": NTRIP,
+    "sensor_reconnect_interval": 5000,
+    "marker_update_interval": 100,
+    "heatmap": {"radius": 30},
+}
+
+
+def changed(**values):
+    config = dict(BASE)
+    config.update(values)
+    return config
+
+
+def test_identical_config_is_empty():
+    diff = ConfigDiff(BASE, dict(BASE))
+    assert diff.is_empty()
+    assert repr(diff) == "ConfigDiff(no change)"
+
+
+def test_sensor_changes():
+    new = changed(sensors_ip={"192.168.0.10": "front", "192.168.0.12": "ch3"})
+    diff = ConfigDiff(BASE, new)
+
+    assert diff.sensors_added == {"192.168.0.12": "ch3"}
+    assert diff.sensors_removed == {"192.168.0.11": "ch2"}
+    assert diff.channels_changed == {"192.168.0.10": "front"}
+    assert diff.restart_required == []
+    assert not diff.is_empty()
+    assert repr(diff) == "ConfigDiff(+1 sensors; -1 sensors; 1 channels renamed)"
+
+
+def test_missing_sensor_list_removes_all_sensors():
+    diff = ConfigDiff(BASE, changed(sensors_ip=None))
+    assert diff.sensors_removed == BASE["sensors_ip"]
+    assert diff.sensors_added == {}
+
+
+def test_live_settings():
+    new = changed(ntrip_settings=dict(NTRIP, mount_point="OTHER"), sensor_reconnect_interval=2000,
+                  discovery={"subnets": ["192.168.0.0/24"]})
+    diff = ConfigDiff(BASE, new)
+
+    assert diff.ntrip_changed
+    assert diff.ntrip_settings["mount_point"] == "OTHER"
+    assert diff.interval_changed
+    assert diff.reconnect_interval == 2000
+    assert diff.discovery_changed
+    assert diff.discovery == {"subnets": ["192.168.0.0/24"]}
+    assert diff.restart_required == []
+
+
+def test_other_keys_require_restart():
+    new = changed(marker_update_interval=50, heatmap={"radius": 40}, snapshot={"enabled": True})
+    del new["ntrip_settings"]
+    diff = ConfigDiff(BASE, new)
+
+    assert diff.restart_required == ["heatmap", "marker_update_interval", "snapshot"]
+    assert diff.ntrip_changed
+    assert diff.ntrip_settings == {}
+    assert repr(diff) == "ConfigDiff(ntrip; restart required: heatmap, marker_update_interval, snapshot)"
+
+
+def test_validate_config_accepts_base():
+    validate_config(BASE)
+    validate_config({})
+
+
+@pytest.mark.parametrize("config", [
+    [],
+    {"sensors_ip": ["192.168.0.10"]},
+    {"sensors_ip": {"not-an-ip": "ch1"}},
+    {"sensors_ip": {"192.168.0.10": ""}},
+    {"ntrip_settings": {"host_address": "rtk2go.com"}},
+    {"ntrip_settings": dict(NTRIP, host_port=70000)},
+    {"sensor_reconnect_interval": 0},
+    {"heatmap": [1, 2]},
+])
+def test_validate_config_rejects(config):
+    with pytest.raises(ConfigError):
+        validate_config(config)
@@ -0,0 +1,87 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from gesture_coalescer import GestureCoalescer
+
+CENTER = (127.0, 37.5)
+
+
+@pytest.fixture
+def coalescer():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    coalescer = GestureCoalescer(min_level=1, max_level=20)
+    coalescer.pending = []
+    coalescer.results = []
+    coalescer.pending_changed.connect(coalescer.pending.append)
+    coalescer.settled.connect(coalescer.results.append)
+    yield coalescer
+    coalescer.cancel()
+    app.processEvents()
+
+
+def test_wheel_steps_accumulate_into_one_settled_target(coalescer):
+    assert coalescer.add_wheel(120, CENTER, 10) == 11
+    assert coalescer.add_wheel(240, (0, 0), 10) == 13
+    assert coalescer.pending_target() == {"center": CENTER, "level": 13}
+
+    coalescer._on_quiet()
+    assert coalescer.results == [{"center": CENTER, "level": 13}]
+    assert coalescer.pending[-1] is None
+    assert not coalescer.is_pending()
+
+
+def test_partial_wheel_deltas_are_summed(coalescer):
+    assert coalescer.add_wheel(60, CENTER, 10) == 10
+    assert coalescer.pending == []
+    assert coalescer.add_wheel(60, CENTER, 10) == 11
+    assert coalescer.add_wheel(-90, CENTER, 10) == 11
+    assert coalescer.add_wheel(-30, CENTER, 10) == 10
+
+
+def test_wheel_level_is_clamped(coalescer):
+    assert coalescer.add_wheel(120 * 5, CENTER, 18) == 20
+    coalescer.cancel()
+    assert coalescer.add_wheel(-120 * 5, CENTER, 3) == 1
+
+
+def test_zero_wheel_delta_is_ignored(coalescer):
+    assert coalescer.add_wheel(0, CENTER, 10) == 10
+    assert not coalescer.is_pending()
+    assert not coalescer._quiet_timer.isActive()
+
+    coalescer.add_wheel(120, CENTER, 10)
+    assert coalescer.add_wheel(0, CENTER, 10) == 11
+
+
+def test_drag_is_not_settled_until_release(coalescer):
+    coalescer.hold(CENTER, 12)
+    coalescer.move((127.1, 37.6))
+    coalescer._on_quiet()
+    assert coalescer.results == []
+    assert coalescer.pending_target() == {"center": (127.1, 37.6), "level": 12}
+
+    coalescer.release()
+    assert coalescer._quiet_timer.isActive()
+    coalescer._on_quiet()
+    assert coalescer.results == [{"center": (127.1, 37.6), "level": 12}]
+
+
+def test_move_without_target_is_ignored(coalescer):
+    coalescer.move(CENTER)
+    assert not coalescer.is_pending()
+    assert coalescer.pending == []
+
+
+def test_cancel_drops_pending_target(coalescer):
+    coalescer.add_wheel(120, CENTER, 10)
+    coalescer.cancel()
+    assert coalescer.pending[-1] is None
+    assert not coalescer._quiet_timer.isActive()
+
+    coalescer._on_quiet()
+    assert coalescer.results == []
@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from map_cache import MapImageCache
+
+
+class FakeImage:
+    def __init__(self, size):
+        self.size = size
+
+    def isNull(self):
+        return False
+
+    def sizeInBytes(self):
+        return self.size
+
+
+def key(n):
+    return ("127.0,37.0", n, "basic", 640, 480)
+
+
+def test_make_key_skips_marker_requests():
+    params = {"center": "127.0,37.0", "level": 16, "w": 640, "h": 480}
+    assert MapImageCache.make_key(params) == ("127.0,37.0", 16, "basic", 640, 480)
+    assert MapImageCache.make_key(dict(params, markers="type:d|pos:127 37")) is None
+
+
+def test_memory_budget_evicts_least_recently_used(tmp_path):
+    cache = MapImageCache(tmp_path, memory_budget=250)
+    cache.put_image(key(1), FakeImage(100))
+    cache.put_image(key(2), FakeImage(100))
+    assert cache.get_image(key(1)) is not None
+
+    cache.put_image(key(3), FakeImage(100))
+    assert cache.peek_image(key(2)) is None
+    assert cache.peek_image(key(1)) is not None
+    assert cache.stats()["memory_bytes"] == 200
+
+    cache.put_image(key(4), FakeImage(300))
+    assert cache.peek_image(key(4)) is None
+
+
+def test_disk_entry_round_trip_and_reload(tmp_path):
+    cache = MapImageCache(tmp_path)
+    cache.put_encoded(key(1), b"png-data")
+    assert cache.get_encoded(key(1)) == b"png-data"
+    assert cache.get_encoded(key(2)) is None
+
+    reloaded = MapImageCache(tmp_path)
+    assert reloaded.get_encoded(key(1)) == b"png-data"
+    assert reloaded.stats()["disk_bytes"] == len(b"png-data")
+
+
+def test_disk_budget_evicts_oldest_entries(tmp_path):
+    cache = MapImageCache(tmp_path, disk_budget=10)
+    cache.put_encoded(key(1), b"aaaa")
+    cache.put_encoded(key(2), b"bbbb")
+    assert cache.get_encoded(key(1)) == b"aaaa"
+
+    cache.put_encoded(key(3), b"cccc")
+    assert cache.get_encoded(key(2)) is None
+    assert cache.get_encoded(key(1)) == b"aaaa"
+    assert cache.stats()["disk_entries"] == 2
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".png")]) == 2
+
+    cache.put_encoded(key(4), b"x" * 11)
+    assert cache.get_encoded(key(4)) is None
+
+
+def test_expired_entry_without_validators_is_removed(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    cache = MapImageCache(tmp_path, ttl=60)
+    cache.put_encoded(key(1), b"data")
+    assert cache.contains(key(1))
+
+    clock[0] += 61
+    assert not cache.contains(key(1))
+    assert cache.get_encoded(key(1)) is None
+    assert cache.stats()["disk_entries"] == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_expired_entry_with_validators_can_be_revalidated(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    cache = MapImageCache(tmp_path, ttl=60)
+    cache.put_encoded(key(1), b"data", validators={"ETag": '"v1"', "Last-Modified": None})
+
+    clock[0] += 61
+    assert cache.get_encoded(key(1)) is None
+    assert cache.get_stale(key(1)) == (b"data", {"ETag": '"v1"'})
+
+    cache.refresh(key(1), {"ETag": '"v2"'})
+    assert cache.get_encoded(key(1)) == b"data"
+    assert MapImageCache(tmp_path, ttl=60).get_stale(key(1)) == (b"data", {"ETag": '"v2"'})
+
+
+def test_discard_removes_memory_and_disk_entries(tmp_path):
+    cache = MapImageCache(tmp_path)
+    cache.put(key(1), FakeImage(10), b"data", validators={"ETag": '"v1"'})
+    cache.discard(key(1))
+
+    assert not cache.contains(key(1))
+    assert cache.stats()["memory_bytes"] == 0
+    assert cache.stats()["disk_bytes"] == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_orphaned_tmp_files_are_deleted_on_load(tmp_path):
+    (tmp_path / "abc.png.1234.tmp").write_bytes(b"partial")
+    (tmp_path / "notes.txt").write_bytes(b"keep")
+
+    cache = MapImageCache(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt"]
+    assert cache.stats()["disk_entries"] == 0
@@ -0,0 +1,91 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marker_clustering import GridClusterer
+from projection import world_to_lnglat
+
+LEVEL = 10
+
+
+def sensor(cell_x, cell_y, power=None, offset=16, level=LEVEL):
+    """cell 안쪽 (offset, offset) 월드 픽셀 위치의 센서"""
+    lng, lat = world_to_lnglat(cell_x * 64 + offset, cell_y * 64 + offset, level)
+    return lng, lat, power
+
+
+def test_sensors_in_same_cell_form_cluster():
+    clusterer = GridClusterer()
+    clusterer.update(LEVEL, {
+        "a": sensor(100, 200, True),
+        "b": sensor(100, 200, False, offset=48),
+        "c": sensor(101, 200),
+    })
+
+    [cluster] = clusterer.clusters()
+    assert cluster.cell == (100, 200)
+    assert cluster.members == {"a", "b"}
+    assert cluster.count == 2
+    assert cluster.breakdown == (1, 1, 0)
+    assert abs(cluster.world_x - (100 * 64 + 32)) < 1e-6
+    assert abs(cluster.world_y - (200 * 64 + 32)) < 1e-6
+    assert clusterer.singles() == ["c"]
+    assert clusterer.clustered == {"a": (100, 200), "b": (100, 200)}
+    assert clusterer.cluster_of("a") is cluster
+    assert clusterer.cluster_of("c") is None
+
+
+def test_apply_moves_sensor_between_cells():
+    clusterer = GridClusterer()
+    clusterer.update(LEVEL, {"a": sensor(100, 200), "b": sensor(100, 200), "c": sensor(101, 200)})
+    version = clusterer.version
+
+    clusterer.apply({"b": sensor(101, 200)})
+    [cluster] = clusterer.clusters()
+    assert cluster.cell == (101, 200)
+    assert cluster.members == {"b", "c"}
+    assert clusterer.clustered == {"b": (101, 200), "c": (101, 200)}
+    assert clusterer.singles() == ["a"]
+    assert clusterer.version > version
+
+
+def test_unchanged_sensors_do_not_bump_version():
+    clusterer = GridClusterer()
+    sensors = {"a": sensor(100, 200), "b": sensor(100, 200)}
+    clusterer.update(LEVEL, sensors)
+    version = clusterer.version
+
+    clusterer.update(LEVEL, dict(sensors))
+    assert clusterer.version == version
+
+    # 전원 상태만 바뀌면 집계만 고치고 멤버는 그대로
+    clusterer.apply({"a": sensor(100, 200, True)})
+    assert clusterer.version == version
+    assert clusterer.clusters()[0].breakdown == (1, 0, 1)
+
+
+def test_removed_sensor_breaks_up_cluster():
+    clusterer = GridClusterer()
+    clusterer.update(LEVEL, {"a": sensor(100, 200), "b": sensor(100, 200)})
+
+    clusterer.update(LEVEL, {"a": sensor(100, 200)})
+    assert clusterer.clusters() == []
+    assert clusterer.clustered == {}
+    assert clusterer.singles() == ["a"]
+
+    clusterer.apply({}, removed=["a", "missing"])
+    assert clusterer.singles() == []
+
+
+def test_level_change_rebuilds_grid():
+    clusterer = GridClusterer()
+    sensors = {"a": sensor(100, 200, offset=10), "b": sensor(100, 200, offset=50)}
+    clusterer.update(LEVEL, sensors)
+    assert len(clusterer.clusters()) == 1
+
+    # 한 레벨 확대하면 두 센서 사이 거리가 80px 이 되어 다른 칸으로 나뉨
+    clusterer.update(LEVEL + 1, sensors)
+    assert clusterer.level == LEVEL + 1
+    assert clusterer.clusters() == []
+    assert sorted(clusterer.singles()) == ["a", "b"]
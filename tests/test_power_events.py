@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from power_events import PowerEventLog
+
+
+def transitions(events):
+    return [(event.time, event.previous, event.power, event.debounced) for event in events]
+
+
+def test_short_pulse_inside_debounce_window_is_kept():
+    log = PowerEventLog(debounce=0.5)
+    log.record("a", False, now=0)
+    log.record("a", True, now=0.2)
+    log.record("a", False, now=0.3)
+    log.settle(5)
+
+    assert transitions(log.events("a")) == [
+        (0, None, False, False),
+        (0.2, False, True, True),
+        (0.3, True, False, True),
+    ]
+    assert [event.ip for event in log.fleet_events(0, power=True)] == ["a"]
+    assert log.flapping(0, min_changes=3) == {"a": 3}
+
+
+def test_pulse_is_dispatched_to_listener():
+    log = PowerEventLog(debounce=0.5)
+    received = []
+    log.on_event = received.append
+    log.record("a", False, now=0)
+    log.record("a", True, now=0.2)
+    log.record("a", False, now=0.3)
+
+    assert [event.power for event in received] == [False, True, False]
+
+
+def test_steady_flap_collapses_into_chatter():
+    log = PowerEventLog(debounce=0.5)
+    for i, now in enumerate((0, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35)):
+        log.record("a", i % 2 == 0, now=now)
+    log.settle(5)
+
+    events = log.events("a")
+    assert transitions(events) == [
+        (0, None, True, False),
+        (0.1, True, False, True),
+        (0.15, False, True, True),
+    ]
+    assert events[-1].chatter == 4
+
+
+def test_change_pending_at_window_end_is_recorded():
+    log = PowerEventLog(debounce=0.5)
+    log.record("a", False, now=0)
+    log.record("a", True, now=0.2)
+    log.settle(5)
+
+    assert transitions(log.events("a")) == [
+        (0, None, False, False),
+        (0.2, False, True, False),
+    ]
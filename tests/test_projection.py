@@ -0,0 +1,103 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from projection import (MAX_LATITUDE, MapProjection, lnglat_to_world, meters_per_pixel,
+                        offset_center, parse_center, world_size, world_to_lnglat)
+
+
+def test_world_size_doubles_per_level():
+    assert world_size(0) == 512
+    assert world_size(10) == 2 * world_size(9)
+
+
+def test_origin_maps_to_world_center():
+    x, y = lnglat_to_world(0.0, 0.0, 5)
+    assert x == pytest.approx(world_size(5) / 2)
+    assert y == pytest.approx(world_size(5) / 2)
+
+
+@pytest.mark.parametrize("lng, lat", [(127.0276, 37.4979), (-73.9857, 40.7484), (151.2, -33.87), (0.0, 0.0)])
+def test_scalar_round_trip(lng, lat):
+    for level in (1, 10, 20):
+        x, y = lnglat_to_world(lng, lat, level)
+        back = world_to_lnglat(x, y, level)
+        assert back == pytest.approx((lng, lat), abs=1e-9)
+
+
+def test_latitude_is_clamped():
+    _, top = lnglat_to_world(0.0, 90.0, 3)
+    _, bottom = lnglat_to_world(0.0, -90.0, 3)
+    assert top == pytest.approx(0.0, abs=1e-6)
+    assert bottom == pytest.approx(world_size(3), abs=1e-6)
+    assert world_to_lnglat(0.0, 0.0, 3)[1] == pytest.approx(MAX_LATITUDE)
+
+
+def test_array_matches_scalar():
+    lng = np.array([127.0276, -73.9857, 151.2])
+    lat = np.array([37.4979, 40.7484, -33.87])
+    xs, ys = lnglat_to_world(lng, lat, 12)
+    assert isinstance(xs, np.ndarray)
+    for i in range(3):
+        assert (xs[i], ys[i]) == pytest.approx(lnglat_to_world(float(lng[i]), float(lat[i]), 12))
+
+    back_lng, back_lat = world_to_lnglat(xs, ys, 12)
+    np.testing.assert_allclose(back_lng, lng, atol=1e-9)
+    np.testing.assert_allclose(back_lat, lat, atol=1e-9)
+
+
+def test_offset_center_and_meters_per_pixel():
+    lng, lat = offset_center(127.0, 37.5, 14, 100, 0)
+    assert lat == pytest.approx(37.5)
+    assert lng > 127.0
+    assert offset_center(127.0, 37.5, 14, 0, 0) == pytest.approx((127.0, 37.5))
+
+    assert meters_per_pixel(0.0, 0) == pytest.approx(40075016.68557849 / 512)
+    assert meters_per_pixel(60.0, 10) == pytest.approx(meters_per_pixel(0.0, 10) / 2)
+
+
+def test_parse_center():
+    assert parse_center("127.0276,37.4979") == (127.0276, 37.4979)
+    with pytest.raises(ValueError):
+        parse_center("127.0276")
+
+
+def test_viewport_center_and_round_trip():
+    view = MapProjection.from_params({"center": "127.0276,37.4979", "level": 15, "w": 800, "h": 600})
+    assert view.center == (127.0276, 37.4979)
+    assert view.to_screen(127.0276, 37.4979) == pytest.approx((400, 300))
+
+    lng, lat = view.to_lnglat(123.5, 456.25)
+    assert view.to_screen(lng, lat) == pytest.approx((123.5, 456.25))
+
+
+def test_contains_scalar_and_mask():
+    view = MapProjection(127.0, 37.5, 15, 800, 600)
+    assert view.contains(0, 600)
+    assert not view.contains(-1, 300)
+    assert view.contains(-10, 300, margin=10)
+
+    mask = view.contains(np.array([10.0, 900.0, 400.0]), np.array([10.0, 10.0, -5.0]))
+    assert mask.tolist() == [True, False, False]
+
+
+def test_panned_moves_center_opposite_to_drag():
+    view = MapProjection(127.0, 37.5, 15, 800, 600)
+    panned = view.panned(100, -50)
+
+    # 끌기 전 중심은 끈 만큼 옮겨진 위치에 보여야 함
+    assert panned.to_screen(127.0, 37.5) == pytest.approx((500, 250))
+    assert panned.center_lng < 127.0
+    assert panned.center_lat < 37.5
+
+
+def test_zoomed_keeps_center():
+    view = MapProjection(127.0, 37.5, 15, 800, 600)
+    zoomed = view.zoomed(16)
+    assert zoomed.level == 16
+    assert zoomed.center == view.center
+    assert zoomed.meters_per_pixel() == pytest.approx(view.meters_per_pixel() / 2)
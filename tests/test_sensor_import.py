@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from sensor_import import MAX_RANGE_HOSTS, ChannelAllocator, check_range, expand_target, parse_rows
+
+
+def entries(rows):
+    return [(entry.ip, entry.channel, entry.explicit) for entry in parse_rows(rows)]
+
+
+def test_parse_rows_skips_header_comments_and_blank_lines():
+    rows = [
+        ["IP", "channel"],
+        [],
+        ["# spare sensors"],
+        [" 192.168.0.10 ", " ch1 "],
+        ["192.168.0.11", ""],
+        ["", "ch9"],
+    ]
+    assert entries(rows) == [
+        ("192.168.0.10", "ch1", True),
+        ("192.168.0.11", None, True),
+    ]
+
+
+def test_header_name_is_only_skipped_on_first_line():
+    assert entries([["192.168.0.1"], ["ip"]]) == [("192.168.0.1", None, True)]
+
+
+def test_parse_rows_expands_ranges_without_channel():
+    assert entries([["192.168.0.0/30", "ch1"]]) == [
+        ("192.168.0.1", None, False),
+        ("192.168.0.2", None, False),
+    ]
+    assert entries([["10.0.0.7/32"]]) == [("10.0.0.7", None, False)]
+
+
+def test_parse_rows_reports_invalid_lines(capsys):
+    rows = [
+        ["ip"],
+        ["192.168.0.300"],
+        ["fe80::1/64"],
+        ["10.0.0.0/8"],
+        ["10.0.0.1"],
+    ]
+    assert entries(rows) == [("10.0.0.1", None, True)]
+
+    output = capsys.readouterr().out
+    assert "invalid address on line 2: 192.168.0.300" in output
+    assert "invalid address on line 3: fe80::1/64 (only IPv4 ranges are supported)" in output
+    assert f"invalid address on line 4: 10.0.0.0/8 (range has 16777216 addresses (max {MAX_RANGE_HOSTS}))" in output
+
+
+def test_range_limits():
+    assert check_range("192.168.0.0/20").num_addresses == MAX_RANGE_HOSTS
+    with pytest.raises(ValueError):
+        check_range("192.168.0.0/19")
+    with pytest.raises(ValueError):
+        expand_target("fe80::/120")
+
+
+def test_range_hosts_are_generated_lazily():
+    targets = expand_target("10.0.0.0/20")
+    assert next(targets).ip == "10.0.0.1"
+    assert next(targets).ip == "10.0.0.2"
+
+
+def test_channel_allocator_continues_after_highest_number():
+    allocator = ChannelAllocator(["ch3", "front", "ch10", "chX", None, "Ch20"])
+    assert allocator.allocate() == "ch11"
+
+    allocator.reserve("ch15")
+    allocator.reserve("ch2")
+    assert allocator.allocate() == "ch16"
+    assert allocator.allocate() == "ch17"
+
+
+def test_channel_allocator_starts_at_one():
+    assert ChannelAllocator().allocate() == "ch1"
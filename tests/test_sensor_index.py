@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensor_index import (FIX_FIXED, FIX_FLOAT, FIX_GPS, FIX_NONE, SensorIndex,
+                          channel_sort_key, fix_quality, ip_sort_key)
+
+
+def make_index():
+    index = SensorIndex()
+    index.add("192.168.0.10", "ch10")
+    index.add("192.168.0.9", "ch2")
+    index.add("10.0.0.1", "Ch1")
+    return index
+
+
+def test_sort_keys():
+    assert sorted(["192.168.0.10", "192.168.0.9", "host", "10.0.0.1"], key=ip_sort_key) == [
+        "10.0.0.1", "192.168.0.9", "192.168.0.10", "host",
+    ]
+    assert sorted(["ch10", "ch2", "CH1", "ch"], key=channel_sort_key) == ["ch", "CH1", "ch2", "ch10"]
+
+
+def test_fix_quality():
+    assert fix_quality(None, "fixed") == FIX_NONE
+    assert fix_quality((37.0, 127.0), None) == FIX_GPS
+    assert fix_quality((37.0, 127.0), "float") == FIX_FLOAT
+    assert fix_quality((37.0, 127.0), "fixed") == FIX_FIXED
+
+
+def test_order_by_added_ip_and_channel():
+    index = make_index()
+    assert index.order("added") == ["192.168.0.10", "192.168.0.9", "10.0.0.1"]
+    assert index.order("ip") == ["10.0.0.1", "192.168.0.9", "192.168.0.10"]
+    assert index.order("channel") == ["10.0.0.1", "192.168.0.9", "192.168.0.10"]
+
+
+def test_order_by_power_and_fix_keeps_ip_order_within_bucket():
+    index = make_index()
+    index.set_power("192.168.0.10", True)
+    index.set_power("10.0.0.1", False)
+    assert index.order("power") == ["192.168.0.10", "10.0.0.1", "192.168.0.9"]
+    assert index.by_power == {True: {"192.168.0.10"}, False: {"10.0.0.1"}, None: {"192.168.0.9"}}
+
+    index.set_fix("192.168.0.9", FIX_FIXED)
+    index.set_fix("192.168.0.10", FIX_GPS)
+    assert index.order("fix") == ["192.168.0.9", "192.168.0.10", "10.0.0.1"]
+    assert index.by_fix[FIX_NONE] == {"10.0.0.1"}
+
+
+def test_last_seen_moves_touched_sensor_to_front():
+    index = make_index()
+    index.touch("10.0.0.1")
+    index.touch("192.168.0.9")
+    assert index.order("last_seen") == ["192.168.0.9", "10.0.0.1", "192.168.0.10"]
+
+    index.touch("10.0.0.1")
+    index.touch("unknown")
+    assert index.order("last_seen") == ["10.0.0.1", "192.168.0.9", "192.168.0.10"]
+
+
+def test_prefix_matches_ip_or_channel_case_insensitively():
+    index = make_index()
+    assert index.prefix_matches("192.168.0.1") == {"192.168.0.10"}
+    assert index.prefix_matches("CH") == {"192.168.0.10", "192.168.0.9", "10.0.0.1"}
+    assert index.prefix_matches("ch1") == {"192.168.0.10", "10.0.0.1"}
+    assert index.prefix_matches("x") == set()
+
+
+def test_rename_updates_channel_order_and_prefix():
+    index = make_index()
+    index.rename("192.168.0.10", "ch0")
+    assert index.order("channel") == ["192.168.0.10", "10.0.0.1", "192.168.0.9"]
+    assert index.prefix_matches("ch1") == {"10.0.0.1"}
+    assert index.prefix_matches("ch0") == {"192.168.0.10"}
+
+
+def test_remove_clears_every_index():
+    index = make_index()
+    index.set_power("192.168.0.9", True)
+    index.touch("192.168.0.9")
+    index.remove("192.168.0.9")
+
+    assert "192.168.0.9" not in index
+    assert len(index) == 2
+    for mode in ("added", "ip", "channel", "power", "fix", "last_seen"):
+        assert "192.168.0.9" not in index.order(mode)
+    assert index.prefix_matches("ch2") == set()
+    assert index.by_power[True] == set()